@@ -50,7 +50,11 @@ rm -rf data/*.svg data/*.txt data/*.csv
 # Run the Docker containers for the servers
 # -------------------------------------------------------------------------
 docker run -d -p  5000:5000  -it --name bm-python-rest-server ghcr.io/ansys/api-eigen-example/python-rest-server:latest
-docker run -d -p 50051:50051 -it --name bm-python-grpc-server ghcr.io/ansys/api-eigen-example/python-grpc-server:latest
+mkdir -p /tmp/api-eigen
+docker run -d -p 50051:50051 -v /tmp/api-eigen:/tmp/api-eigen --ipc=host -it --name bm-python-grpc-server ghcr.io/ansys/api-eigen-example/python-grpc-server:latest \
+    python3 ansys/eigen/python/grpc/server.py --address [::]:50051 --address unix:/tmp/api-eigen/grpc.sock --shared-memory
+docker run -d -p 50052:50052 -it --name bm-python-grpc-batching-server ghcr.io/ansys/api-eigen-example/python-grpc-server:latest \
+    python3 ansys/eigen/python/grpc/server.py --address [::]:50052 --batch-window-us 200
 
 # Start running the benchmarks
 echo "Benchmarking api-eigen-example Python packages"
@@ -65,7 +69,7 @@ pytest-benchmark compare --group-by group --sort fullname --csv=data/python_bm_r
 
 # Stop and remove the Docker containers for the servers
 # -------------------------------------------------------------------------
-docker stop bm-python-grpc-server bm-python-rest-server && docker rm bm-python-grpc-server bm-python-rest-server
+docker stop bm-python-grpc-server bm-python-grpc-batching-server bm-python-rest-server && docker rm bm-python-grpc-server bm-python-grpc-batching-server bm-python-rest-server
 
 # C++ BM tests
 # ========================================================================
@@ -20,12 +20,21 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+from concurrent import futures
+
+import numpy as np
 import pytest
 
 from ansys.eigen.python.grpc.client import DemoGRPCClient
 
 from .test_tools import SIZES, SIZES_IDS, mat_generator, vec_generator
 
+# Unix domain socket on which the server also listens (see run_tests.sh)
+UDS_TARGET = "unix:/tmp/api-eigen/grpc.sock"
+
+# Port of the server that batches small multiplications (see run_tests.sh)
+BATCHING_PORT = 50052
+
 # ================================================================================
 # Unit tests for client-server interaction
 # ================================================================================
@@ -84,3 +93,127 @@ def test_multiply_matrices_grpc_python(benchmark, sz):
     mat_2 = mat_generator(sz)
 
     benchmark(client.multiply_matrices, mat_1, mat_2)
+
+
+@pytest.mark.benchmark(group="batch_multiply_matrices")
+@pytest.mark.parametrize("batch", [1, 10, 100, 1000, 10000])
+def test_batch_multiply_matrices_grpc_python(benchmark, batch):
+    """BM test to measure the time consumed so that the client gets the expected response
+    when performing the multiplication of a batch of 16x16 numpy arrays (as matrices).
+    """
+    client = DemoGRPCClient(ip="0.0.0.0", port=50051)
+
+    pairs = [(mat_generator(16), mat_generator(16)) for _ in range(batch)]
+
+    benchmark(client.batch_multiply_matrices, pairs)
+
+
+@pytest.mark.benchmark(group="compression")
+@pytest.mark.parametrize("codec", [None, "gzip", "deflate", "lz4"])
+def test_compressed_flip_vector_grpc_python(benchmark, codec):
+    """BM test to measure the time consumed so that the client gets the expected response
+    when flipping a compressible numpy array (as vector) with the different codecs.
+    """
+    client = DemoGRPCClient(ip="0.0.0.0", port=50051, compression=codec)
+
+    # Sparse payload (mostly zeros)... as in many real-world vectors
+    vec = np.zeros(1000000)
+    vec[::100] = vec_generator(10000)
+
+    benchmark(client.flip_vector, vec)
+
+
+@pytest.mark.benchmark(group="multiply_matrices_dtypes")
+@pytest.mark.parametrize(
+    "dtype", [np.float64, np.float32, np.int32, np.int64, np.complex128]
+)
+def test_multiply_matrices_dtypes_grpc_python(benchmark, dtype):
+    """BM test to measure the time consumed so that the client gets the expected response
+    when performing the multiplication of two 512x512 numpy arrays of each data type.
+    """
+    client = DemoGRPCClient(ip="0.0.0.0", port=50051)
+
+    mat_1 = mat_generator(512).astype(dtype)
+    mat_2 = mat_generator(512).astype(dtype)
+
+    benchmark(client.multiply_matrices, mat_1, mat_2)
+
+
+@pytest.mark.benchmark(group="shared_memory")
+@pytest.mark.parametrize("shared_memory", [False, True])
+def test_shared_memory_add_matrices_grpc_python(benchmark, shared_memory):
+    """BM test to measure the time consumed so that the client gets the expected response
+    when adding two 2048x2048 numpy arrays (as matrices), with and without shared memory.
+    """
+    client = DemoGRPCClient(
+        ip="0.0.0.0", port=50051, target=UDS_TARGET, shared_memory=shared_memory
+    )
+
+    mat_1 = mat_generator(2048)
+    mat_2 = mat_generator(2048)
+
+    benchmark(client.add_matrices, mat_1, mat_2)
+
+
+@pytest.mark.benchmark(group="transport")
+@pytest.mark.parametrize("target", [None, UDS_TARGET], ids=["tcp", "uds"])
+@pytest.mark.parametrize("sz", SIZES, ids=SIZES_IDS)
+def test_transport_add_matrices_grpc_python(benchmark, sz, target):
+    """BM test to measure the time consumed so that the client gets the expected response
+    when adding two numpy arrays (as matrices), over loopback TCP and a Unix domain socket.
+    """
+    client = DemoGRPCClient(ip="0.0.0.0", port=50051, target=target)
+
+    mat_1 = mat_generator(sz)
+    mat_2 = mat_generator(sz)
+
+    benchmark(client.add_matrices, mat_1, mat_2)
+
+
+@pytest.mark.benchmark(group="pipelined_multiply_matrices")
+@pytest.mark.parametrize("pipelined", [False, True])
+def test_pipelined_multiply_matrices_grpc_python(benchmark, pipelined):
+    """BM test to measure the time consumed so that the client gets the expected response
+    when multiplying two 2048x2048 numpy arrays (as matrices), with and without row panels.
+    """
+    client = DemoGRPCClient(ip="0.0.0.0", port=50051)
+
+    mat_1 = mat_generator(2048)
+    mat_2 = mat_generator(2048)
+
+    benchmark(client.multiply_matrices, mat_1, mat_2, pipelined=pipelined)
+
+
+@pytest.mark.benchmark(group="raw_frames")
+@pytest.mark.parametrize("raw_frames", [False, True], ids=["protobuf", "raw"])
+def test_raw_frames_flip_vector_grpc_python(benchmark, raw_frames):
+    """BM test to measure the time consumed so that the client gets the expected response
+    when flipping a numpy array of 2**24 elements (as a vector), sent as protobuf messages
+    and as raw frames.
+    """
+    client = DemoGRPCClient(ip="0.0.0.0", port=50051, raw_frames=raw_frames)
+
+    vec = vec_generator(2**24)
+
+    benchmark(client.flip_vector, vec)
+
+
+@pytest.mark.benchmark(group="micro_batching")
+@pytest.mark.parametrize("port", [50051, BATCHING_PORT], ids=["unbatched", "batched"])
+def test_concurrent_multiply_matrices_grpc_python(benchmark, port):
+    """BM test to measure the time consumed so that 64 concurrent clients get the expected
+    response when multiplying two 8x8 numpy arrays (as matrices), with and without the
+    micro-batching of the server.
+    """
+    client = DemoGRPCClient(ip="0.0.0.0", port=port)
+
+    mat_1 = mat_generator(8)
+    mat_2 = mat_generator(8)
+
+    def concurrent_calls():
+        return list(
+            executor.map(lambda _: client.multiply_matrices(mat_1, mat_2), range(64))
+        )
+
+    with futures.ThreadPoolExecutor(max_workers=64) as executor:
+        benchmark(concurrent_calls)
@@ -1,17 +1,44 @@
+#include <pybind11/complex.h>
 #include <pybind11/eigen.h>
 
+#include <complex>
+#include <cstdint>
+#include <stdexcept>
+
 #define STRINGIFY(x) #x
 #define MACRO_STRINGIFY(x) STRINGIFY(x)
 
 namespace py = pybind11;
 
-// It is needed to use type py::EigenDRef<Eigen::MatrixXd> for matrix
-// operations, since numpy arrays are characterized for ordering its values
-// differently to Eigen.
+// It is needed to use type py::EigenDRef<...> for matrix operations, since
+// numpy arrays are characterized for ordering its values differently to Eigen.
+// Arguments are references to const data, so that read-only numpy arrays (for
+// example, the ones built on top of a received message) are not copied.
 //
 // Ideally, and for performance reasons, we should avoid using Dynamic
 // MAtrixTypes, to take advantage of the vectorization Eigen does when solving
 // matrix operations.
+//
+// The GIL is released while Eigen computes, so that other Python threads (for
+// example, the ones serving gRPC streams) are not blocked by the operations.
+//
+// All methods are templates on the scalar type, and they are registered for
+// each of the handled numpy dtypes (float64, float32, int32, int64 and
+// complex128). Thus, no conversions (nor copies) are needed.
+
+template <typename Scalar>
+using MatrixX = Eigen::Matrix<Scalar, Eigen::Dynamic, Eigen::Dynamic>;
+
+template <typename Scalar>
+using VectorX = Eigen::Matrix<Scalar, Eigen::Dynamic, 1>;
+
+template <typename Scalar>
+using RowMajorMatrixX =
+    Eigen::Matrix<Scalar, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor>;
+
+// Batches are C-contiguous numpy arrays, whose items are mapped (not copied)
+template <typename Scalar>
+using Batch = py::array_t<Scalar, py::array::c_style>;
 
 /**
  * @brief Wrapper method to Matrix multiplication carried out by Eigen
@@ -20,10 +47,11 @@ namespace py = pybind11;
  * @param a The first matrix.
  * @param b The second matrix.
  *
- * @return Eigen::MatrixXd
+ * @return MatrixX<Scalar>
  */
-Eigen::MatrixXd multiply_matrices(const py::EigenDRef<Eigen::MatrixXd> a,
-                                  const py::EigenDRef<Eigen::MatrixXd> b) {
+template <typename Scalar>
+MatrixX<Scalar> multiply_matrices(const py::EigenDRef<const MatrixX<Scalar>> a,
+                                  const py::EigenDRef<const MatrixX<Scalar>> b) {
     return a * b;
 }
 
@@ -33,10 +61,11 @@ Eigen::MatrixXd multiply_matrices(const py::EigenDRef<Eigen::MatrixXd> a,
  * @param a The first matrix.
  * @param b The second matrix.
  *
- * @return Eigen::MatrixXd
+ * @return MatrixX<Scalar>
  */
-Eigen::MatrixXd add_matrices(const py::EigenDRef<Eigen::MatrixXd> a,
-                             const py::EigenDRef<Eigen::MatrixXd> b) {
+template <typename Scalar>
+MatrixX<Scalar> add_matrices(const py::EigenDRef<const MatrixX<Scalar>> a,
+                             const py::EigenDRef<const MatrixX<Scalar>> b) {
     return a + b;
 }
 
@@ -44,14 +73,17 @@ Eigen::MatrixXd add_matrices(const py::EigenDRef<Eigen::MatrixXd> a,
  * @brief Wrapper method to Vector multiplication (dot product) carried out by
  * Eigen operators.
  *
+ * Unlike Eigen's dot(), the first vector is not conjugated (as in numpy.dot).
+ *
  * @param v The first vector.
  * @param w The second vector.
  *
- * @return double
+ * @return Scalar
  */
-double multiply_vectors(const Eigen::Ref<Eigen::VectorXd> v,
-                        const Eigen::Ref<Eigen::VectorXd> w) {
-    return v.dot(w);
+template <typename Scalar>
+Scalar multiply_vectors(const Eigen::Ref<const VectorX<Scalar>> v,
+                        const Eigen::Ref<const VectorX<Scalar>> w) {
+    return (v.array() * w.array()).sum();
 }
 
 /**
@@ -60,13 +92,129 @@ double multiply_vectors(const Eigen::Ref<Eigen::VectorXd> v,
  * @param v The first vector.
  * @param w The second vector.
  *
- * @return Eigen::VectorXd
+ * @return VectorX<Scalar>
  */
-Eigen::VectorXd add_vectors(const Eigen::Ref<Eigen::VectorXd> v,
-                            const Eigen::Ref<Eigen::VectorXd> w) {
+template <typename Scalar>
+VectorX<Scalar> add_vectors(const Eigen::Ref<const VectorX<Scalar>> v,
+                            const Eigen::Ref<const VectorX<Scalar>> w) {
     return v + w;
 }
 
+/**
+ * @brief Wrapper method to the multiplication of the matching items of two
+ * batches of matrices, carried out by Eigen operators.
+ *
+ * All items are multiplied in a single call, so that the overhead of a call
+ * per item is avoided.
+ *
+ * @param a The first batch of matrices (K x R x N).
+ * @param b The second batch of matrices (K x N x C).
+ *
+ * @return Batch<Scalar> The products (K x R x C).
+ */
+template <typename Scalar>
+Batch<Scalar> batch_multiply_matrices(const Batch<Scalar> a,
+                                      const Batch<Scalar> b) {
+    if (a.ndim() != 3 || b.ndim() != 3 || a.shape(0) != b.shape(0) ||
+        a.shape(2) != b.shape(1)) {
+        throw std::invalid_argument("Incompatible batches of matrices.");
+    }
+    const auto batch = a.shape(0), rows = a.shape(1), inner = a.shape(2),
+               cols = b.shape(2);
+    Batch<Scalar> result({batch, rows, cols});
+
+    const Scalar *a_data = a.data(), *b_data = b.data();
+    Scalar *result_data = result.mutable_data();
+    {
+        py::gil_scoped_release release;
+        for (py::ssize_t k = 0; k < batch; ++k) {
+            Eigen::Map<RowMajorMatrixX<Scalar>>(result_data + k * rows * cols,
+                                                rows, cols)
+                .noalias() = Eigen::Map<const RowMajorMatrixX<Scalar>>(
+                                 a_data + k * rows * inner, rows, inner) *
+                             Eigen::Map<const RowMajorMatrixX<Scalar>>(
+                                 b_data + k * inner * cols, inner, cols);
+        }
+    }
+    return result;
+}
+
+/**
+ * @brief Wrapper method to the dot products of the matching items of two
+ * batches of vectors, carried out by Eigen operators.
+ *
+ * Unlike Eigen's dot(), the first vectors are not conjugated (as in numpy.dot).
+ *
+ * @param a The first batch of vectors (K x N).
+ * @param b The second batch of vectors (K x N).
+ *
+ * @return Batch<Scalar> The dot products (K).
+ */
+template <typename Scalar>
+Batch<Scalar> batch_multiply_vectors(const Batch<Scalar> a,
+                                     const Batch<Scalar> b) {
+    if (a.ndim() != 2 || b.ndim() != 2 || a.shape(0) != b.shape(0) ||
+        a.shape(1) != b.shape(1)) {
+        throw std::invalid_argument("Incompatible batches of vectors.");
+    }
+    const auto batch = a.shape(0), size = a.shape(1);
+    Batch<Scalar> result(batch);
+
+    const Scalar *a_data = a.data(), *b_data = b.data();
+    Scalar *result_data = result.mutable_data();
+    {
+        py::gil_scoped_release release;
+        Eigen::Map<VectorX<Scalar>>(result_data, batch) =
+            (Eigen::Map<const RowMajorMatrixX<Scalar>>(a_data, batch, size)
+                 .array() *
+             Eigen::Map<const RowMajorMatrixX<Scalar>>(b_data, batch, size)
+                 .array())
+                .rowwise()
+                .sum();
+    }
+    return result;
+}
+
+/**
+ * @brief Register the wrapper methods for a scalar type.
+ *
+ * Overloads are tried in order of registration, first without conversions.
+ * Arguments of other types are thus converted to the first type registered.
+ *
+ * @param m The module.
+ */
+template <typename Scalar>
+void def_operations(py::module_ &m) {
+    m.def("add_vectors", &add_vectors<Scalar>,
+          py::call_guard<py::gil_scoped_release>(), R"pbdoc(
+        Add two Eigen vectors
+    )pbdoc");
+
+    m.def("add_matrices", &add_matrices<Scalar>,
+          py::call_guard<py::gil_scoped_release>(), R"pbdoc(
+        Add two Eigen matrices
+    )pbdoc");
+
+    m.def("multiply_vectors", &multiply_vectors<Scalar>,
+          py::call_guard<py::gil_scoped_release>(), R"pbdoc(
+        Dot product of two Eigen vectors
+    )pbdoc");
+
+    m.def("multiply_matrices", &multiply_matrices<Scalar>,
+          py::call_guard<py::gil_scoped_release>(), R"pbdoc(
+        Multiply two Eigen matrices
+    )pbdoc");
+
+    // The GIL is released once the result is allocated
+    m.def("batch_multiply_matrices", &batch_multiply_matrices<Scalar>, R"pbdoc(
+        Multiply the matching items of two batches of Eigen matrices
+    )pbdoc");
+
+    m.def("batch_multiply_vectors", &batch_multiply_vectors<Scalar>, R"pbdoc(
+        Dot products of the matching items of two batches of Eigen vectors
+    )pbdoc");
+}
+
 PYBIND11_MODULE(demo_eigen_wrapper, m) {
     m.doc() = R"pbdoc(
         Pybind11 example eigen-wrapper
@@ -81,23 +229,15 @@ PYBIND11_MODULE(demo_eigen_wrapper, m) {
            add_matrices
            multiply_vectors
            add_vectors
+           batch_multiply_matrices
+           batch_multiply_vectors
     )pbdoc";
 
-    m.def("add_vectors", &add_vectors, R"pbdoc(
-        Add two Eigen::VectorXd
-    )pbdoc");
-
-    m.def("add_matrices", &add_matrices, R"pbdoc(
-        Add two Eigen::MatrixXd
-    )pbdoc");
-
-    m.def("multiply_vectors", &multiply_vectors, R"pbdoc(
-        Dot product of two Eigen::VectorXd
-    )pbdoc");
-
-    m.def("multiply_matrices", &multiply_matrices, R"pbdoc(
-        Multiply two Eigen::MatrixXd
-    )pbdoc");
+    def_operations<double>(m);
+    def_operations<float>(m);
+    def_operations<int32_t>(m);
+    def_operations<int64_t>(m);
+    def_operations<std::complex<double>>(m);
 
 #ifdef VERSION_INFO
     m.attr("__version__") = MACRO_STRINGIFY(VERSION_INFO);
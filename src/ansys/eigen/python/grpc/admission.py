@@ -0,0 +1,292 @@
+# Copyright (C) 2023 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Python implementation of the admission control of the gRPC API Eigen Example server.
+
+Each call is admitted as soon as the size of its operands is known (that is, when its
+first chunk is received), according to its estimated cost (see ``estimate_cost``). The
+cost of the calls in flight is limited by a budget, and calls exceeding it are rejected
+straight away, so that expensive bursts do not delay cheap calls. The number of heavy
+calls in flight may be limited too, so that they cannot take all the threads serving
+the requests.
+"""
+
+import threading
+import time
+
+DEFAULT_BUDGET = 2**36
+"""Default cost of the calls in flight (for example, a single 4096x4096 multiplication)."""
+
+DEFAULT_RETRY_AFTER = 0.1
+"""Seconds suggested to rejected calls, while no call has been completed yet."""
+
+
+class OverloadedError(RuntimeError):
+    """Raised when admitting a call would exceed the budget of the server.
+
+    Parameters
+    ----------
+    message : str
+        Error message.
+    retry_after : float
+        Seconds after which the call is expected to be admitted.
+    """
+
+    def __init__(self, message: str, retry_after: float):
+        """Initialize the error with its retry hint."""
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def estimate_cost(rpc_name: str, size: tuple) -> int:
+    """Estimate the cost of a call from the size of its operands.
+
+    Matrix multiplications cost ``rows * cols * cols`` (cubic for square matrices), while
+    the rest of the operations are linear in the size of the operands.
+
+    Parameters
+    ----------
+    rpc_name : str
+        Name of the RPC requested.
+    size : tuple
+        Size of the operands (for batches, the size of the stacked items).
+
+    Returns
+    -------
+    int
+        Estimated cost of the call.
+    """
+    if rpc_name in ("MultiplyMatrices", "BatchMultiplyMatrices"):
+        return size[0] * size[1] ** 2
+
+    cost = 1
+    for dim in size:
+        cost *= dim
+    return cost
+
+
+class AdmissionTicket:
+    """Provides the admission of a single call, as a context manager.
+
+    The cost of the call is acquired once the size of its operands is known (see
+    ``admit``), and released when exiting the context.
+
+    Parameters
+    ----------
+    controller : AdmissionController
+        Controller of the server.
+    rpc_name : str
+        Name of the RPC requested.
+    """
+
+    def __init__(self, controller, rpc_name: str):
+        """Initialize a ticket that has not been admitted yet."""
+        self.controller = controller
+        self.rpc_name = rpc_name
+        self.cost = 0
+        self._start = None
+
+    def admit(self, size: tuple):
+        """Admit the call, given the size of its operands.
+
+        Parameters
+        ----------
+        size : tuple
+            Size of the operands.
+
+        Raises
+        ------
+        OverloadedError
+            In case the cost of the call does not fit in the budget.
+        """
+        cost = estimate_cost(self.rpc_name, size)
+        self.controller.acquire(cost)
+        self.cost = cost
+        self._start = time.monotonic()
+
+    def transfer(self):
+        """Transfer the admission of the call to a new ticket.
+
+        Thus, the cost of the call can be released by another context, such as the one
+        streaming a response computed on the go.
+
+        Returns
+        -------
+        AdmissionTicket
+            Ticket releasing the cost of the call (this one no longer does).
+        """
+        ticket = AdmissionTicket(self.controller, self.rpc_name)
+        ticket.cost, ticket._start = self.cost, self._start
+        self._start = None
+        return ticket
+
+    def __enter__(self):
+        """Enter the context of the call."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Release the cost of the call (if it was admitted)."""
+        if self._start is not None:
+            self.controller.release(self.cost, time.monotonic() - self._start)
+            self._start = None
+
+
+class AdmissionController:
+    """Provides the admission control of the calls, according to their cost.
+
+    Calls are admitted while the cost in flight fits in the budget. A call is always
+    admitted if there are no calls in flight, even if its cost exceeds the budget...
+    otherwise, it would never be served.
+
+    Parameters
+    ----------
+    budget : int
+        Maximum cost of the calls in flight. If 0, all calls are admitted.
+    heavy_threshold : int, optional
+        Estimated cost from which calls are heavy. The default is 0.
+    max_heavy_calls : int, optional
+        Maximum number of heavy calls in flight. The default is ``None``, in which case
+        heavy calls are only limited by the budget.
+    """
+
+    def __init__(
+        self, budget: int, heavy_threshold: int = 0, max_heavy_calls: int = None
+    ):
+        """Initialize the controller, with no calls in flight."""
+        self.budget = budget
+        self.heavy_threshold = heavy_threshold
+        self.max_heavy_calls = max_heavy_calls
+        self.in_flight = 0
+        self.calls = 0
+        self.heavy_calls = 0
+        self.admitted = 0
+        self.rejected = 0
+
+        # Cost completed per second by a call (exponential moving average)
+        self._rate = None
+        self._lock = threading.Lock()
+
+    def ticket(self, rpc_name: str) -> AdmissionTicket:
+        """Create the admission ticket of a call.
+
+        Parameters
+        ----------
+        rpc_name : str
+            Name of the RPC requested.
+
+        Returns
+        -------
+        AdmissionTicket
+            Ticket of the call, to be used as a context manager.
+        """
+        return AdmissionTicket(self, rpc_name)
+
+    def acquire(self, cost: int):
+        """Acquire the cost of a call.
+
+        Parameters
+        ----------
+        cost : int
+            Estimated cost of the call.
+
+        Raises
+        ------
+        OverloadedError
+            In case the cost does not fit in the budget, or too many heavy calls are
+            in flight.
+        """
+        heavy = self._is_heavy(cost)
+        with self._lock:
+            if heavy and self.heavy_calls >= self.max_heavy_calls:
+                self.rejected += 1
+                retry_after = (
+                    DEFAULT_RETRY_AFTER if self._rate is None else cost / self._rate
+                )
+                raise OverloadedError(
+                    "Server overloaded: a call of cost %d exceeds the heavy calls in "
+                    "flight (%d of %d). Retry in %.3f seconds."
+                    % (cost, self.heavy_calls, self.max_heavy_calls, retry_after),
+                    retry_after,
+                )
+
+            excess = self.in_flight + cost - self.budget
+            if self.budget > 0 and self.calls > 0 and excess > 0:
+                self.rejected += 1
+                retry_after = (
+                    DEFAULT_RETRY_AFTER if self._rate is None else excess / self._rate
+                )
+                raise OverloadedError(
+                    "Server overloaded: a call of cost %d exceeds the budget (%d of %d "
+                    "in flight). Retry in %.3f seconds."
+                    % (cost, self.in_flight, self.budget, retry_after),
+                    retry_after,
+                )
+
+            self.in_flight += cost
+            self.calls += 1
+            self.heavy_calls += heavy
+            self.admitted += 1
+
+    def release(self, cost: int, seconds: float = 0.0):
+        """Release the cost of a finished call.
+
+        Parameters
+        ----------
+        cost : int
+            Estimated cost of the call.
+        seconds : float, optional
+            Seconds during which the call was in flight, which are used for estimating
+            the retry hints. The default is 0.
+        """
+        heavy = self._is_heavy(cost)
+        with self._lock:
+            self.in_flight -= cost
+            self.calls -= 1
+            self.heavy_calls -= heavy
+            if cost > 0 and seconds > 0:
+                rate = cost / seconds
+                self._rate = (
+                    rate if self._rate is None else 0.8 * self._rate + 0.2 * rate
+                )
+
+    def stats(self) -> dict:
+        """Return the counters of the controller.
+
+        Returns
+        -------
+        dict
+            Budget, cost and calls in flight, calls admitted and rejected, and heavy
+            calls in flight.
+        """
+        with self._lock:
+            return {
+                "budget": self.budget,
+                "in_flight": self.in_flight,
+                "calls": self.calls,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "heavy_calls": self.heavy_calls,
+            }
+
+    def _is_heavy(self, cost: int) -> bool:
+        # Heavy calls only count when they are limited
+        return self.max_heavy_calls is not None and cost >= self.heavy_threshold
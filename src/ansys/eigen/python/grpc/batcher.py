@@ -0,0 +1,195 @@
+# Copyright (C) 2023 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Python implementation of the micro-batcher of the gRPC API Eigen Example server.
+
+Small computations of the same kind (same RPC, type of data and shape) arriving at
+about the same time are held for a short window, and then run together as a single
+call to a batched kernel. Thus, the overhead of a call per computation is paid once
+per batch.
+"""
+
+from concurrent import futures
+import threading
+import time
+
+BATCH_WINDOW = 200e-6
+"""Suggested number of seconds during which computations are held to be batched."""
+
+
+class _Batch:
+    """Computations held together, and the batched kernel running them."""
+
+    def __init__(self, kernel, deadline):
+        self.kernel = kernel
+        self.deadline = deadline
+        self.cost = 0
+        self.operands = []
+        self.futures = []
+
+
+class MicroBatcher:
+    """Provides the batching of small computations of the same kind.
+
+    Computations are grouped by a key (such as their RPC, type of data and shape).
+    A batch is run once it holds ``max_batch`` computations, or once ``window``
+    seconds have passed since its first computation arrived.
+
+    Parameters
+    ----------
+    submit : callable
+        Function running a batch, such as ``submit(cost, function, *args) -> Future``.
+        For example, ``ExecutorLanes.submit``.
+    window : float
+        Number of seconds during which computations are held to be batched.
+    max_batch : int, optional
+        Maximum number of computations per batch. The default is 64.
+    """
+
+    def __init__(self, submit, window: float, max_batch: int = 64):
+        """Initialize the batcher (its thread is started on demand)."""
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.requests = 0
+        self._submit = submit
+
+        # Batches being held, by key
+        self._open = {}
+        self._closed = False
+        self._thread = None
+        self._condition = threading.Condition()
+
+    def submit(self, key, kernel, cost: int, operands: list) -> futures.Future:
+        """Hold a computation to be run in a batch.
+
+        Parameters
+        ----------
+        key : hashable
+            Kind of the computation. Only computations of the same kind are batched.
+        kernel : callable
+            Batched kernel, such as ``kernel(*operand_lists) -> results``. It receives
+            a list per operand (with its value for each computation of the batch), and
+            returns the results in the same order.
+        cost : int
+            Estimated cost of the computation.
+        operands : list of np.array
+            Operands of the computation.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Future of the result of the computation.
+
+        Raises
+        ------
+        RuntimeError
+            In case the batcher is shut down.
+        """
+        future = futures.Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The micro-batcher is shut down.")
+
+            batch = self._open.get(key)
+            if batch is None:
+                batch = _Batch(kernel, time.monotonic() + self.window)
+                self._open[key] = batch
+                self._start()
+                self._condition.notify()
+
+            batch.cost += cost
+            batch.operands.append(operands)
+            batch.futures.append(future)
+            self.requests += 1
+
+            # Full batches do not wait for their window to expire
+            if len(batch.futures) >= self.max_batch:
+                self._dispatch(self._open.pop(key))
+
+        return future
+
+    def stats(self) -> dict:
+        """Return the counters of the batcher.
+
+        Returns
+        -------
+        dict
+            Computations received, batches run, and computations being held.
+        """
+        with self._condition:
+            return {
+                "requests": self.requests,
+                "batches": self.batches,
+                "held": sum(len(batch.futures) for batch in self._open.values()),
+            }
+
+    def shutdown(self):
+        """Run the batches being held, and stop the thread of the batcher."""
+        with self._condition:
+            self._closed = True
+            for key in list(self._open):
+                self._dispatch(self._open.pop(key))
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._flush, name="micro-batcher", daemon=True
+            )
+            self._thread.start()
+
+    def _flush(self):
+        # Run the batches whose window has expired... and sleep until the next one does
+        with self._condition:
+            while not self._closed:
+                now = time.monotonic()
+                for key in [
+                    key for key, batch in self._open.items() if batch.deadline <= now
+                ]:
+                    self._dispatch(self._open.pop(key))
+
+                timeout = None
+                if self._open:
+                    timeout = min(batch.deadline for batch in self._open.values()) - now
+                self._condition.wait(timeout)
+
+    def _dispatch(self, batch):
+        self.batches += 1
+        self._submit(batch.cost, self._run, batch)
+
+    @staticmethod
+    def _run(batch):
+        # Computations whose caller gave up on them are still computed (in the batch)
+        running = [future.set_running_or_notify_cancel() for future in batch.futures]
+        try:
+            results = batch.kernel(*zip(*batch.operands))
+        except Exception as err:
+            for future, alive in zip(batch.futures, running):
+                if alive:
+                    future.set_exception(err)
+        else:
+            for idx, (future, alive) in enumerate(zip(batch.futures, running)):
+                if alive:
+                    future.set_result(results[idx])
@@ -0,0 +1,246 @@
+# Copyright (C) 2023 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Python implementation of the result cache of the gRPC API Eigen Example server."""
+
+from collections import OrderedDict
+from concurrent import futures
+import hashlib
+import threading
+
+
+class CachedResponse:
+    """Provides a response stored in the result cache.
+
+    Parameters
+    ----------
+    metadata : list[tuple]
+        Initial metadata sent with the response.
+    messages : list
+        Response messages (full or partial vector or matrix messages).
+    """
+
+    def __init__(self, metadata, messages):
+        """Initialize the cached response and compute its size."""
+        self.metadata = metadata
+        self.messages = messages
+        self.nbytes = sum(message.ByteSize() for message in messages)
+
+
+class ResultCache:
+    """Provides a least recently used (LRU) cache of the server responses.
+
+    Responses are keyed by a hash of the request content: the RPC name, and the
+    data type, shape and bytes of every operand (see ``ResultCache.hasher``). A
+    request that was already answered is served with the stored response messages,
+    without computing it again.
+
+    Parameters
+    ----------
+    max_bytes : int
+        Maximum amount of response bytes stored in the cache.
+    """
+
+    def __init__(self, max_bytes: int):
+        """Initialize an empty cache."""
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def hasher(rpc_name: str):
+        """Create the hash object used for computing the key of a request.
+
+        BLAKE2b is used since it is faster than MD5 or SHA-2 on 64-bit platforms.
+
+        Parameters
+        ----------
+        rpc_name : str
+            Name of the RPC requested.
+
+        Returns
+        -------
+        hashlib.blake2b
+            Hash object to update with the content of the request.
+        """
+        return hashlib.blake2b(rpc_name.encode(), digest_size=16)
+
+    def get(self, key: bytes):
+        """Retrieve a response from the cache.
+
+        Parameters
+        ----------
+        key : bytes
+            Key of the request.
+
+        Returns
+        -------
+        CachedResponse or None
+            Response stored, if any.
+        """
+        with self._lock:
+            response = self._entries.get(key)
+            if response is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return response
+
+    def put(self, key: bytes, response: CachedResponse):
+        """Store a response in the cache, evicting the least recently used ones if needed.
+
+        Responses larger than the size of the cache are not stored.
+
+        Parameters
+        ----------
+        key : bytes
+            Key of the request.
+        response : CachedResponse
+            Response to store.
+        """
+        if response.nbytes > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.nbytes -= previous.nbytes
+
+            while self._entries and self.nbytes + response.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+                self.evictions += 1
+
+            self._entries[key] = response
+            self.nbytes += response.nbytes
+
+    def __len__(self):
+        """Return the number of responses stored."""
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """Return the counters of the cache.
+
+        Returns
+        -------
+        dict
+            Hits, misses, evictions, entries, and bytes stored (and allowed) in the cache.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "nbytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+class SingleFlight:
+    """Provides the coalescing of identical requests in flight.
+
+    Requests are keyed like in the result cache (see ``ResultCache.hasher``). While
+    the result of a request is being computed, the identical requests arriving wait
+    for it instead of computing it again. Results are not kept once computed.
+    """
+
+    def __init__(self):
+        """Initialize the coalescing, without requests in flight."""
+        self.computed = 0
+        self.coalesced = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def join(self, key: bytes, start) -> futures.Future:
+        """Join the computation of a request, starting it if it is not in flight.
+
+        Parameters
+        ----------
+        key : bytes
+            Key of the request.
+        start : callable
+            Function starting the computation, such as ``start() -> Future``.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Future of the result, own to the caller. Cancelling it does not cancel the
+            computation, which other callers may be waiting for.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                self.computed += 1
+                flight = start()
+                self._flights[key] = flight
+            else:
+                self.coalesced += 1
+
+        # Callbacks of computations already done run straight away (outside the lock)
+        if leader:
+            flight.add_done_callback(lambda _: self._land(key, flight))
+        future = futures.Future()
+        flight.add_done_callback(lambda _: self._chain(flight, future))
+        return future
+
+    def __len__(self):
+        """Return the number of computations in flight."""
+        return len(self._flights)
+
+    def stats(self) -> dict:
+        """Return the counters of the coalescing.
+
+        Returns
+        -------
+        dict
+            Requests computed, requests coalesced (served with the result of an
+            identical one), and computations in flight.
+        """
+        with self._lock:
+            return {
+                "computed": self.computed,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._flights),
+            }
+
+    def _land(self, key, flight):
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    @staticmethod
+    def _chain(flight, future):
+        if not future.set_running_or_notify_cancel():
+            return
+        if flight.cancelled():
+            future.set_exception(futures.CancelledError())
+        elif flight.exception() is not None:
+            future.set_exception(flight.exception())
+        else:
+            future.set_result(flight.result())
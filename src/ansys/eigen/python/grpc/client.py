@@ -22,18 +22,64 @@
 
 """Python implementation of the gRPC API Eigen Example client."""
 
+import functools
+import itertools
+import threading
+import uuid
+
 import grpc
 import numpy as np
 
+from ansys.eigen.python.grpc.compression import (
+    CHUNK_CODECS,
+    COMPRESSION_THRESHOLD,
+    GRPC_CODECS,
+    check_codec,
+    compress_message,
+    decompress_chunk,
+)
 import ansys.eigen.python.grpc.constants as constants
+import ansys.eigen.python.grpc.framing as framing
 import ansys.eigen.python.grpc.generated.grpcdemo_pb2 as grpcdemo_pb2
 import ansys.eigen.python.grpc.generated.grpcdemo_pb2_grpc as grpcdemo_pb2_grpc
+import ansys.eigen.python.grpc.sharedmem as sharedmem
+
+
+def _releases_segments(method):
+    """Release the shared memory segments created during a call, once it has finished."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._calls.segments = []
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            for segment in self._calls.segments:
+                sharedmem.release(segment)
+            self._calls.segments = []
+
+    return wrapper
 
 
 class DemoGRPCClient:
     """Provides the API Eigen Example client class for interacting via gRPC."""
 
-    def __init__(self, ip="127.0.0.1", port=50051, timeout=1, test=None):
+    def __init__(
+        self,
+        ip="127.0.0.1",
+        port=50051,
+        timeout=1,
+        test=None,
+        compression=None,
+        compression_threshold=COMPRESSION_THRESHOLD,
+        protocol_version=None,
+        deadline=None,
+        shared_memory=False,
+        target=None,
+        raw_frames=False,
+        chunk_size=None,
+        max_message_size=None,
+    ):
         """Initialize connection to the API Eigen server.
 
         Parameters
@@ -46,21 +92,106 @@ class DemoGRPCClient:
             Number of seconds to wait before returning a timeout in the connection. The default is 1.
         test : object, optional
             Test GRPCDemoStub to connect to. The default is ``None``. This argument is only intended for test purposes.
+        compression : str, optional
+            Codec used for compressing the vectors and matrices sent and received. Options are
+            ``"gzip"``, ``"deflate"`` and ``"lz4"`` (if the ``lz4`` package is installed). The
+            default is ``None``, in which case no compression is used.
+        compression_threshold : int, optional
+            Amount of payload bytes below which requests and responses are not compressed.
+            The default is 64 KB.
+        protocol_version : int, optional
+            Highest version of the streaming protocol used. In version 2, the operands are
+            described by a manifest message (instead of metadata), and vectors can be
+            provided as iterables of chunks whose total size is not known in advance.
+            The highest version announced by the server is used (see
+            ``get_capabilities``), or version 1 for servers that do not announce their
+            capabilities (such as the C++ server). The default is ``None``, in which case
+            the latest version handled by the client is the highest one.
+        deadline : float, optional
+            Number of seconds each call may take. Once exceeded, the call fails with a
+            ``DEADLINE_EXCEEDED`` status (and the server stops working on it). It can be
+            overridden per call. The default is ``None``, in which case calls have no
+            deadline.
+        shared_memory : bool, optional
+            Whether to exchange the operands and results through POSIX shared memory
+            segments, instead of streaming them. Only for clients on the same host as
+            the server, using version 2 of the protocol. The default is ``False``.
+        target : str, optional
+            gRPC target to connect to, overriding ``ip`` and ``port``. For example,
+            ``"unix:/tmp/api-eigen.sock"`` for a server listening on a Unix domain socket.
+            The default is ``None``.
+        raw_frames : bool, optional
+            Whether to send (and receive) the vectors and matrices as raw frames, instead
+            of protobuf messages (see the ``framing`` module). Only with version 2 of the
+            protocol, and without chunk codecs. The default is ``False``.
+        chunk_size : int, optional
+            Maximum amount of bytes of the chunks sent and received, for example, smaller
+            ones for constrained links. It is capped by the chunk size preferred by the
+            server (see ``get_capabilities``) and by ``max_message_size``. The default is
+            ``None``, in which case the chunk size preferred by the server is used.
+        max_message_size : int, optional
+            Maximum amount of bytes of the messages received and sent by the client. The
+            default is ``None``, in which case the default of gRPC (4 MB) is used.
 
         Raises
         ------
         IOError
             Error if the client was unable to connect to the server.
+        RuntimeError
+            Error if the protocol version is not handled by the client, or if it does not
+            support shared memory or raw frames.
         """
-        # For test purposes, provide a stub directly
+        # Identify the client... operands stored in the server are only available to it
+        self._client_id = uuid.uuid4().hex
+
+        if protocol_version not in (None,) + constants.PROTOCOL_VERSIONS:
+            raise RuntimeError("Unsupported protocol version: %d" % protocol_version)
+        self._protocol_version = protocol_version
+        self._deadline = deadline
+
+        # Shared memory segments are created per call (and thread)
+        if shared_memory and protocol_version == 1:
+            raise RuntimeError("Shared memory requires version 2 of the protocol.")
+        self._shared_memory = shared_memory
+        self._calls = threading.local()
+
+        # Compression settings... chunk codecs are only used for requests once the server
+        # has announced that it accepts them
+        if compression is not None:
+            check_codec(compression)
+        self._compression = compression
+        self._compression_threshold = compression_threshold
+        self._server_chunk_codecs = set()
+
+        # Frames carry the messages of version 2... and their chunks are not compressed
+        if raw_frames and protocol_version == 1:
+            raise RuntimeError("Raw frames require version 2 of the protocol.")
+        if raw_frames and compression in CHUNK_CODECS:
+            raise RuntimeError("Raw frames are not compressed with chunk codecs.")
+        self._raw_frames = raw_frames
+
+        # Chunk size requested by the client... negotiated once connected
+        self._capabilities = None
+        self._chunk_size = chunk_size
+        self._max_message_size = max_message_size
+
+        # For test purposes, provide a stub directly (handling the latest version)
         if test is not None:
             self._stub = test
+            if self._protocol_version is None:
+                self._protocol_version = max(constants.PROTOCOL_VERSIONS)
             return
 
         self._stub = None
-        self._channel_str = "%s:%d" % (ip, port)
+        self._channel_str = target if target is not None else "%s:%d" % (ip, port)
 
-        self.channel = grpc.insecure_channel(self._channel_str)
+        options = []
+        if max_message_size is not None:
+            options = [
+                ("grpc.max_receive_message_length", max_message_size),
+                ("grpc.max_send_message_length", max_message_size),
+            ]
+        self.channel = grpc.insecure_channel(self._channel_str, options=options)
 
         # Verify connection
         try:
@@ -69,9 +200,15 @@ class DemoGRPCClient:
             raise IOError("Unable to connect to server at %s" % self._channel_str)
 
         # Set up the stub
-        self._stub = grpcdemo_pb2_grpc.GRPCDemoStub(self.channel)
+        if raw_frames:
+            self._stub = framing.RawStub(self.channel)
+        else:
+            self._stub = grpcdemo_pb2_grpc.GRPCDemoStub(self.channel)
 
-        print("Connected to server at %s:%d" % (ip, port))
+        # Learn what the server handles... and size the chunks to match
+        self._negotiate_capabilities()
+
+        print("Connected to server at %s" % self._channel_str)
 
     # =================================================================================================
     # PUBLIC METHODS for Client operations
@@ -89,32 +226,46 @@ class DemoGRPCClient:
         request = grpcdemo_pb2.HelloRequest(name=name)
 
         # Send the request
-        response = self._stub.SayHello(request)
+        response = self._stub.SayHello(request, timeout=self._deadline)
 
         # Show the server's response
         print("The server answered: " + response.message)
 
-    def flip_vector(self, vector):
+    @_releases_segments
+    def flip_vector(self, vector, store_result=False, deadline=None):
         """Flip the position of a numpy.ndarray vector such that [A, B, C, D] --> [D, C, B, A].
 
         Parameters
         ----------
-        vector : numpy.ndarray
-            Vector to flip.
+        vector : numpy.ndarray or str or iterable
+            Vector to flip (or handle of a vector stored in the server). In version 2 of
+            the protocol, it can also be an iterable of 1D numpy.ndarray chunks.
+        store_result : bool, optional
+            Whether to keep the result in the server instead of retrieving it. The
+            default is ``False``.
+        deadline : float, optional
+            Number of seconds the call may take. The default is ``None``, in which case
+            the deadline of the client is used.
 
         Returns
         -------
-        numpy.ndarray
-            Flipped vector.
+        numpy.ndarray or str
+            Flipped vector (or its handle, if it is kept in the server).
         """
         # Generate the metadata and the amount of chunks per vector
-        md, chunks = self._generate_md("vectors", "vec", vector)
+        md, chunks = self._generate_md(
+            "vectors", "vec", vector, store_result=store_result
+        )
 
         # Build the stream (i.e. generator)
         vector_gen = self._generate_vector_stream(chunks, vector)
 
         # Call the server method and retrieve the result
-        response_iterator = self._stub.FlipVector(vector_gen, metadata=md)
+        response_iterator = self._call(
+            self._stub.FlipVector, vector_gen, md, vector, deadline=deadline
+        )
+        if store_result:
+            return self._read_result_handle(response_iterator)
 
         # Now, convert to a numpy.ndarray to continue nominal operations (outside the client)
         nparray = self._read_nparray_from_vector(response_iterator)
@@ -122,22 +273,41 @@ class DemoGRPCClient:
         # Return only the first element (expecting a single vector)
         return nparray[0]
 
-    def add_vectors(self, *args):
+    @_releases_segments
+    def add_vectors(self, *args, store_result=False, deadline=None):
         """Add numpy.ndarray vectors using the Eigen library on the server side.
 
+        Parameters
+        ----------
+        *args : numpy.ndarray or str or iterable
+            Vectors to add (or handles of vectors stored in the server). In version 2 of
+            the protocol, they can also be iterables of 1D numpy.ndarray chunks.
+        store_result : bool, optional
+            Whether to keep the result in the server instead of retrieving it. The
+            default is ``False``.
+        deadline : float, optional
+            Number of seconds the call may take. The default is ``None``, in which case
+            the deadline of the client is used.
+
         Returns
         -------
-        numpy.ndarray
-            Result of the given numpy.ndarrays.
+        numpy.ndarray or str
+            Result of the given numpy.ndarrays (or its handle, if it is kept in the server).
         """
         # Generate the metadata and the amount of chunks per vector
-        md, chunks = self._generate_md("vectors", "vec", *args)
+        md, chunks = self._generate_md(
+            "vectors", "vec", *args, store_result=store_result
+        )
 
         # Build the stream (i.e. generator)
         vector_iterator = self._generate_vector_stream(chunks, *args)
 
         # Call the server method and retrieve the result
-        response_iterator = self._stub.AddVectors(vector_iterator, metadata=md)
+        response_iterator = self._call(
+            self._stub.AddVectors, vector_iterator, md, *args, deadline=deadline
+        )
+        if store_result:
+            return self._read_result_handle(response_iterator)
 
         # Now, convert to a numpy.ndarray to continue nominal operations (outside the client)
         nparray = self._read_nparray_from_vector(response_iterator)
@@ -145,22 +315,41 @@ class DemoGRPCClient:
         # Return only the first element (expecting a single vector)
         return nparray[0]
 
-    def multiply_vectors(self, *args):
+    @_releases_segments
+    def multiply_vectors(self, *args, store_result=False, deadline=None):
         """Multiply numpy.ndarray vectors using the Eigen library on the server side.
 
+        Parameters
+        ----------
+        *args : numpy.ndarray or str or iterable
+            Vectors to multiply (or handles of vectors stored in the server). In version 2
+            of the protocol, they can also be iterables of 1D numpy.ndarray chunks.
+        store_result : bool, optional
+            Whether to keep the result in the server instead of retrieving it. The
+            default is ``False``.
+        deadline : float, optional
+            Number of seconds the call may take. The default is ``None``, in which case
+            the deadline of the client is used.
+
         Returns
         -------
-        numpy.ndarray
+        numpy.ndarray or str
             Result of the multiplication of numpy.ndarray vectors. Despite returning a numpy.ndarray, the result only contains one value because it is a dot product.
         """
         # Generate the metadata and the amount of chunks per vector
-        md, chunks = self._generate_md("vectors", "vec", *args)
+        md, chunks = self._generate_md(
+            "vectors", "vec", *args, store_result=store_result
+        )
 
         # Build the stream (generator)
         vector_iterator = self._generate_vector_stream(chunks, *args)
 
         # Call the server method and retrieve the result
-        response_iterator = self._stub.MultiplyVectors(vector_iterator, metadata=md)
+        response_iterator = self._call(
+            self._stub.MultiplyVectors, vector_iterator, md, *args, deadline=deadline
+        )
+        if store_result:
+            return self._read_result_handle(response_iterator)
 
         # Convert to a numpy.ndarray to continue nominal operations (outside the client)
         nparray = self._read_nparray_from_vector(response_iterator)
@@ -168,22 +357,41 @@ class DemoGRPCClient:
         # Return only the first element (expecting a single vector)
         return nparray[0]
 
-    def add_matrices(self, *args):
+    @_releases_segments
+    def add_matrices(self, *args, store_result=False, deadline=None):
         """Add numpy.ndarray matrices using the Eigen library on the server side.
 
+        Parameters
+        ----------
+        *args : numpy.ndarray or str
+            Matrices to add (or handles of matrices stored in the server).
+        store_result : bool, optional
+            Whether to keep the result in the server instead of retrieving it. The
+            default is ``False``.
+        deadline : float, optional
+            Number of seconds the call may take. The default is ``None``, in which case
+            the deadline of the client is used.
+
         Returns
         -------
-        numpy.ndarray
-            Resulting numpy.ndarray of the matrices addition.
+        numpy.ndarray or str
+            Resulting numpy.ndarray of the matrices addition (or its handle, if it is kept
+            in the server).
         """
         # Generate the metadata and the amount of chunks per Matrix
-        md, chunks = self._generate_md("matrices", "mat", *args)
+        md, chunks = self._generate_md(
+            "matrices", "mat", *args, store_result=store_result
+        )
 
         # Build the stream (i.e. generator)
         matrix_iterator = self._generate_matrix_stream(chunks, *args)
 
         # Call the server method and retrieve the result
-        response_iterator = self._stub.AddMatrices(matrix_iterator, metadata=md)
+        response_iterator = self._call(
+            self._stub.AddMatrices, matrix_iterator, md, *args, deadline=deadline
+        )
+        if store_result:
+            return self._read_result_handle(response_iterator)
 
         # Now, convert to a numpy.ndarray to continue nominal operations (outside the client)
         nparray = self._read_nparray_from_matrix(response_iterator)
@@ -191,22 +399,63 @@ class DemoGRPCClient:
         # Return only the first element (expecting a single matrix)
         return nparray[0]
 
-    def multiply_matrices(self, *args):
+    @_releases_segments
+    def multiply_matrices(
+        self, *args, store_result=False, deadline=None, pipelined=False
+    ):
         """Multiply numpy.ndarray matrices using the Eigen library on the server side.
 
+        Parameters
+        ----------
+        *args : numpy.ndarray or str
+            Matrices to multiply (or handles of matrices stored in the server).
+        store_result : bool, optional
+            Whether to keep the result in the server instead of retrieving it. The
+            default is ``False``.
+        deadline : float, optional
+            Number of seconds the call may take. The default is ``None``, in which case
+            the deadline of the client is used.
+        pipelined : bool, optional
+            Whether the server multiplies the rows of the first matrix as they arrive,
+            streaming back the rows of the result as soon as they are computed. Thus,
+            transfers overlap with the computation. Only in version 2 of the protocol,
+            when the first matrix is streamed (it is ignored otherwise). The default is
+            ``False``.
+
         Returns
         -------
-        numpy.ndarray
-            Resulting numpy.ndarray of the matrices' multiplication.
+        numpy.ndarray or str
+            Resulting numpy.ndarray of the matrices' multiplication (or its handle, if it
+            is kept in the server).
         """
+        # When pipelined, the second matrix is sent first... and the rows of the first one
+        # follow (in row-major order)
+        pipelined = (
+            pipelined
+            and self._protocol_version == 2
+            and not self._shared_memory
+            and len(args) == 2
+            and isinstance(args[0], np.ndarray)
+        )
+        if pipelined:
+            args = (args[1], np.ascontiguousarray(args[0]))
+
         # Generate the metadata and the amount of chunks per matrix
-        md, chunks = self._generate_md("matrices", "mat", *args)
+        md, chunks = self._generate_md(
+            "matrices", "mat", *args, store_result=store_result
+        )
+        if pipelined:
+            md.append(("row-panels", "true"))
 
         # Build the stream (i.e. generator)
         matrix_iterator = self._generate_matrix_stream(chunks, *args)
 
         # Call the server method and retrieve the result
-        response_iterator = self._stub.MultiplyMatrices(matrix_iterator, metadata=md)
+        response_iterator = self._call(
+            self._stub.MultiplyMatrices, matrix_iterator, md, *args, deadline=deadline
+        )
+        if store_result:
+            return self._read_result_handle(response_iterator)
 
         # Convert to a numpy.ndarray to continue nominal operations (outside the client)
         nparray = self._read_nparray_from_matrix(response_iterator)
@@ -214,21 +463,279 @@ class DemoGRPCClient:
         # Return only the first element (expecting a single matrix)
         return nparray[0]
 
+    @_releases_segments
+    def batch_add_vectors(self, pairs, deadline=None):
+        """Add many pairs of numpy.ndarray vectors in a single request to the server.
+
+        Parameters
+        ----------
+        pairs : list[tuple[numpy.ndarray, numpy.ndarray]]
+            Pairs of vectors to add. All vectors must have the same size and type.
+        deadline : float, optional
+            Number of seconds the call may take. The default is ``None``, in which case
+            the deadline of the client is used.
+
+        Returns
+        -------
+        list[numpy.ndarray]
+            Result of the addition of each pair.
+        """
+        # Stack each side of the pairs into a single vector
+        args = self._stack_batch(pairs)
+
+        # Generate the metadata and the amount of chunks per vector
+        md, chunks = self._generate_md("vectors", "vec", *args)
+        md.append(("batch-size", str(len(pairs))))
+
+        # Build the stream (i.e. generator)
+        vector_iterator = self._generate_vector_stream(chunks, *args)
+
+        # Call the server method and retrieve the result
+        response_iterator = self._call(
+            self._stub.BatchAddVectors, vector_iterator, md, *args, deadline=deadline
+        )
+
+        # Convert to a numpy.ndarray and split it into the result of each pair
+        nparray = self._read_nparray_from_vector(response_iterator)
+        return list(np.reshape(nparray[0], (len(pairs), -1)))
+
+    @_releases_segments
+    def batch_multiply_matrices(self, pairs, deadline=None):
+        """Multiply many pairs of numpy.ndarray matrices in a single request to the server.
+
+        Parameters
+        ----------
+        pairs : list[tuple[numpy.ndarray, numpy.ndarray]]
+            Pairs of matrices to multiply. All matrices must be square, and have the
+            same shape and type.
+        deadline : float, optional
+            Number of seconds the call may take. The default is ``None``, in which case
+            the deadline of the client is used.
+
+        Returns
+        -------
+        list[numpy.ndarray]
+            Result of the multiplication of each pair.
+        """
+        # Stack each side of the pairs into a single matrix
+        args = self._stack_batch(pairs)
+
+        # Generate the metadata and the amount of chunks per matrix
+        md, chunks = self._generate_md("matrices", "mat", *args)
+        md.append(("batch-size", str(len(pairs))))
+
+        # Build the stream (i.e. generator)
+        matrix_iterator = self._generate_matrix_stream(chunks, *args)
+
+        # Call the server method and retrieve the result
+        response_iterator = self._call(
+            self._stub.BatchMultiplyMatrices,
+            matrix_iterator,
+            md,
+            *args,
+            deadline=deadline
+        )
+
+        # Convert to a numpy.ndarray and split it into the result of each pair
+        nparray = self._read_nparray_from_matrix(response_iterator)
+        return list(np.reshape(nparray[0], (len(pairs), -1, nparray[0].shape[1])))
+
+    @_releases_segments
+    def upload(self, array, deadline=None):
+        """Store a numpy.ndarray vector or matrix in the server.
+
+        Operations accept the handle of a stored operand instead of the operand itself,
+        which avoids sending it again. Stored operands count towards the quota of the
+        client, and expire if they are not used for a while (see the server options).
+
+        Parameters
+        ----------
+        array : numpy.ndarray
+            Vector or matrix to store.
+        deadline : float, optional
+            Number of seconds the call may take. The default is ``None``, in which case
+            the deadline of the client is used.
+
+        Returns
+        -------
+        str
+            Handle of the stored operand.
+        """
+        if type(array) is np.ndarray and array.ndim == 1:
+            md, chunks = self._generate_md("vectors", "vec", array)
+            request_iterator = self._generate_vector_stream(chunks, array)
+            response = self._call(
+                self._stub.UploadVector, request_iterator, md, array, deadline=deadline
+            )
+        else:
+            md, chunks = self._generate_md("matrices", "mat", array)
+            request_iterator = self._generate_matrix_stream(chunks, array)
+            response = self._call(
+                self._stub.UploadMatrix, request_iterator, md, array, deadline=deadline
+            )
+
+        return response.handle
+
+    @_releases_segments
+    def download(self, handle, deadline=None):
+        """Retrieve a vector or matrix stored in the server.
+
+        Parameters
+        ----------
+        handle : str
+            Handle of the stored operand.
+        deadline : float, optional
+            Number of seconds the call may take. The default is ``None``, in which case
+            the deadline of the client is used.
+
+        Returns
+        -------
+        numpy.ndarray
+            Stored vector or matrix.
+        """
+        request = grpcdemo_pb2.Handle(handle=handle)
+        md = (
+            [
+                ("client-id", self._client_id),
+                ("protocol-version", str(self._protocol_version)),
+            ]
+            + self._chunk_size_md()
+            + self._accept_codec_md()
+        )
+        if self._shared_memory:
+            md.append(("shared-memory", "true"))
+
+        # Handles tell whether the operand is a vector or a matrix
+        if handle.startswith("vec-"):
+            response_iterator = self._stub.DownloadVector(
+                request, metadata=md, timeout=self._timeout(deadline)
+            )
+            return self._read_nparray_from_vector(response_iterator)[0]
+        else:
+            response_iterator = self._stub.DownloadMatrix(
+                request, metadata=md, timeout=self._timeout(deadline)
+            )
+            return self._read_nparray_from_matrix(response_iterator)[0]
+
+    def release(self, handle):
+        """Release a vector or matrix stored in the server.
+
+        Parameters
+        ----------
+        handle : str
+            Handle of the stored operand.
+
+        Returns
+        -------
+        bool
+            Whether the operand was stored (and has been released).
+        """
+        response = self._stub.Release(
+            grpcdemo_pb2.Handle(handle=handle),
+            metadata=[("client-id", self._client_id)],
+            timeout=self._deadline,
+        )
+
+        return response.released
+
+    def get_stats(self):
+        """Method that requests the statistics of the RPCs served by the server.
+
+        Returns
+        -------
+        str
+            Statistics report. Each line contains the ``key=value`` statistics
+            (calls, bytes, chunks and p50/p99 latencies) of an RPC method and
+            request size bucket, or of the result cache of the server.
+        """
+        # Send the request
+        response = self._stub.GetStats(
+            grpcdemo_pb2.StatsRequest(), timeout=self._deadline
+        )
+
+        # Return the server's report
+        return response.report
+
+    def get_capabilities(self):
+        """Method that returns the capabilities announced by the server when connecting.
+
+        Returns
+        -------
+        grpcdemo_pb2.CapabilitiesReply or None
+            Data types, codecs and protocol versions handled, and maximum message size
+            and preferred chunk size of the server. ``None`` if the server does not
+            announce its capabilities (such as the C++ server).
+        """
+        return self._capabilities
+
+    def get_chunk_size(self):
+        """Method that returns the maximum amount of bytes of the chunks exchanged.
+
+        Returns
+        -------
+        int
+            Chunk size negotiated with the server.
+        """
+        if self._chunk_size is None:
+            return constants.MAX_CHUNKSIZE
+        return self._chunk_size
+
     # =================================================================================================
     # PRIVATE METHODS for Client operations
     # =================================================================================================
 
-    def _generate_md(self, message_type: str, abbrev: str, *args: np.ndarray):
+    def _generate_md(
+        self, message_type: str, abbrev: str, *args: np.ndarray, store_result=False
+    ):
         # Initialize the metadata and the chunks list for each full message
-        md = []
+        md = [
+            ("client-id", self._client_id),
+            ("protocol-version", str(self._protocol_version)),
+        ] + self._chunk_size_md()
         chunks = []
 
+        # Request the server to keep the result (and only send back its handle)
+        if store_result:
+            md.append(("store-result", "true"))
+
+        # Request the results to be handed over in shared memory
+        if self._shared_memory:
+            md.append(("shared-memory", "true"))
+
+        # In version 2, the operands are described by the manifest message
+        if self._protocol_version == 2:
+            for arg in args:
+                if isinstance(arg, str):
+                    chunks.append([])
+                elif message_type == "vectors" and not isinstance(arg, np.ndarray):
+                    chunks.append(self._peek_vector_producer(arg))
+                else:
+                    if message_type == "vectors":
+                        self._sanity_check_vector(arg)
+                    else:
+                        self._sanity_check_matrix(arg)
+                    chunks.append(self._chunk_indices(arg))
+
+            # Arrays are copied into a shared memory segment... only their region is sent
+            if self._shared_memory:
+                self._share_arrays(chunks, *args)
+
+            return md, chunks
+
         # Find how many arguments are transmitting
         md.append(("full-" + message_type, str(len(args))))
 
         # Loop over all input arguments
         idx = 1
         for arg in args:
+            # Operands stored in the server are referenced by their handle (no messages)
+            if isinstance(arg, str):
+                md.append((abbrev + str(idx) + "-handle", arg))
+                md.append((abbrev + str(idx) + "-messages", str(0)))
+                chunks.append([])
+                idx += 1
+                continue
+
             # Perform some argument input sanity checks
             if message_type == "vectors" and abbrev == "vec":
                 self._sanity_check_vector(arg)
@@ -237,39 +744,10 @@ class DemoGRPCClient:
             else:
                 raise RuntimeError("Invalid usage of _generate_md function.")
 
-            # Check the size of the arrays
-            # If size is surpassed, determine chunks needed
-            if arg.nbytes > constants.MAX_CHUNKSIZE:
-                # Determine how many chunks are needed
-                #
-                # Max amount of elements per chunk
-                max_elems = constants.MAX_CHUNKSIZE // arg.itemsize
-
-                # Bulk number of chunks needed
-                bulk_chunks = arg.size // max_elems
-
-                # The remainder amount of elements (if any)
-                remainder = arg.size % max_elems
-
-                # This list provides the last index up to which to
-                # process in each partial vector or matrix message
-                last_idx_chunk = []
-                for i in range(1, bulk_chunks + 1):
-                    last_idx_chunk.append(i * max_elems)
-
-                # Take into account that if there is a remainder, include
-                # one last partial vector or matrix message
-                if remainder != 0:
-                    last_idx_chunk.append(arg.size)
-
-                # Append the results
-                md.append((abbrev + str(idx) + "-messages", str(len(last_idx_chunk))))
-                chunks.append(last_idx_chunk)
-
-            else:
-                # Otherwise deal with a single message... Append results.
-                md.append((abbrev + str(idx) + "-messages", str(1)))
-                chunks.append([arg.size])
+            # Determine the chunks needed and append the results
+            last_idx_chunk = self._chunk_indices(arg)
+            md.append((abbrev + str(idx) + "-messages", str(len(last_idx_chunk))))
+            chunks.append(last_idx_chunk)
 
             # Increase idx by 1
             idx += 1
@@ -277,9 +755,52 @@ class DemoGRPCClient:
         # Return the metadata and the chunks list for each vector or matrix
         return md, chunks
 
+    def _share_arrays(self, chunks: list, *args):
+        # Copy all the arrays into a single segment, released once the call has finished
+        arrays = [arg for arg in args if isinstance(arg, np.ndarray)]
+        if not arrays:
+            return
+
+        segment, regions = sharedmem.share(arrays)
+        self._calls.segments.append(segment)
+        regions = iter(regions)
+        for idx, arg in enumerate(args):
+            if isinstance(arg, np.ndarray):
+                chunks[idx] = next(regions)
+
+    def _chunk_indices(self, arg: np.ndarray):
+        # If the maximum chunk size is not surpassed, a single chunk is needed
+        chunk_size = self.get_chunk_size()
+        if arg.nbytes <= chunk_size:
+            return [arg.size]
+
+        # Otherwise, fill in chunks of the maximum amount of elements... and include
+        # one last partial chunk with the remainder (if any)
+        max_elems = max(1, chunk_size // arg.itemsize)
+        return list(range(max_elems, arg.size, max_elems)) + [arg.size]
+
+    def _peek_vector_producer(self, producer):
+        # The data type of the vector is taken from its first chunk... which is put back
+        chunk_iterator = iter(producer)
+        first = next(chunk_iterator, None)
+        if first is None:
+            raise RuntimeError("Invalid argument. Vector producers must yield chunks.")
+        self._sanity_check_vector(first)
+
+        return first.dtype, itertools.chain([first], chunk_iterator)
+
     def _generate_vector_stream(self, chunks: "list[list[int]]", *args: np.ndarray):
+        # In version 2, stream the manifest and the chunks instead
+        if self._protocol_version == 2:
+            yield from self._generate_manifest_stream("vectors", chunks, *args)
+            return
+
         # Loop over all input arguments
         for arg, vector_chunks in zip(args, chunks):
+            # Operands stored in the server are not sent
+            if isinstance(arg, str):
+                continue
+
             # Perform some argument input sanity checks
             self._sanity_check_vector(arg)
 
@@ -300,14 +821,24 @@ class DemoGRPCClient:
                 )
 
     def _generate_matrix_stream(self, chunks: "list[list[int]]", *args: np.ndarray):
+        # In version 2, stream the manifest and the chunks instead
+        if self._protocol_version == 2:
+            yield from self._generate_manifest_stream("matrices", chunks, *args)
+            return
+
         # Loop over all input arguments
         for arg, matrix_chunks in zip(args, chunks):
+            # Operands stored in the server are not sent
+            if isinstance(arg, str):
+                continue
+
             # Perform some argument input sanity checks.
             self._sanity_check_matrix(arg)
 
             # If sanity checks are fine... yield the corresponding matrix message
             #
-            # When dealing with matrices, ravel it to a 1D array (avoids copy)
+            # When dealing with matrices, ravel it to a 1D array (avoids copy). In version 1,
+            # matrices are always sent in row-major order (servers may ignore the layout)
             arg_as_vec = arg.ravel()
 
             # Loop over the chunk indices
@@ -325,13 +856,106 @@ class DemoGRPCClient:
                     matrix_as_chunk=arg_as_vec[tmp_idx:last_idx_chunk].tobytes(),
                 )
 
+    def _generate_manifest_stream(self, message_type: str, chunks: list, *args):
+        if self._raw_frames:
+            message_class, chunk_field = framing.Frame, "chunk"
+        elif message_type == "vectors":
+            message_class, chunk_field = grpcdemo_pb2.Vector, "vector_as_chunk"
+        else:
+            message_class, chunk_field = grpcdemo_pb2.Matrix, "matrix_as_chunk"
+
+        # Describe all the operands first (producers are of unknown size). Arrays are sent
+        # in their memory order (for example, column-major), so that they are not copied.
+        operands = []
+        for arg, arg_chunks in zip(args, chunks):
+            if isinstance(arg, str):
+                operands.append(grpcdemo_pb2.OperandInfo(handle=arg))
+            elif isinstance(arg, np.ndarray):
+                operands.append(
+                    grpcdemo_pb2.OperandInfo(
+                        data_type=constants.NP_DTYPE_TO_DATATYPE[arg.dtype.type],
+                        shape=arg.shape,
+                        layout=constants.ORDER_TO_LAYOUT[constants.memory_order(arg)],
+                        chunk_size=self.get_chunk_size(),
+                        segment=self._shared_region(arg_chunks),
+                    )
+                )
+            else:
+                operands.append(
+                    grpcdemo_pb2.OperandInfo(
+                        data_type=constants.NP_DTYPE_TO_DATATYPE[arg_chunks[0].type],
+                        chunk_size=self.get_chunk_size(),
+                    )
+                )
+        yield message_class(manifest=grpcdemo_pb2.Manifest(operands=operands))
+
+        # Chunks only carry their content... the last one of each operand is flagged
+        for arg, arg_chunks in zip(args, chunks):
+            # Operands stored in the server (or in shared memory) are not sent
+            if isinstance(arg, str) or self._shared_region(arg_chunks) is not None:
+                continue
+
+            # Producers are sent as their chunks come... and then flagged as complete
+            if not isinstance(arg, np.ndarray):
+                dtype, chunk_iterator = arg_chunks
+                for chunk in chunk_iterator:
+                    self._sanity_check_vector(chunk)
+                    if chunk.dtype != dtype:
+                        raise RuntimeError(
+                            "Invalid argument. All chunks must have the same type."
+                        )
+                    for payload in self._chunk_payloads(chunk):
+                        yield message_class(**{chunk_field: payload})
+                yield message_class(end_of_operand=True)
+                continue
+
+            # When dealing with matrices, ravel it to a 1D array in memory order (avoids copy)
+            arg_as_vec = arg.ravel(order=constants.memory_order(arg))
+            payloads = self._chunk_payloads(arg_as_vec, arg_chunks)
+            for idx, payload in enumerate(payloads, start=1):
+                yield message_class(
+                    **{chunk_field: payload}, end_of_operand=idx == len(arg_chunks)
+                )
+
+    def _shared_region(self, arg_chunks):
+        # Region of an operand copied into shared memory (if so)
+        if isinstance(arg_chunks, grpcdemo_pb2.SharedSegment):
+            return arg_chunks
+        return None
+
+    def _chunk_payloads(self, arg_as_vec: np.ndarray, last_idx_chunks=None):
+        # Yield the bytes of each chunk of a 1D array
+        if last_idx_chunks is None:
+            last_idx_chunks = self._chunk_indices(arg_as_vec)
+
+        # Frames are views of the array (copied once, when serialized)
+        processed_idx = 0
+        for last_idx_chunk in last_idx_chunks:
+            chunk = arg_as_vec[processed_idx:last_idx_chunk]
+            if self._raw_frames:
+                yield np.ascontiguousarray(chunk).data
+            else:
+                yield chunk.tobytes()
+            processed_idx = last_idx_chunk
+
     def _read_nparray_from_vector(self, response_iterator):
+        # In version 2, the response starts with a manifest
+        if self._protocol_version == 2:
+            return self._read_nparray_from_manifest(response_iterator, "vectors")
+
         # Get the metadata
         response_md = response_iterator.initial_metadata()
 
         # Parse the server's metadata
         full_msg, chunks_per_msg = self._parse_server_metadata(response_md)
 
+        # Nothing announced (the call may have failed)... wait for it to finish
+        if full_msg == 0:
+            list(response_iterator)
+
+        # Chunks may be compressed
+        codec = self._read_codec(response_md)
+
         # Initialize the output list
         resulting_vectors = []
 
@@ -341,6 +965,7 @@ class DemoGRPCClient:
             result = None
             result_size = 0
             result_dtype = None
+            offset = 0
 
             # Loop over the available chunks per message
             for chunk_idx in range(chunks_per_msg[msg]):
@@ -349,22 +974,27 @@ class DemoGRPCClient:
 
                 # If it is the first chunk being processed, parse dtype and size
                 if chunk_idx == 0:
-                    if vector.data_type == grpcdemo_pb2.DataType.Value("INTEGER"):
-                        result_dtype = np.int32
-                    elif vector.data_type == grpcdemo_pb2.DataType.Value("DOUBLE"):
-                        result_dtype = np.float64
+                    result_dtype = constants.DATATYPE_TO_NP_DTYPE[
+                        grpcdemo_pb2.DataType.Name(vector.data_type)
+                    ]
 
                     result_size = vector.vector_size
 
+                    # Allocate the full vector once... chunks are copied into their slot
+                    result = np.empty(result_size, dtype=result_dtype)
+
                 # Parse the chunk
-                if result is None:
-                    result = np.frombuffer(vector.vector_as_chunk, dtype=result_dtype)
-                else:
-                    tmp = np.frombuffer(vector.vector_as_chunk, dtype=result_dtype)
-                    result = np.concatenate((result, tmp))
+                payload = vector.vector_as_chunk
+                if codec is not None:
+                    payload = decompress_chunk(payload, codec)
+                tmp = np.frombuffer(payload, dtype=result_dtype)
+                if offset + tmp.size > result_size:
+                    break
+                result[offset : offset + tmp.size] = tmp
+                offset += tmp.size
 
             # Check if the final vector has the desired size
-            if result.size != result_size:
+            if result is None or offset != result_size:
                 raise RuntimeError("Problems reading server full Vector message...")
             else:
                 # If everything is fine, append to resulting_vectors list
@@ -374,12 +1004,23 @@ class DemoGRPCClient:
         return resulting_vectors
 
     def _read_nparray_from_matrix(self, response_iterator):
+        # In version 2, the response starts with a manifest
+        if self._protocol_version == 2:
+            return self._read_nparray_from_manifest(response_iterator, "matrices")
+
         # Get the metadata
         response_md = response_iterator.initial_metadata()
 
         # Parse the server's metadata
         full_msg, chunks_per_msg = self._parse_server_metadata(response_md)
 
+        # Nothing announced (the call may have failed)... wait for it to finish
+        if full_msg == 0:
+            list(response_iterator)
+
+        # Chunks may be compressed
+        codec = self._read_codec(response_md)
+
         # Initialize the output list
         resulting_matrices = []
 
@@ -390,6 +1031,8 @@ class DemoGRPCClient:
             result_rows = 0
             result_cols = 0
             result_dtype = None
+            result_order = "C"
+            offset = 0
 
             # Loop over the available chunks per message
             for chunk_idx in range(chunks_per_msg[msg]):
@@ -398,23 +1041,31 @@ class DemoGRPCClient:
 
                 # If it is the first chunk being processing, parse dtype and size (rows,cols)
                 if chunk_idx == 0:
-                    if matrix.data_type == grpcdemo_pb2.DataType.Value("INTEGER"):
-                        result_dtype = np.int32
-                    elif matrix.data_type == grpcdemo_pb2.DataType.Value("DOUBLE"):
-                        result_dtype = np.float64
+                    result_dtype = constants.DATATYPE_TO_NP_DTYPE[
+                        grpcdemo_pb2.DataType.Name(matrix.data_type)
+                    ]
 
                     result_rows = matrix.matrix_rows
                     result_cols = matrix.matrix_cols
+                    result_order = constants.LAYOUT_TO_ORDER[
+                        grpcdemo_pb2.Layout.Name(matrix.layout)
+                    ]
+
+                    # Allocate the full matrix once... chunks are copied into their slot
+                    result = np.empty(result_rows * result_cols, dtype=result_dtype)
 
                 # Parse the chunk
-                if result is None:
-                    result = np.frombuffer(matrix.matrix_as_chunk, dtype=result_dtype)
-                else:
-                    tmp = np.frombuffer(matrix.matrix_as_chunk, dtype=result_dtype)
-                    result = np.concatenate((result, tmp))
+                payload = matrix.matrix_as_chunk
+                if codec is not None:
+                    payload = decompress_chunk(payload, codec)
+                tmp = np.frombuffer(payload, dtype=result_dtype)
+                if offset + tmp.size > result.size:
+                    break
+                result[offset : offset + tmp.size] = tmp
+                offset += tmp.size
 
             # Check if the final matrix has the desired size
-            if result.size != result_rows * result_cols:
+            if result is None or offset != result_rows * result_cols:
                 raise RuntimeError("Problems reading server full matrix message...")
             else:
                 # If everything is fine, append to resulting_matrices list
@@ -425,19 +1076,204 @@ class DemoGRPCClient:
                             result_rows,
                             result_cols,
                         ),
+                        order=result_order,
                     )
                 )
 
         # Return the resulting_matrices list
         return resulting_matrices
 
+    def _read_nparray_from_manifest(self, response_iterator, message_type: str):
+        # Chunks may be compressed
+        codec = self._read_codec(response_iterator.initial_metadata())
+        chunk_field = (
+            "vector_as_chunk" if message_type == "vectors" else "matrix_as_chunk"
+        )
+
+        # The first message describes all the operands of the response
+        manifest = self._read_manifest(response_iterator)
+
+        # Initialize the output list
+        resulting_arrays = []
+
+        for info in manifest.operands:
+            # Allocate the full operand once... chunks are copied into their slot
+            result_dtype = constants.DATATYPE_TO_NP_DTYPE[
+                grpcdemo_pb2.DataType.Name(info.data_type)
+            ]
+            order = constants.LAYOUT_TO_ORDER[grpcdemo_pb2.Layout.Name(info.layout)]
+
+            # Operands handed over in shared memory are taken (and released) at once
+            if info.HasField("segment"):
+                resulting_arrays.append(
+                    sharedmem.take(info.segment, result_dtype, tuple(info.shape), order)
+                )
+                continue
+
+            result = np.empty(int(np.prod(info.shape)), dtype=result_dtype)
+
+            # Read chunks until the end of the operand
+            offset = 0
+            end_of_operand = False
+            while not end_of_operand:
+                message = next(response_iterator)
+                payload = getattr(message, chunk_field)
+                if codec is not None:
+                    payload = decompress_chunk(payload, codec)
+                tmp = np.frombuffer(payload, dtype=result_dtype)
+                if offset + tmp.size > result.size:
+                    break
+                result[offset : offset + tmp.size] = tmp
+                offset += tmp.size
+                end_of_operand = message.end_of_operand
+
+            # Check if the final operand has the desired size
+            if not end_of_operand or offset != result.size:
+                raise RuntimeError(
+                    "Problems reading server full %s message..." % message_type
+                )
+            resulting_arrays.append(np.reshape(result, tuple(info.shape), order=order))
+
+        # Return the resulting_arrays list
+        return resulting_arrays
+
+    def _read_manifest(self, response_iterator):
+        # Errors of the call are raised when reading the first message
+        message = next(response_iterator, None)
+        if message is None or not message.HasField("manifest"):
+            raise RuntimeError("Problems reading server manifest message...")
+        return message.manifest
+
+    def _negotiate_capabilities(self):
+        # Servers that do not announce their capabilities (such as the C++ server) only
+        # handle the original protocol, and receive chunks of the default size (at most)
+        try:
+            self._capabilities = self._stub.GetCapabilities(
+                grpcdemo_pb2.CapabilitiesRequest(), timeout=self._deadline
+            )
+        except grpc.RpcError as err:
+            if err.code() != grpc.StatusCode.UNIMPLEMENTED:
+                raise
+            if self._chunk_size is not None:
+                self._chunk_size = min(self._chunk_size, constants.MAX_CHUNKSIZE)
+            self._negotiate_protocol_version([1])
+            return
+
+        # Use the highest version of the protocol handled by both sides
+        self._negotiate_protocol_version(self._capabilities.protocol_versions)
+
+        # Chunks must fit in the messages received by both sides
+        limits = [
+            self._capabilities.chunk_size,
+            constants.fit_chunk_size(
+                self._max_message_size or constants.MAX_MESSAGE_SIZE
+            ),
+        ]
+        if self._chunk_size is not None:
+            limits.append(self._chunk_size)
+        self._chunk_size = max(1, min(limits))
+
+        # Requests can be compressed with the chunk codecs of the server right away
+        self._server_chunk_codecs = set(self._capabilities.codecs) & set(CHUNK_CODECS)
+
+    def _negotiate_protocol_version(self, server_versions):
+        # The version requested by the client (if any) is the highest one used
+        highest = self._protocol_version or max(constants.PROTOCOL_VERSIONS)
+        versions = set(server_versions) & set(constants.PROTOCOL_VERSIONS)
+        self._protocol_version = max(
+            (version for version in versions if version <= highest), default=1
+        )
+
+        # Shared memory and raw frames are only carried by version 2
+        if self._protocol_version != 2 and (self._shared_memory or self._raw_frames):
+            raise RuntimeError(
+                "Shared memory and raw frames require version 2 of the protocol, "
+                "which is not handled by the server."
+            )
+
+    def _chunk_size_md(self):
+        # Request the server to send chunks of the negotiated size
+        if self._chunk_size is None:
+            return []
+        return [("chunk-size", str(self._chunk_size))]
+
+    def _accept_codec_md(self):
+        # Request the server to compress its response with the codec of the client
+        if self._compression is None:
+            return []
+        return [
+            ("accept-codec", self._compression),
+            ("codec-threshold", str(self._compression_threshold)),
+        ]
+
+    def _timeout(self, deadline=None):
+        # Deadline of a call (in seconds), if any
+        return self._deadline if deadline is None else deadline
+
+    def _call(self, rpc, request_iterator, md: "list[tuple]", *args, deadline=None):
+        # Compress the request... only if it is worth it (the size of vector producers is
+        # not known in advance, so they are always compressed)
+        compression = None
+        nbytes = sum(arg.nbytes for arg in args if isinstance(arg, np.ndarray))
+        if self._shared_memory:
+            nbytes = 0
+        if any(not isinstance(arg, (str, np.ndarray)) for arg in args):
+            nbytes = self._compression_threshold
+        if self._compression is not None and nbytes >= self._compression_threshold:
+            if self._compression in GRPC_CODECS:
+                compression = GRPC_CODECS[self._compression]
+            elif self._compression in self._server_chunk_codecs:
+                md = md + [("chunk-codec", self._compression)]
+                request_iterator = (
+                    compress_message(message, self._compression)
+                    for message in request_iterator
+                )
+
+        return rpc(
+            request_iterator,
+            metadata=md + self._accept_codec_md(),
+            compression=compression,
+            timeout=self._timeout(deadline),
+        )
+
+    def _read_codec(self, response_md: "list[tuple]"):
+        # Learn the chunk codecs accepted by the server, and return the one of the response
+        response_md = dict(response_md)
+        if "accept-chunk-codecs" in response_md:
+            self._server_chunk_codecs = set(
+                response_md["accept-chunk-codecs"].split(",")
+            )
+        return response_md.get("chunk-codec")
+
+    def _read_result_handle(self, response_iterator):
+        # The result was kept in the server... only its handle is sent (in version 2,
+        # as the manifest)
+        if self._protocol_version == 2:
+            handle = self._read_manifest(response_iterator).operands[0].handle
+            for _ in response_iterator:
+                raise RuntimeError(
+                    "Unexpected message received after the result handle."
+                )
+            return handle
+
+        # In version 1, as metadata
+        response_md = dict(response_iterator.initial_metadata())
+
+        # Wait for the call to finish (no messages are expected)
+        for _ in response_iterator:
+            raise RuntimeError(
+                "Unexpected message received instead of a result handle."
+            )
+
+        return response_md["result-handle"]
+
     def _sanity_check_vector(self, arg):
         # Perform some argument input sanity checks.
         if type(arg) is not np.ndarray:
             raise RuntimeError("Invalid argument. Only numpy.ndarrays are allowed.")
         elif arg.dtype.type not in constants.NP_DTYPE_TO_DATATYPE.keys():
             raise RuntimeError(
-                "Invalid argument. Only numpy.ndarrays of type int32 and float64 are allowed."
+                "Invalid argument. Only numpy.ndarrays of type int32, int64, float32, float64 and complex128 are allowed."
             )
         elif arg.ndim != 1:
             raise RuntimeError("Invalid argument. Only 1D numpy.ndarrays are allowed.")
@@ -448,27 +1284,49 @@ class DemoGRPCClient:
             raise RuntimeError("Invalid argument. Only numpy.ndarrays are allowed.")
         elif arg.dtype.type not in constants.NP_DTYPE_TO_DATATYPE.keys():
             raise RuntimeError(
-                "Invalid argument. Only numpy.ndarrays of type int32 and float64 are allowed."
+                "Invalid argument. Only numpy.ndarrays of type int32, int64, float32, float64 and complex128 are allowed."
             )
         elif arg.ndim != 2:
             raise RuntimeError("Invalid argument. Only 2D numpy.ndarrays are allowed.")
 
+    def _stack_batch(self, pairs):
+        # Perform some argument input sanity checks... the server splits the stacked
+        # operands evenly, so all items must look alike.
+        if len(pairs) == 0:
+            raise RuntimeError("Invalid argument. At least one pair is needed.")
+        for pair in pairs:
+            if len(pair) != 2:
+                raise RuntimeError(
+                    "Invalid argument. Only pairs of operands are allowed."
+                )
+            for arg in pair:
+                if type(arg) is not np.ndarray:
+                    raise RuntimeError(
+                        "Invalid argument. Only numpy.ndarrays are allowed."
+                    )
+                elif arg.shape != pairs[0][0].shape or arg.dtype != pairs[0][0].dtype:
+                    raise RuntimeError(
+                        "Invalid argument. All operands of a batch must have the same shape and type."
+                    )
+
+        # Stack the left and right operands (along the first dimension)
+        return [np.concatenate(side) for side in zip(*pairs)]
+
     def _parse_server_metadata(self, response_md: "list[tuple]"):
-        # Init the return variables: amount of full messages received
-        # and partial messages per full message
-        full_msg = 0
-        chunks_per_msg = []
+        # Index the metadata once (instead of scanning it for each message)
+        response_md = dict(response_md)
 
         # Find out how many full messages are to be processed
-        for md in response_md:
-            if md[0] == "full-vectors" or md[0] == "full-matrices":
-                full_msg = int(md[1])
-
-        # Identify the chunks per message (only if successful previously)
-        if full_msg != 0:
-            for i in range(1, full_msg + 1):
-                for md in response_md:
-                    if md[0] == "vec%d-messages" % i or md[0] == "mat%d-messages" % i:
-                        chunks_per_msg.append(int(md[1]))
+        full_msg = int(
+            response_md.get("full-vectors", response_md.get("full-matrices", 0))
+        )
+
+        # Identify the partial messages per full message
+        chunks_per_msg = []
+        for i in range(1, full_msg + 1):
+            chunks = response_md.get("vec%d-messages" % i)
+            if chunks is None:
+                chunks = response_md.get("mat%d-messages" % i)
+            chunks_per_msg.append(int(chunks))
 
         return full_msg, chunks_per_msg
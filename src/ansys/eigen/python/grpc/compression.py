@@ -0,0 +1,148 @@
+# Copyright (C) 2023 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Python script for the payload compression of both gRPC server and client.
+
+The codec of a call is negotiated through metadata:
+
+- ``accept-codec`` (client): codec requested for the response. Options are the gRPC
+  codecs (``gzip`` and ``deflate``), which compress whole messages, and the chunk codecs
+  (``lz4``, if the ``lz4`` package is installed), which compress the vector and matrix
+  chunks only.
+- ``codec-threshold`` (client): payload bytes below which the response is not compressed.
+- ``chunk-codec`` (client and server): chunk codec applied to the chunks of the messages
+  sent, if any.
+- ``accept-chunk-codecs`` (server): comma-separated chunk codecs the server is able to
+  decompress. Clients only compress their requests with a chunk codec once the server
+  has announced it.
+"""
+
+import grpc
+
+import ansys.eigen.python.grpc.generated.grpcdemo_pb2 as grpcdemo_pb2
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover
+    lz4_frame = None
+
+GRPC_CODECS = {"gzip": grpc.Compression.Gzip, "deflate": grpc.Compression.Deflate}
+"""Dictionary of the codecs applied by gRPC to whole messages."""
+
+CHUNK_CODECS = {}
+"""Dictionary of the available codecs applied to the chunks, as (compress, decompress) functions."""
+
+if lz4_frame is not None:
+    CHUNK_CODECS["lz4"] = (lz4_frame.compress, lz4_frame.decompress)
+
+COMPRESSION_THRESHOLD = 64 * 1024
+"""Default amount of payload bytes below which compression is skipped."""
+
+
+def check_codec(codec: str):
+    """Check that a codec is available.
+
+    Parameters
+    ----------
+    codec : str
+        Codec to check. For example, ``"gzip"``.
+
+    Raises
+    ------
+    RuntimeError
+        In case the codec is not available.
+    """
+    if codec not in GRPC_CODECS and codec not in CHUNK_CODECS:
+        raise RuntimeError(
+            "Unavailable compression codec: %s. Options are %s."
+            % (codec, ", ".join(list(GRPC_CODECS) + list(CHUNK_CODECS)))
+        )
+
+
+def compress_message(message, codec: str):
+    """Compress the chunk of a vector or matrix message with a chunk codec.
+
+    Parameters
+    ----------
+    message : grpcdemo_pb2.Vector or grpcdemo_pb2.Matrix
+        Message to compress.
+    codec : str
+        Chunk codec to use.
+
+    Returns
+    -------
+    grpcdemo_pb2.Vector or grpcdemo_pb2.Matrix
+        New message, whose chunk is compressed. Messages without chunk (such as
+        manifests) are returned as they are.
+    """
+    compress, _ = CHUNK_CODECS[codec]
+    if isinstance(message, grpcdemo_pb2.Vector):
+        if not message.vector_as_chunk:
+            return message
+        return grpcdemo_pb2.Vector(
+            data_type=message.data_type,
+            vector_size=message.vector_size,
+            vector_as_chunk=compress(message.vector_as_chunk),
+            end_of_operand=message.end_of_operand,
+        )
+    else:
+        if not message.matrix_as_chunk:
+            return message
+        return grpcdemo_pb2.Matrix(
+            data_type=message.data_type,
+            matrix_rows=message.matrix_rows,
+            matrix_cols=message.matrix_cols,
+            matrix_as_chunk=compress(message.matrix_as_chunk),
+            end_of_operand=message.end_of_operand,
+            layout=message.layout,
+        )
+
+
+def decompress_chunk(payload: bytes, codec: str) -> bytes:
+    """Decompress the chunk of a vector or matrix message.
+
+    Parameters
+    ----------
+    payload : bytes
+        Compressed chunk.
+    codec : str
+        Chunk codec used.
+
+    Returns
+    -------
+    bytes
+        Decompressed chunk. Empty chunks are not compressed, so they are returned
+        as they are.
+
+    Raises
+    ------
+    RuntimeError
+        In case the codec is not available.
+    """
+    if codec not in CHUNK_CODECS:
+        raise RuntimeError("Unavailable chunk compression codec: %s." % codec)
+
+    if not payload:
+        return payload
+
+    _, decompress = CHUNK_CODECS[codec]
+    return decompress(payload)
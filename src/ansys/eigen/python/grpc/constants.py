@@ -28,15 +28,73 @@ from sys import getsizeof
 import numpy as np
 
 MAX_CHUNKSIZE = 1024 * 1024 * 3
-"""Maximum chunk size for transmitting in gRPC."""
+"""Maximum chunk size for transmitting in gRPC (unless a larger one is negotiated)."""
 
-NP_DTYPE_TO_DATATYPE = {np.int32: "INTEGER", np.float64: "DOUBLE"}
+MAX_MESSAGE_SIZE = 1024 * 1024 * 4
+"""Default maximum size of the messages received by gRPC."""
+
+NP_DTYPE_TO_DATATYPE = {
+    np.int32: "INTEGER",
+    np.float64: "DOUBLE",
+    np.float32: "FLOAT",
+    np.int64: "LONG",
+    np.complex128: "COMPLEX_DOUBLE",
+}
 """Dictionary of constants showing the translation between the handled numpy dtypes and the gRPC DataType enum values."""
 
+DATATYPE_TO_NP_DTYPE = {value: key for key, value in NP_DTYPE_TO_DATATYPE.items()}
+"""Dictionary of constants showing the translation between the gRPC DataType enum values and the handled numpy dtypes."""
+
+LAYOUT_TO_ORDER = {"ROW_MAJOR": "C", "COLUMN_MAJOR": "F"}
+"""Dictionary of constants showing the translation between the gRPC Layout enum values and the numpy memory orders."""
+
+ORDER_TO_LAYOUT = {value: key for key, value in LAYOUT_TO_ORDER.items()}
+"""Dictionary of constants showing the translation between the numpy memory orders and the gRPC Layout enum values."""
+
+PROTOCOL_VERSIONS = (1, 2)
+"""Versions of the streaming protocol handled (see the ``protocol-version`` metadata)."""
+
 HUMAN_SIZES = ["B", "KB", "MB", "GB", "TB"]
 """List of human-readable sizes handled."""
 
 
+def memory_order(arg: np.ndarray) -> str:
+    """Method to determine the memory order in which an array is sent without copying it.
+
+    Parameters
+    ----------
+    arg : np.ndarray
+        Array to send.
+
+    Returns
+    -------
+    str
+        ``"F"`` for column-major (Fortran-ordered) arrays, ``"C"`` otherwise. Arrays that
+        are not contiguous are copied in any case, so they are sent in row-major order.
+    """
+    if arg.flags.f_contiguous and not arg.flags.c_contiguous:
+        return "F"
+    return "C"
+
+
+def fit_chunk_size(max_message_size: int) -> int:
+    """Method to determine the largest chunk size for a maximum message size.
+
+    Parameters
+    ----------
+    max_message_size : int
+        Maximum amount of bytes of the messages.
+
+    Returns
+    -------
+    int
+        Maximum amount of bytes of the chunks. As with the defaults (``MAX_CHUNKSIZE``
+        and ``MAX_MESSAGE_SIZE``), a quarter of the message is left for the other fields
+        and for the chunk codecs, which may expand incompressible chunks.
+    """
+    return max(1, max_message_size * 3 // 4)
+
+
 def human_size(content: object):
     """Method to show the size of the message in human-readable format.
 
@@ -51,7 +109,10 @@ def human_size(content: object):
         Size of the message received in human-readable format.
     """
     idx = 0
-    content_length = getsizeof(content)
+    if isinstance(content, memoryview):
+        content_length = content.nbytes
+    else:
+        content_length = getsizeof(content)
 
     while True:
         if content_length >= 1024:
@@ -0,0 +1,286 @@
+# Copyright (C) 2023 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Python script for the raw framing of both gRPC server and client.
+
+Besides the ``GRPCDemo`` service, whose vector and matrix messages are protobuf
+messages, the server provides the same methods in the ``GRPCDemoRaw`` service. Its
+vector and matrix messages are frames: a header byte followed by a raw buffer, which
+is either the chunk of an operand or the (protobuf) manifest describing the operands.
+Thus, chunks are neither copied into protobuf messages nor parsed out of them.
+
+Frames only carry the messages of version 2 of the streaming protocol, which the
+calls of the raw service always use.
+"""
+
+import functools
+import inspect
+
+import grpc
+
+import ansys.eigen.python.grpc.generated.grpcdemo_pb2 as grpcdemo_pb2
+import ansys.eigen.python.grpc.generated.grpcdemo_pb2_grpc as grpcdemo_pb2_grpc
+
+RAW_SERVICE = "grpcdemo.GRPCDemoRaw"
+"""Name of the service whose vector and matrix messages are frames."""
+
+RAW_METHODS = {
+    "FlipVector": "stream_stream",
+    "AddVectors": "stream_stream",
+    "MultiplyVectors": "stream_stream",
+    "AddMatrices": "stream_stream",
+    "MultiplyMatrices": "stream_stream",
+    "BatchAddVectors": "stream_stream",
+    "BatchMultiplyMatrices": "stream_stream",
+    "UploadVector": "stream_unary",
+    "UploadMatrix": "stream_unary",
+    "DownloadVector": "unary_stream",
+    "DownloadMatrix": "unary_stream",
+}
+"""Dictionary of the methods of the raw service, and their kind of streaming."""
+
+_END_OF_OPERAND = 0x01
+_MANIFEST = 0x02
+
+
+class Frame:
+    """Provides a vector or matrix message of the raw service.
+
+    Frames expose the fields of the ``Vector`` and ``Matrix`` protobuf messages used in
+    version 2 of the streaming protocol, so they are read alike.
+
+    Parameters
+    ----------
+    chunk : bytes-like, optional
+        Content of the chunk, such as a ``memoryview`` of a contiguous array. It is not
+        copied. The default is an empty chunk.
+    manifest : grpcdemo_pb2.Manifest, optional
+        Description of the operands. Frames carry either a chunk or a manifest. The
+        default is ``None``.
+    end_of_operand : bool, optional
+        Whether the chunk is the last one of its operand. The default is ``False``.
+    """
+
+    __slots__ = ("chunk", "manifest", "end_of_operand")
+
+    def __init__(self, chunk=b"", manifest=None, end_of_operand: bool = False):
+        """Initialize the frame."""
+        self.chunk = chunk
+        self.manifest = manifest
+        self.end_of_operand = end_of_operand
+
+    @property
+    def vector_as_chunk(self):
+        """Content of the chunk (as in a ``Vector`` message)."""
+        return self.chunk
+
+    @property
+    def matrix_as_chunk(self):
+        """Content of the chunk (as in a ``Matrix`` message)."""
+        return self.chunk
+
+    def HasField(self, name: str) -> bool:
+        """Return whether a message field is set (as in protobuf messages)."""
+        return name == "manifest" and self.manifest is not None
+
+    def ByteSize(self) -> int:
+        """Return the size of the serialized frame."""
+        if self.manifest is not None:
+            return 1 + self.manifest.ByteSize()
+        return 1 + memoryview(self.chunk).nbytes
+
+
+def serialize(message) -> bytes:
+    """Serialize a vector or matrix message into a frame.
+
+    Parameters
+    ----------
+    message : Frame, grpcdemo_pb2.Vector or grpcdemo_pb2.Matrix
+        Message to serialize. Protobuf messages (such as the cached ones) must be
+        those of version 2 of the streaming protocol.
+
+    Returns
+    -------
+    bytes
+        Frame, whose chunk is copied once (straight from its buffer).
+    """
+    if isinstance(message, Frame):
+        chunk, end_of_operand = message.chunk, message.end_of_operand
+    elif isinstance(message, grpcdemo_pb2.Vector):
+        chunk, end_of_operand = message.vector_as_chunk, message.end_of_operand
+    else:
+        chunk, end_of_operand = message.matrix_as_chunk, message.end_of_operand
+
+    header = _END_OF_OPERAND if end_of_operand else 0
+    if message.HasField("manifest"):
+        return bytes([header | _MANIFEST]) + message.manifest.SerializeToString()
+    return b"".join((bytes([header]), chunk))
+
+
+def deserialize(data: bytes) -> Frame:
+    """Deserialize a frame.
+
+    Parameters
+    ----------
+    data : bytes
+        Frame received.
+
+    Returns
+    -------
+    Frame
+        Message, whose chunk is a ``memoryview`` of the data received (not a copy).
+    """
+    header = data[0]
+    if header & _MANIFEST:
+        return Frame(manifest=grpcdemo_pb2.Manifest.FromString(data[1:]))
+    return Frame(memoryview(data)[1:], end_of_operand=bool(header & _END_OF_OPERAND))
+
+
+class RawStub(grpcdemo_pb2_grpc.GRPCDemoStub):
+    """Provides the client stub of the API Eigen Example server, using the raw service.
+
+    The vector and matrix methods are those of the raw service. The rest of the methods
+    are those of the ``GRPCDemo`` service.
+
+    Parameters
+    ----------
+    channel : grpc.Channel
+        Channel to the server.
+    """
+
+    def __init__(self, channel):
+        """Initialize the stub."""
+        super().__init__(channel)
+        for name, kind in RAW_METHODS.items():
+            path = "/%s/%s" % (RAW_SERVICE, name)
+            if kind == "stream_stream":
+                rpc = channel.stream_stream(
+                    path,
+                    request_serializer=serialize,
+                    response_deserializer=deserialize,
+                )
+            elif kind == "stream_unary":
+                rpc = channel.stream_unary(
+                    path,
+                    request_serializer=serialize,
+                    response_deserializer=grpcdemo_pb2.Handle.FromString,
+                )
+            else:
+                rpc = channel.unary_stream(
+                    path,
+                    request_serializer=grpcdemo_pb2.Handle.SerializeToString,
+                    response_deserializer=deserialize,
+                )
+            setattr(self, name, rpc)
+
+
+class _RawContext:
+    """Context of a call of the raw service, which always uses version 2 of the protocol."""
+
+    raw_frames = True
+
+    def __init__(self, context):
+        self._context = context
+
+    def __getattr__(self, name):
+        return getattr(self._context, name)
+
+    def invocation_metadata(self):
+        return [
+            item
+            for item in self._context.invocation_metadata()
+            if item[0] != "protocol-version"
+        ] + [("protocol-version", "2")]
+
+
+def _raw_behavior(behavior):
+    # Servicer methods are called with the context of the raw service (asynchronous ones
+    # must remain coroutines or asynchronous generators, for grpc.aio)
+    if inspect.isasyncgenfunction(behavior):
+
+        async def wrapper(request, context):
+            async for message in behavior(request, _RawContext(context)):
+                yield message
+
+    elif inspect.iscoroutinefunction(behavior):
+
+        async def wrapper(request, context):
+            return await behavior(request, _RawContext(context))
+
+    else:
+
+        def wrapper(request, context):
+            return behavior(request, _RawContext(context))
+
+    return functools.wraps(behavior)(wrapper)
+
+
+def is_raw(context) -> bool:
+    """Return whether a call is one of the raw service.
+
+    Parameters
+    ----------
+    context : grpc.ServicerContext
+        gRPC-specific information of the call.
+
+    Returns
+    -------
+    bool
+        Whether the vector and matrix messages of the call are frames.
+    """
+    return getattr(context, "raw_frames", False)
+
+
+def add_raw_servicer_to_server(servicer, server):
+    """Add the methods of the raw service of a servicer to a server.
+
+    Parameters
+    ----------
+    servicer : GRPCDemoServicer
+        Servicer (synchronous or asynchronous) implementing the methods.
+    server : grpc.Server or grpc.aio.Server
+        Server to which to add the methods.
+    """
+    handlers = {}
+    for name, kind in RAW_METHODS.items():
+        behavior = _raw_behavior(getattr(servicer, name))
+        if kind == "stream_stream":
+            handlers[name] = grpc.stream_stream_rpc_method_handler(
+                behavior,
+                request_deserializer=deserialize,
+                response_serializer=serialize,
+            )
+        elif kind == "stream_unary":
+            handlers[name] = grpc.stream_unary_rpc_method_handler(
+                behavior,
+                request_deserializer=deserialize,
+                response_serializer=grpcdemo_pb2.Handle.SerializeToString,
+            )
+        else:
+            handlers[name] = grpc.unary_stream_rpc_method_handler(
+                behavior,
+                request_deserializer=grpcdemo_pb2.Handle.FromString,
+                response_serializer=serialize,
+            )
+    server.add_generic_rpc_handlers(
+        (grpc.method_handlers_generic_handler(RAW_SERVICE, handlers),)
+    )
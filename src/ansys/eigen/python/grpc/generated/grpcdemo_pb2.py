@@ -20,74 +20,66 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: grpcdemo.proto
+# Protobuf Python Version: 7.35.0
 """Generated protocol buffer code."""
-from google.protobuf.internal import enum_type_wrapper
+
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import descriptor_pool as _descriptor_pool
-from google.protobuf import message as _message
-from google.protobuf import reflection as _reflection
+from google.protobuf import runtime_version as _runtime_version
 from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC, 7, 35, 0, "", "grpcdemo.proto"
+)
 # @@protoc_insertion_point(imports)
 
 _sym_db = _symbol_database.Default()
 
 
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(
+    b'\n\x0egrpcdemo.proto\x12\x08grpcdemo"\xb3\x01\n\x0bOperandInfo\x12%\n\tdata_type\x18\x01 \x01(\x0e\x32\x12.grpcdemo.DataType\x12\r\n\x05shape\x18\x02 \x03(\x03\x12 \n\x06layout\x18\x03 \x01(\x0e\x32\x10.grpcdemo.Layout\x12\x12\n\nchunk_size\x18\x04 \x01(\x03\x12\x0e\n\x06handle\x18\x05 \x01(\t\x12(\n\x07segment\x18\x06 \x01(\x0b\x32\x17.grpcdemo.SharedSegment"=\n\rSharedSegment\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0e\n\x06offset\x18\x02 \x01(\x03\x12\x0e\n\x06nbytes\x18\x03 \x01(\x03"3\n\x08Manifest\x12\'\n\x08operands\x18\x01 \x03(\x0b\x32\x15.grpcdemo.OperandInfo"\x9b\x01\n\x06Vector\x12%\n\tdata_type\x18\x01 \x01(\x0e\x32\x12.grpcdemo.DataType\x12\x13\n\x0bvector_size\x18\x02 \x01(\x05\x12\x17\n\x0fvector_as_chunk\x18\x03 \x01(\x0c\x12$\n\x08manifest\x18\x04 \x01(\x0b\x32\x12.grpcdemo.Manifest\x12\x16\n\x0e\x65nd_of_operand\x18\x05 \x01(\x08"\xd2\x01\n\x06Matrix\x12%\n\tdata_type\x18\x01 \x01(\x0e\x32\x12.grpcdemo.DataType\x12\x13\n\x0bmatrix_rows\x18\x02 \x01(\x05\x12\x13\n\x0bmatrix_cols\x18\x03 \x01(\x05\x12\x17\n\x0fmatrix_as_chunk\x18\x04 \x01(\x0c\x12$\n\x08manifest\x18\x05 \x01(\x0b\x32\x12.grpcdemo.Manifest\x12\x16\n\x0e\x65nd_of_operand\x18\x06 \x01(\x08\x12 \n\x06layout\x18\x07 \x01(\x0e\x32\x10.grpcdemo.Layout"\x1c\n\x0cHelloRequest\x12\x0c\n\x04name\x18\x01 \x01(\t"\x1d\n\nHelloReply\x12\x0f\n\x07message\x18\x01 \x01(\t"\x18\n\x06Handle\x12\x0e\n\x06handle\x18\x01 \x01(\t" \n\x0cReleaseReply\x12\x10\n\x08released\x18\x01 \x01(\x08"\x0e\n\x0cStatsRequest"\x1c\n\nStatsReply\x12\x0e\n\x06report\x18\x01 \x01(\t"\x15\n\x13\x43\x61pabilitiesRequest"\x94\x01\n\x11\x43\x61pabilitiesReply\x12&\n\ndata_types\x18\x01 \x03(\x0e\x32\x12.grpcdemo.DataType\x12\x0e\n\x06\x63odecs\x18\x02 \x03(\t\x12\x19\n\x11protocol_versions\x18\x03 \x03(\x05\x12\x18\n\x10max_message_size\x18\x04 \x01(\x03\x12\x12\n\nchunk_size\x18\x05 \x01(\x03*L\n\x08\x44\x61taType\x12\x0b\n\x07INTEGER\x10\x00\x12\n\n\x06\x44OUBLE\x10\x01\x12\t\n\x05\x46LOAT\x10\x02\x12\x08\n\x04LONG\x10\x03\x12\x12\n\x0e\x43OMPLEX_DOUBLE\x10\x04*)\n\x06Layout\x12\r\n\tROW_MAJOR\x10\x00\x12\x10\n\x0c\x43OLUMN_MAJOR\x10\x01\x32\x92\x07\n\x08GRPCDemo\x12:\n\x08SayHello\x12\x16.grpcdemo.HelloRequest\x1a\x14.grpcdemo.HelloReply"\x00\x12\x36\n\nFlipVector\x12\x10.grpcdemo.Vector\x1a\x10.grpcdemo.Vector"\x00(\x01\x30\x01\x12\x36\n\nAddVectors\x12\x10.grpcdemo.Vector\x1a\x10.grpcdemo.Vector"\x00(\x01\x30\x01\x12;\n\x0fMultiplyVectors\x12\x10.grpcdemo.Vector\x1a\x10.grpcdemo.Vector"\x00(\x01\x30\x01\x12\x37\n\x0b\x41\x64\x64Matrices\x12\x10.grpcdemo.Matrix\x1a\x10.grpcdemo.Matrix"\x00(\x01\x30\x01\x12<\n\x10MultiplyMatrices\x12\x10.grpcdemo.Matrix\x1a\x10.grpcdemo.Matrix"\x00(\x01\x30\x01\x12;\n\x0f\x42\x61tchAddVectors\x12\x10.grpcdemo.Vector\x1a\x10.grpcdemo.Vector"\x00(\x01\x30\x01\x12\x41\n\x15\x42\x61tchMultiplyMatrices\x12\x10.grpcdemo.Matrix\x1a\x10.grpcdemo.Matrix"\x00(\x01\x30\x01\x12\x36\n\x0cUploadVector\x12\x10.grpcdemo.Vector\x1a\x10.grpcdemo.Handle"\x00(\x01\x12\x36\n\x0cUploadMatrix\x12\x10.grpcdemo.Matrix\x1a\x10.grpcdemo.Handle"\x00(\x01\x12\x38\n\x0e\x44ownloadVector\x12\x10.grpcdemo.Handle\x1a\x10.grpcdemo.Vector"\x00\x30\x01\x12\x38\n\x0e\x44ownloadMatrix\x12\x10.grpcdemo.Handle\x1a\x10.grpcdemo.Matrix"\x00\x30\x01\x12\x35\n\x07Release\x12\x10.grpcdemo.Handle\x1a\x16.grpcdemo.ReleaseReply"\x00\x12:\n\x08GetStats\x12\x16.grpcdemo.StatsRequest\x1a\x14.grpcdemo.StatsReply"\x00\x12O\n\x0fGetCapabilities\x12\x1d.grpcdemo.CapabilitiesRequest\x1a\x1b.grpcdemo.CapabilitiesReply"\x00\x62\x06proto3'
+)
 
-
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0egrpcdemo.proto\x12\x08grpcdemo\"]\n\x06Vector\x12%\n\tdata_type\x18\x01 \x01(\x0e\x32\x12.grpcdemo.DataType\x12\x13\n\x0bvector_size\x18\x02 \x01(\x05\x12\x17\n\x0fvector_as_chunk\x18\x03 \x01(\x0c\"r\n\x06Matrix\x12%\n\tdata_type\x18\x01 \x01(\x0e\x32\x12.grpcdemo.DataType\x12\x13\n\x0bmatrix_rows\x18\x02 \x01(\x05\x12\x13\n\x0bmatrix_cols\x18\x03 \x01(\x05\x12\x17\n\x0fmatrix_as_chunk\x18\x04 \x01(\x0c\"\x1c\n\x0cHelloRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\"\x1d\n\nHelloReply\x12\x0f\n\x07message\x18\x01 \x01(\t*#\n\x08\x44\x61taType\x12\x0b\n\x07INTEGER\x10\x00\x12\n\n\x06\x44OUBLE\x10\x01\x32\xea\x02\n\x08GRPCDemo\x12:\n\x08SayHello\x12\x16.grpcdemo.HelloRequest\x1a\x14.grpcdemo.HelloReply\"\x00\x12\x36\n\nFlipVector\x12\x10.grpcdemo.Vector\x1a\x10.grpcdemo.Vector\"\x00(\x01\x30\x01\x12\x36\n\nAddVectors\x12\x10.grpcdemo.Vector\x1a\x10.grpcdemo.Vector\"\x00(\x01\x30\x01\x12;\n\x0fMultiplyVectors\x12\x10.grpcdemo.Vector\x1a\x10.grpcdemo.Vector\"\x00(\x01\x30\x01\x12\x37\n\x0b\x41\x64\x64Matrices\x12\x10.grpcdemo.Matrix\x1a\x10.grpcdemo.Matrix\"\x00(\x01\x30\x01\x12<\n\x10MultiplyMatrices\x12\x10.grpcdemo.Matrix\x1a\x10.grpcdemo.Matrix\"\x00(\x01\x30\x01\x62\x06proto3')
-
-_DATATYPE = DESCRIPTOR.enum_types_by_name['DataType']
-DataType = enum_type_wrapper.EnumTypeWrapper(_DATATYPE)
-INTEGER = 0
-DOUBLE = 1
-
-
-_VECTOR = DESCRIPTOR.message_types_by_name['Vector']
-_MATRIX = DESCRIPTOR.message_types_by_name['Matrix']
-_HELLOREQUEST = DESCRIPTOR.message_types_by_name['HelloRequest']
-_HELLOREPLY = DESCRIPTOR.message_types_by_name['HelloReply']
-Vector = _reflection.GeneratedProtocolMessageType('Vector', (_message.Message,), {
-  'DESCRIPTOR' : _VECTOR,
-  '__module__' : 'grpcdemo_pb2'
-  # @@protoc_insertion_point(class_scope:grpcdemo.Vector)
-  })
-_sym_db.RegisterMessage(Vector)
-
-Matrix = _reflection.GeneratedProtocolMessageType('Matrix', (_message.Message,), {
-  'DESCRIPTOR' : _MATRIX,
-  '__module__' : 'grpcdemo_pb2'
-  # @@protoc_insertion_point(class_scope:grpcdemo.Matrix)
-  })
-_sym_db.RegisterMessage(Matrix)
-
-HelloRequest = _reflection.GeneratedProtocolMessageType('HelloRequest', (_message.Message,), {
-  'DESCRIPTOR' : _HELLOREQUEST,
-  '__module__' : 'grpcdemo_pb2'
-  # @@protoc_insertion_point(class_scope:grpcdemo.HelloRequest)
-  })
-_sym_db.RegisterMessage(HelloRequest)
-
-HelloReply = _reflection.GeneratedProtocolMessageType('HelloReply', (_message.Message,), {
-  'DESCRIPTOR' : _HELLOREPLY,
-  '__module__' : 'grpcdemo_pb2'
-  # @@protoc_insertion_point(class_scope:grpcdemo.HelloReply)
-  })
-_sym_db.RegisterMessage(HelloReply)
-
-_GRPCDEMO = DESCRIPTOR.services_by_name['GRPCDemo']
-if _descriptor._USE_C_DESCRIPTORS == False:
-
-  DESCRIPTOR._options = None
-  _DATATYPE._serialized_start=300
-  _DATATYPE._serialized_end=335
-  _VECTOR._serialized_start=28
-  _VECTOR._serialized_end=121
-  _MATRIX._serialized_start=123
-  _MATRIX._serialized_end=237
-  _HELLOREQUEST._serialized_start=239
-  _HELLOREQUEST._serialized_end=267
-  _HELLOREPLY._serialized_start=269
-  _HELLOREPLY._serialized_end=298
-  _GRPCDEMO._serialized_start=338
-  _GRPCDEMO._serialized_end=700
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, "grpcdemo_pb2", _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+    DESCRIPTOR._loaded_options = None
+    _globals["_DATATYPE"]._serialized_start = 1038
+    _globals["_DATATYPE"]._serialized_end = 1114
+    _globals["_LAYOUT"]._serialized_start = 1116
+    _globals["_LAYOUT"]._serialized_end = 1157
+    _globals["_OPERANDINFO"]._serialized_start = 29
+    _globals["_OPERANDINFO"]._serialized_end = 208
+    _globals["_SHAREDSEGMENT"]._serialized_start = 210
+    _globals["_SHAREDSEGMENT"]._serialized_end = 271
+    _globals["_MANIFEST"]._serialized_start = 273
+    _globals["_MANIFEST"]._serialized_end = 324
+    _globals["_VECTOR"]._serialized_start = 327
+    _globals["_VECTOR"]._serialized_end = 482
+    _globals["_MATRIX"]._serialized_start = 485
+    _globals["_MATRIX"]._serialized_end = 695
+    _globals["_HELLOREQUEST"]._serialized_start = 697
+    _globals["_HELLOREQUEST"]._serialized_end = 725
+    _globals["_HELLOREPLY"]._serialized_start = 727
+    _globals["_HELLOREPLY"]._serialized_end = 756
+    _globals["_HANDLE"]._serialized_start = 758
+    _globals["_HANDLE"]._serialized_end = 782
+    _globals["_RELEASEREPLY"]._serialized_start = 784
+    _globals["_RELEASEREPLY"]._serialized_end = 816
+    _globals["_STATSREQUEST"]._serialized_start = 818
+    _globals["_STATSREQUEST"]._serialized_end = 832
+    _globals["_STATSREPLY"]._serialized_start = 834
+    _globals["_STATSREPLY"]._serialized_end = 862
+    _globals["_CAPABILITIESREQUEST"]._serialized_start = 864
+    _globals["_CAPABILITIESREQUEST"]._serialized_end = 885
+    _globals["_CAPABILITIESREPLY"]._serialized_start = 888
+    _globals["_CAPABILITIESREPLY"]._serialized_end = 1036
+    _globals["_GRPCDEMO"]._serialized_start = 1160
+    _globals["_GRPCDEMO"]._serialized_end = 2074
 # @@protoc_insertion_point(module_scope)
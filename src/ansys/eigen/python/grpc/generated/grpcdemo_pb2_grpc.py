@@ -20,19 +20,44 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
 """Client and server classes corresponding to protobuf-defined services."""
+
 import grpc
+import warnings
 
 import ansys.eigen.python.grpc.generated.grpcdemo_pb2 as grpcdemo__pb2
 
+GRPC_GENERATED_VERSION = "1.82.1"
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+
+    _version_not_supported = first_version_is_lower(
+        GRPC_VERSION, GRPC_GENERATED_VERSION
+    )
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f"The grpc package installed is at version {GRPC_VERSION},"
+        + " but the generated code in grpcdemo_pb2_grpc.py depends on"
+        + f" grpcio>={GRPC_GENERATED_VERSION}."
+        + f" Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}"
+        + f" or downgrade your generated code using grpcio-tools<={GRPC_VERSION}."
+    )
+
 
-class GRPCDemoStub(object):
+class GRPCDemoStub:
     """================================================================================
     DEMO SERVICE for API Eigen Example
     ================================================================================
 
-    Interface exported by the server. Different from REST. You do not need to post
-    (store) in the end server the objects of the interface (such as Vector, Matrix).
+    Interface exported by the server. Different from REST... You do not need to post
+    (store) in the end server the objects of the interface (Vector, Matrix)
     """
 
     def __init__(self, channel):
@@ -42,235 +67,745 @@ class GRPCDemoStub(object):
             channel: A grpc.Channel.
         """
         self.SayHello = channel.unary_unary(
-                '/grpcdemo.GRPCDemo/SayHello',
-                request_serializer=grpcdemo__pb2.HelloRequest.SerializeToString,
-                response_deserializer=grpcdemo__pb2.HelloReply.FromString,
-                )
+            "/grpcdemo.GRPCDemo/SayHello",
+            request_serializer=grpcdemo__pb2.HelloRequest.SerializeToString,
+            response_deserializer=grpcdemo__pb2.HelloReply.FromString,
+            _registered_method=True,
+        )
         self.FlipVector = channel.stream_stream(
-                '/grpcdemo.GRPCDemo/FlipVector',
-                request_serializer=grpcdemo__pb2.Vector.SerializeToString,
-                response_deserializer=grpcdemo__pb2.Vector.FromString,
-                )
+            "/grpcdemo.GRPCDemo/FlipVector",
+            request_serializer=grpcdemo__pb2.Vector.SerializeToString,
+            response_deserializer=grpcdemo__pb2.Vector.FromString,
+            _registered_method=True,
+        )
         self.AddVectors = channel.stream_stream(
-                '/grpcdemo.GRPCDemo/AddVectors',
-                request_serializer=grpcdemo__pb2.Vector.SerializeToString,
-                response_deserializer=grpcdemo__pb2.Vector.FromString,
-                )
+            "/grpcdemo.GRPCDemo/AddVectors",
+            request_serializer=grpcdemo__pb2.Vector.SerializeToString,
+            response_deserializer=grpcdemo__pb2.Vector.FromString,
+            _registered_method=True,
+        )
         self.MultiplyVectors = channel.stream_stream(
-                '/grpcdemo.GRPCDemo/MultiplyVectors',
-                request_serializer=grpcdemo__pb2.Vector.SerializeToString,
-                response_deserializer=grpcdemo__pb2.Vector.FromString,
-                )
+            "/grpcdemo.GRPCDemo/MultiplyVectors",
+            request_serializer=grpcdemo__pb2.Vector.SerializeToString,
+            response_deserializer=grpcdemo__pb2.Vector.FromString,
+            _registered_method=True,
+        )
         self.AddMatrices = channel.stream_stream(
-                '/grpcdemo.GRPCDemo/AddMatrices',
-                request_serializer=grpcdemo__pb2.Matrix.SerializeToString,
-                response_deserializer=grpcdemo__pb2.Matrix.FromString,
-                )
+            "/grpcdemo.GRPCDemo/AddMatrices",
+            request_serializer=grpcdemo__pb2.Matrix.SerializeToString,
+            response_deserializer=grpcdemo__pb2.Matrix.FromString,
+            _registered_method=True,
+        )
         self.MultiplyMatrices = channel.stream_stream(
-                '/grpcdemo.GRPCDemo/MultiplyMatrices',
-                request_serializer=grpcdemo__pb2.Matrix.SerializeToString,
-                response_deserializer=grpcdemo__pb2.Matrix.FromString,
-                )
+            "/grpcdemo.GRPCDemo/MultiplyMatrices",
+            request_serializer=grpcdemo__pb2.Matrix.SerializeToString,
+            response_deserializer=grpcdemo__pb2.Matrix.FromString,
+            _registered_method=True,
+        )
+        self.BatchAddVectors = channel.stream_stream(
+            "/grpcdemo.GRPCDemo/BatchAddVectors",
+            request_serializer=grpcdemo__pb2.Vector.SerializeToString,
+            response_deserializer=grpcdemo__pb2.Vector.FromString,
+            _registered_method=True,
+        )
+        self.BatchMultiplyMatrices = channel.stream_stream(
+            "/grpcdemo.GRPCDemo/BatchMultiplyMatrices",
+            request_serializer=grpcdemo__pb2.Matrix.SerializeToString,
+            response_deserializer=grpcdemo__pb2.Matrix.FromString,
+            _registered_method=True,
+        )
+        self.UploadVector = channel.stream_unary(
+            "/grpcdemo.GRPCDemo/UploadVector",
+            request_serializer=grpcdemo__pb2.Vector.SerializeToString,
+            response_deserializer=grpcdemo__pb2.Handle.FromString,
+            _registered_method=True,
+        )
+        self.UploadMatrix = channel.stream_unary(
+            "/grpcdemo.GRPCDemo/UploadMatrix",
+            request_serializer=grpcdemo__pb2.Matrix.SerializeToString,
+            response_deserializer=grpcdemo__pb2.Handle.FromString,
+            _registered_method=True,
+        )
+        self.DownloadVector = channel.unary_stream(
+            "/grpcdemo.GRPCDemo/DownloadVector",
+            request_serializer=grpcdemo__pb2.Handle.SerializeToString,
+            response_deserializer=grpcdemo__pb2.Vector.FromString,
+            _registered_method=True,
+        )
+        self.DownloadMatrix = channel.unary_stream(
+            "/grpcdemo.GRPCDemo/DownloadMatrix",
+            request_serializer=grpcdemo__pb2.Handle.SerializeToString,
+            response_deserializer=grpcdemo__pb2.Matrix.FromString,
+            _registered_method=True,
+        )
+        self.Release = channel.unary_unary(
+            "/grpcdemo.GRPCDemo/Release",
+            request_serializer=grpcdemo__pb2.Handle.SerializeToString,
+            response_deserializer=grpcdemo__pb2.ReleaseReply.FromString,
+            _registered_method=True,
+        )
+        self.GetStats = channel.unary_unary(
+            "/grpcdemo.GRPCDemo/GetStats",
+            request_serializer=grpcdemo__pb2.StatsRequest.SerializeToString,
+            response_deserializer=grpcdemo__pb2.StatsReply.FromString,
+            _registered_method=True,
+        )
+        self.GetCapabilities = channel.unary_unary(
+            "/grpcdemo.GRPCDemo/GetCapabilities",
+            request_serializer=grpcdemo__pb2.CapabilitiesRequest.SerializeToString,
+            response_deserializer=grpcdemo__pb2.CapabilitiesReply.FromString,
+            _registered_method=True,
+        )
 
 
-class GRPCDemoServicer(object):
+class GRPCDemoServicer:
     """================================================================================
     DEMO SERVICE for API Eigen Example
     ================================================================================
 
-    Interface exported by the server. Different from REST. You do not need to post
-    (store) in the end server the objects of the interface (such as Vector, Matrix).
+    Interface exported by the server. Different from REST... You do not need to post
+    (store) in the end server the objects of the interface (Vector, Matrix)
     """
 
     def SayHello(self, request, context):
-        """Send a greeting.
-        """
+        """Send a greeting"""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-        context.set_details('Method is not implemented.')
-        raise NotImplementedError('Method is not implemented.')
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
 
     def FlipVector(self, request_iterator, context):
-        """Flip a vector [A, B, C, D] --> [D, C, B, A].
-        """
+        """Flip a vector [A, B, C, D] --> [D, C, B, A]"""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-        context.set_details('Method is not implemented.')
-        raise NotImplementedError('Method is not implemented.')
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
 
     def AddVectors(self, request_iterator, context):
-        """Add two vectors.
-        """
+        """Add two vectors"""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-        context.set_details('Method is not implemented.')
-        raise NotImplementedError('Method is not implemented.')
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
 
     def MultiplyVectors(self, request_iterator, context):
-        """Multiple two vectors.
-        """
+        """Multiply two vectors"""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-        context.set_details('Method is not implemented.')
-        raise NotImplementedError('Method is not implemented.')
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
 
     def AddMatrices(self, request_iterator, context):
-        """Adds two matrices.
-        """
+        """Add two matrices"""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-        context.set_details('Method not implemented.')
-        raise NotImplementedError('Method is not implemented.')
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
 
     def MultiplyMatrices(self, request_iterator, context):
-        """Multiplies two matrices.
+        """Multiply two matrices"""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def BatchAddVectors(self, request_iterator, context):
+        """Add K independent pairs of vectors. Each side of the pairs is stacked into a
+        single vector of K items (see the "batch-size" metadata), and so is the result.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def BatchMultiplyMatrices(self, request_iterator, context):
+        """Multiply K independent pairs of matrices. Each side of the pairs is stacked into
+        a single matrix of K items (see the "batch-size" metadata), and so is the result.
         """
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-        context.set_details('Method is not implemented.')
-        raise NotImplementedError('Method is not implemented.')
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def UploadVector(self, request_iterator, context):
+        """Store a vector (or matrix) in the server and return its handle. Operations accept
+        handles instead of operands (see the "vec%d-handle" and "mat%d-handle" metadata), and
+        can store their result instead of sending it (see the "store-result" metadata).
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def UploadMatrix(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def DownloadVector(self, request, context):
+        """Retrieve a stored vector (or matrix)"""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def DownloadMatrix(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def Release(self, request, context):
+        """Release a stored operand"""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def GetStats(self, request, context):
+        """Retrieve the statistics of the server (latencies, bytes and chunks per RPC)"""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def GetCapabilities(self, request, context):
+        """Retrieve the capabilities of the server (data types, codecs and message sizes)"""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
 
 
 def add_GRPCDemoServicer_to_server(servicer, server):
     rpc_method_handlers = {
-            'SayHello': grpc.unary_unary_rpc_method_handler(
-                    servicer.SayHello,
-                    request_deserializer=grpcdemo__pb2.HelloRequest.FromString,
-                    response_serializer=grpcdemo__pb2.HelloReply.SerializeToString,
-            ),
-            'FlipVector': grpc.stream_stream_rpc_method_handler(
-                    servicer.FlipVector,
-                    request_deserializer=grpcdemo__pb2.Vector.FromString,
-                    response_serializer=grpcdemo__pb2.Vector.SerializeToString,
-            ),
-            'AddVectors': grpc.stream_stream_rpc_method_handler(
-                    servicer.AddVectors,
-                    request_deserializer=grpcdemo__pb2.Vector.FromString,
-                    response_serializer=grpcdemo__pb2.Vector.SerializeToString,
-            ),
-            'MultiplyVectors': grpc.stream_stream_rpc_method_handler(
-                    servicer.MultiplyVectors,
-                    request_deserializer=grpcdemo__pb2.Vector.FromString,
-                    response_serializer=grpcdemo__pb2.Vector.SerializeToString,
-            ),
-            'AddMatrices': grpc.stream_stream_rpc_method_handler(
-                    servicer.AddMatrices,
-                    request_deserializer=grpcdemo__pb2.Matrix.FromString,
-                    response_serializer=grpcdemo__pb2.Matrix.SerializeToString,
-            ),
-            'MultiplyMatrices': grpc.stream_stream_rpc_method_handler(
-                    servicer.MultiplyMatrices,
-                    request_deserializer=grpcdemo__pb2.Matrix.FromString,
-                    response_serializer=grpcdemo__pb2.Matrix.SerializeToString,
-            ),
+        "SayHello": grpc.unary_unary_rpc_method_handler(
+            servicer.SayHello,
+            request_deserializer=grpcdemo__pb2.HelloRequest.FromString,
+            response_serializer=grpcdemo__pb2.HelloReply.SerializeToString,
+        ),
+        "FlipVector": grpc.stream_stream_rpc_method_handler(
+            servicer.FlipVector,
+            request_deserializer=grpcdemo__pb2.Vector.FromString,
+            response_serializer=grpcdemo__pb2.Vector.SerializeToString,
+        ),
+        "AddVectors": grpc.stream_stream_rpc_method_handler(
+            servicer.AddVectors,
+            request_deserializer=grpcdemo__pb2.Vector.FromString,
+            response_serializer=grpcdemo__pb2.Vector.SerializeToString,
+        ),
+        "MultiplyVectors": grpc.stream_stream_rpc_method_handler(
+            servicer.MultiplyVectors,
+            request_deserializer=grpcdemo__pb2.Vector.FromString,
+            response_serializer=grpcdemo__pb2.Vector.SerializeToString,
+        ),
+        "AddMatrices": grpc.stream_stream_rpc_method_handler(
+            servicer.AddMatrices,
+            request_deserializer=grpcdemo__pb2.Matrix.FromString,
+            response_serializer=grpcdemo__pb2.Matrix.SerializeToString,
+        ),
+        "MultiplyMatrices": grpc.stream_stream_rpc_method_handler(
+            servicer.MultiplyMatrices,
+            request_deserializer=grpcdemo__pb2.Matrix.FromString,
+            response_serializer=grpcdemo__pb2.Matrix.SerializeToString,
+        ),
+        "BatchAddVectors": grpc.stream_stream_rpc_method_handler(
+            servicer.BatchAddVectors,
+            request_deserializer=grpcdemo__pb2.Vector.FromString,
+            response_serializer=grpcdemo__pb2.Vector.SerializeToString,
+        ),
+        "BatchMultiplyMatrices": grpc.stream_stream_rpc_method_handler(
+            servicer.BatchMultiplyMatrices,
+            request_deserializer=grpcdemo__pb2.Matrix.FromString,
+            response_serializer=grpcdemo__pb2.Matrix.SerializeToString,
+        ),
+        "UploadVector": grpc.stream_unary_rpc_method_handler(
+            servicer.UploadVector,
+            request_deserializer=grpcdemo__pb2.Vector.FromString,
+            response_serializer=grpcdemo__pb2.Handle.SerializeToString,
+        ),
+        "UploadMatrix": grpc.stream_unary_rpc_method_handler(
+            servicer.UploadMatrix,
+            request_deserializer=grpcdemo__pb2.Matrix.FromString,
+            response_serializer=grpcdemo__pb2.Handle.SerializeToString,
+        ),
+        "DownloadVector": grpc.unary_stream_rpc_method_handler(
+            servicer.DownloadVector,
+            request_deserializer=grpcdemo__pb2.Handle.FromString,
+            response_serializer=grpcdemo__pb2.Vector.SerializeToString,
+        ),
+        "DownloadMatrix": grpc.unary_stream_rpc_method_handler(
+            servicer.DownloadMatrix,
+            request_deserializer=grpcdemo__pb2.Handle.FromString,
+            response_serializer=grpcdemo__pb2.Matrix.SerializeToString,
+        ),
+        "Release": grpc.unary_unary_rpc_method_handler(
+            servicer.Release,
+            request_deserializer=grpcdemo__pb2.Handle.FromString,
+            response_serializer=grpcdemo__pb2.ReleaseReply.SerializeToString,
+        ),
+        "GetStats": grpc.unary_unary_rpc_method_handler(
+            servicer.GetStats,
+            request_deserializer=grpcdemo__pb2.StatsRequest.FromString,
+            response_serializer=grpcdemo__pb2.StatsReply.SerializeToString,
+        ),
+        "GetCapabilities": grpc.unary_unary_rpc_method_handler(
+            servicer.GetCapabilities,
+            request_deserializer=grpcdemo__pb2.CapabilitiesRequest.FromString,
+            response_serializer=grpcdemo__pb2.CapabilitiesReply.SerializeToString,
+        ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
-            'grpcdemo.GRPCDemo', rpc_method_handlers)
+        "grpcdemo.GRPCDemo", rpc_method_handlers
+    )
     server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers("grpcdemo.GRPCDemo", rpc_method_handlers)
 
 
- # This class is part of an EXPERIMENTAL API.
-class GRPCDemo(object):
+# This class is part of an EXPERIMENTAL API.
+class GRPCDemo:
     """================================================================================
     DEMO SERVICE for API Eigen Example
     ================================================================================
 
-    Interface exported by the server. Different from REST. You do not need to post
-    (store) in the end server the objects of the interface (such as Vector, Matrix).
+    Interface exported by the server. Different from REST... You do not need to post
+    (store) in the end server the objects of the interface (Vector, Matrix)
     """
 
     @staticmethod
-    def SayHello(request,
+    def SayHello(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
             target,
-            options=(),
-            channel_credentials=None,
-            call_credentials=None,
-            insecure=False,
-            compression=None,
-            wait_for_ready=None,
-            timeout=None,
-            metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/grpcdemo.GRPCDemo/SayHello',
+            "/grpcdemo.GRPCDemo/SayHello",
             grpcdemo__pb2.HelloRequest.SerializeToString,
             grpcdemo__pb2.HelloReply.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
 
     @staticmethod
-    def FlipVector(request_iterator,
+    def FlipVector(
+        request_iterator,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.stream_stream(
+            request_iterator,
             target,
-            options=(),
-            channel_credentials=None,
-            call_credentials=None,
-            insecure=False,
-            compression=None,
-            wait_for_ready=None,
-            timeout=None,
-            metadata=None):
-        return grpc.experimental.stream_stream(request_iterator, target, '/grpcdemo.GRPCDemo/FlipVector',
+            "/grpcdemo.GRPCDemo/FlipVector",
             grpcdemo__pb2.Vector.SerializeToString,
             grpcdemo__pb2.Vector.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
 
     @staticmethod
-    def AddVectors(request_iterator,
+    def AddVectors(
+        request_iterator,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.stream_stream(
+            request_iterator,
             target,
-            options=(),
-            channel_credentials=None,
-            call_credentials=None,
-            insecure=False,
-            compression=None,
-            wait_for_ready=None,
-            timeout=None,
-            metadata=None):
-        return grpc.experimental.stream_stream(request_iterator, target, '/grpcdemo.GRPCDemo/AddVectors',
+            "/grpcdemo.GRPCDemo/AddVectors",
             grpcdemo__pb2.Vector.SerializeToString,
             grpcdemo__pb2.Vector.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
 
     @staticmethod
-    def MultiplyVectors(request_iterator,
+    def MultiplyVectors(
+        request_iterator,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.stream_stream(
+            request_iterator,
             target,
-            options=(),
-            channel_credentials=None,
-            call_credentials=None,
-            insecure=False,
-            compression=None,
-            wait_for_ready=None,
-            timeout=None,
-            metadata=None):
-        return grpc.experimental.stream_stream(request_iterator, target, '/grpcdemo.GRPCDemo/MultiplyVectors',
+            "/grpcdemo.GRPCDemo/MultiplyVectors",
             grpcdemo__pb2.Vector.SerializeToString,
             grpcdemo__pb2.Vector.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
 
     @staticmethod
-    def AddMatrices(request_iterator,
+    def AddMatrices(
+        request_iterator,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.stream_stream(
+            request_iterator,
             target,
-            options=(),
-            channel_credentials=None,
-            call_credentials=None,
-            insecure=False,
-            compression=None,
-            wait_for_ready=None,
-            timeout=None,
-            metadata=None):
-        return grpc.experimental.stream_stream(request_iterator, target, '/grpcdemo.GRPCDemo/AddMatrices',
+            "/grpcdemo.GRPCDemo/AddMatrices",
             grpcdemo__pb2.Matrix.SerializeToString,
             grpcdemo__pb2.Matrix.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
 
     @staticmethod
-    def MultiplyMatrices(request_iterator,
+    def MultiplyMatrices(
+        request_iterator,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.stream_stream(
+            request_iterator,
             target,
-            options=(),
-            channel_credentials=None,
-            call_credentials=None,
-            insecure=False,
-            compression=None,
-            wait_for_ready=None,
-            timeout=None,
-            metadata=None):
-        return grpc.experimental.stream_stream(request_iterator, target, '/grpcdemo.GRPCDemo/MultiplyMatrices',
+            "/grpcdemo.GRPCDemo/MultiplyMatrices",
             grpcdemo__pb2.Matrix.SerializeToString,
             grpcdemo__pb2.Matrix.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def BatchAddVectors(
+        request_iterator,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            "/grpcdemo.GRPCDemo/BatchAddVectors",
+            grpcdemo__pb2.Vector.SerializeToString,
+            grpcdemo__pb2.Vector.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def BatchMultiplyMatrices(
+        request_iterator,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            "/grpcdemo.GRPCDemo/BatchMultiplyMatrices",
+            grpcdemo__pb2.Matrix.SerializeToString,
+            grpcdemo__pb2.Matrix.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def UploadVector(
+        request_iterator,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            "/grpcdemo.GRPCDemo/UploadVector",
+            grpcdemo__pb2.Vector.SerializeToString,
+            grpcdemo__pb2.Handle.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def UploadMatrix(
+        request_iterator,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            "/grpcdemo.GRPCDemo/UploadMatrix",
+            grpcdemo__pb2.Matrix.SerializeToString,
+            grpcdemo__pb2.Handle.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def DownloadVector(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            "/grpcdemo.GRPCDemo/DownloadVector",
+            grpcdemo__pb2.Handle.SerializeToString,
+            grpcdemo__pb2.Vector.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def DownloadMatrix(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            "/grpcdemo.GRPCDemo/DownloadMatrix",
+            grpcdemo__pb2.Handle.SerializeToString,
+            grpcdemo__pb2.Matrix.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def Release(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/grpcdemo.GRPCDemo/Release",
+            grpcdemo__pb2.Handle.SerializeToString,
+            grpcdemo__pb2.ReleaseReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def GetStats(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/grpcdemo.GRPCDemo/GetStats",
+            grpcdemo__pb2.StatsRequest.SerializeToString,
+            grpcdemo__pb2.StatsReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def GetCapabilities(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/grpcdemo.GRPCDemo/GetCapabilities",
+            grpcdemo__pb2.CapabilitiesRequest.SerializeToString,
+            grpcdemo__pb2.CapabilitiesReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
@@ -0,0 +1,155 @@
+# Copyright (C) 2023 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Python implementation of the executor lanes of the gRPC API Eigen Example server.
+
+Computations are run in one of two executors (lanes), depending on their estimated
+cost (see the ``admission`` module): cheap ones in the ``fast`` lane, and expensive
+ones in the ``heavy`` lane. Thus, a few expensive computations cannot take all the
+threads, and cheap ones do not queue behind them.
+"""
+
+from concurrent import futures
+import threading
+
+HEAVY_THRESHOLD = 256**3
+"""Default estimated cost from which computations are run in the heavy lane."""
+
+LANES = ("fast", "heavy")
+"""Names of the lanes."""
+
+
+class _Lane:
+    """Executor of a lane, and its counters."""
+
+    def __init__(self, name, workers):
+        self.executor = futures.ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="%s-lane" % name
+        )
+        self.workers = workers
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+
+
+class ExecutorLanes:
+    """Provides the fast and heavy executor lanes of the computations.
+
+    Parameters
+    ----------
+    heavy_threshold : int, optional
+        Estimated cost from which computations are run in the heavy lane. The default
+        is ``HEAVY_THRESHOLD`` (a 256x256 matrix multiplication).
+    fast_workers : int, optional
+        Number of threads of the fast lane. The default is 8.
+    heavy_workers : int, optional
+        Number of threads of the heavy lane. The default is 2.
+    """
+
+    def __init__(
+        self,
+        heavy_threshold: int = HEAVY_THRESHOLD,
+        fast_workers: int = 8,
+        heavy_workers: int = 2,
+    ):
+        """Initialize the lanes (their threads are started on demand)."""
+        self.heavy_threshold = heavy_threshold
+        self._lanes = {
+            "fast": _Lane("fast", fast_workers),
+            "heavy": _Lane("heavy", heavy_workers),
+        }
+        self._lock = threading.Lock()
+
+    def lane(self, cost: int) -> str:
+        """Return the lane of a computation.
+
+        Parameters
+        ----------
+        cost : int
+            Estimated cost of the computation.
+
+        Returns
+        -------
+        str
+            Name of the lane. Options are ``"fast"`` and ``"heavy"``.
+        """
+        return "heavy" if cost >= self.heavy_threshold else "fast"
+
+    def submit(self, cost: int, function, *args) -> futures.Future:
+        """Run a computation in its lane.
+
+        Parameters
+        ----------
+        cost : int
+            Estimated cost of the computation.
+        function : callable
+            Function to run.
+        *args : tuple
+            Arguments of the function.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Future of the result of the function.
+        """
+        lane = self._lanes[self.lane(cost)]
+        with self._lock:
+            lane.queued += 1
+        return lane.executor.submit(self._run, lane, function, *args)
+
+    def stats(self) -> dict:
+        """Return the counters of the lanes.
+
+        Returns
+        -------
+        dict
+            Workers, queued (waiting for a thread), running and completed computations
+            of each lane, such as ``fast_queued``.
+        """
+        with self._lock:
+            return {
+                "%s_%s" % (name, counter): getattr(self._lanes[name], counter)
+                for name in LANES
+                for counter in ("workers", "queued", "running", "completed")
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Shut down the executors of the lanes.
+
+        Parameters
+        ----------
+        wait : bool, optional
+            Whether to wait for the pending computations. The default is ``True``.
+        """
+        for lane in self._lanes.values():
+            lane.executor.shutdown(wait=wait)
+
+    def _run(self, lane, function, *args):
+        with self._lock:
+            lane.queued -= 1
+            lane.running += 1
+        try:
+            return function(*args)
+        finally:
+            with self._lock:
+                lane.running -= 1
+                lane.completed += 1
@@ -0,0 +1,200 @@
+# Copyright (C) 2023 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Python implementation of the compute offload of the gRPC API Eigen Example server.
+
+Heavy Eigen computations can be run in a pool of worker processes, instead of the
+threads of the server. Thus, neither the computations nor the Python code around them
+compete for the GIL with the threads serving the RPCs.
+
+Operands are not pickled: they are copied once into a shared memory segment (see the
+``sharedmem`` module), which the worker maps. The worker hands the result over in a
+segment named by the server, which maps it without copying it... or releases it, if
+the worker fails before handing it over. Pools broken by a worker that died are
+replaced, so that only the computations in flight fail.
+"""
+
+from concurrent import futures
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import threading
+
+import demo_eigen_wrapper
+import numpy as np
+
+import ansys.eigen.python.grpc.constants as constants
+import ansys.eigen.python.grpc.generated.grpcdemo_pb2 as grpcdemo_pb2
+import ansys.eigen.python.grpc.sharedmem as sharedmem
+
+
+def _run_kernel(kernel: str, regions: list, operands: list, result_name: str):
+    """Run an Eigen kernel in a worker process.
+
+    Parameters
+    ----------
+    kernel : str
+        Name of the function of ``demo_eigen_wrapper`` to run.
+    regions : list[tuple]
+        Regions of the operands (as name, offset and size tuples, since the messages
+        cannot be pickled), in the segment owned by the server.
+    operands : list[tuple]
+        Data type, shape and memory order of each operand.
+    result_name : str
+        Name of the segment of the result, chosen by the server.
+
+    Returns
+    -------
+    tuple
+        Region of the result (owned by the server from then on), and its data type,
+        shape and memory order.
+    """
+    # Workers share the resource tracker of the server... which tracks the segment
+    arrays = [
+        sharedmem.attach(
+            grpcdemo_pb2.SharedSegment(name=name, offset=offset, nbytes=nbytes),
+            dtype,
+            shape,
+            order,
+            untrack=False,
+        )
+        for (name, offset, nbytes), (dtype, shape, order) in zip(regions, operands)
+    ]
+    result = np.asarray(getattr(demo_eigen_wrapper, kernel)(*arrays))
+    del arrays
+
+    segment = sharedmem.export(result, result_name)
+    return (
+        (segment.name, segment.offset, segment.nbytes),
+        result.dtype.str,
+        result.shape,
+        constants.memory_order(result),
+    )
+
+
+class ProcessOffload:
+    """Runs Eigen kernels in a pool of worker processes.
+
+    Workers are started (with the ``spawn`` method, since forking a process serving
+    gRPC is not supported) as computations are submitted.
+
+    Parameters
+    ----------
+    processes : int
+        Number of worker processes.
+    """
+
+    def __init__(self, processes: int):
+        """Initialize the pool (no worker is started yet)."""
+        self.processes = processes
+        self._executor = self._new_executor()
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._lock = threading.Lock()
+
+    def run(self, kernel: str, *arrays: np.ndarray) -> np.ndarray:
+        """Run an Eigen kernel in a worker process, waiting for its result.
+
+        Parameters
+        ----------
+        kernel : str
+            Name of the function of ``demo_eigen_wrapper`` to run. For example,
+            ``"multiply_matrices"``.
+        *arrays : np.ndarray
+            Operands of the kernel.
+
+        Returns
+        -------
+        np.ndarray
+            Result of the kernel (read-only).
+
+        Raises
+        ------
+        BrokenProcessPool
+            In case a worker process died (the pool is replaced for the next
+            computations).
+        """
+        with self._lock:
+            self._running += 1
+            executor = self._executor
+        result_name = sharedmem.segment_name()
+        try:
+            shm, regions = sharedmem.share(arrays)
+            try:
+                future = executor.submit(
+                    _run_kernel,
+                    kernel,
+                    [(region.name, region.offset, region.nbytes) for region in regions],
+                    [
+                        (array.dtype.str, array.shape, constants.memory_order(array))
+                        for array in arrays
+                    ],
+                    result_name,
+                )
+                (name, offset, nbytes), dtype, shape, order = future.result()
+            finally:
+                sharedmem.release(shm)
+        except BaseException as err:
+            # The worker may have exported the result before failing
+            sharedmem.discard(result_name)
+            with self._lock:
+                self._running -= 1
+                self._failed += 1
+                broken = (
+                    isinstance(err, BrokenProcessPool) and self._executor is executor
+                )
+                if broken:
+                    self._executor = self._new_executor()
+            if broken:
+                executor.shutdown(wait=False)
+            raise
+
+        with self._lock:
+            self._running -= 1
+            self._completed += 1
+        segment = grpcdemo_pb2.SharedSegment(name=name, offset=offset, nbytes=nbytes)
+        return sharedmem.adopt(segment, dtype, shape, order)
+
+    def stats(self) -> dict:
+        """Return the counters of the pool.
+
+        Returns
+        -------
+        dict
+            Worker processes, and computations running, completed and failed.
+        """
+        with self._lock:
+            return {
+                "processes": self.processes,
+                "running": self._running,
+                "completed": self._completed,
+                "failed": self._failed,
+            }
+
+    def shutdown(self):
+        """Stop the worker processes, once their computations are finished."""
+        self._executor.shutdown()
+
+    def _new_executor(self):
+        return futures.ProcessPoolExecutor(
+            max_workers=self.processes, mp_context=multiprocessing.get_context("spawn")
+        )
@@ -22,17 +22,57 @@
 
 """Python implementation of the gRPC API Eigen example server."""
 
+import asyncio
+from collections import deque, namedtuple
 from concurrent import futures
+import contextlib
+import functools
+import ipaddress
 import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import threading
 
 import click
 import demo_eigen_wrapper
 import grpc
 import numpy as np
 
+from ansys.eigen.python.grpc.admission import (
+    DEFAULT_BUDGET,
+    AdmissionController,
+    OverloadedError,
+)
+from ansys.eigen.python.grpc.batcher import MicroBatcher
+from ansys.eigen.python.grpc.cache import CachedResponse, ResultCache, SingleFlight
+from ansys.eigen.python.grpc.compression import (
+    CHUNK_CODECS,
+    COMPRESSION_THRESHOLD,
+    GRPC_CODECS,
+    compress_message,
+    decompress_chunk,
+)
 import ansys.eigen.python.grpc.constants as constants
+from ansys.eigen.python.grpc.framing import Frame, add_raw_servicer_to_server, is_raw
 import ansys.eigen.python.grpc.generated.grpcdemo_pb2 as grpcdemo_pb2
 import ansys.eigen.python.grpc.generated.grpcdemo_pb2_grpc as grpcdemo_pb2_grpc
+from ansys.eigen.python.grpc.lanes import HEAVY_THRESHOLD, ExecutorLanes
+from ansys.eigen.python.grpc.offload import ProcessOffload
+import ansys.eigen.python.grpc.sharedmem as sharedmem
+from ansys.eigen.python.grpc.stats import (
+    AsyncStatsInterceptor,
+    ServerStats,
+    StatsInterceptor,
+)
+from ansys.eigen.python.grpc.store import OperandStore, QuotaExceededError
+
+ABANDON_STAGES = ("receive", "compute", "send")
+"""Stages at which calls abandoned by their client are aborted (see ``GetStats``)."""
+
+ROW_PANELS = 8
+"""Number of panels in which the left matrix of a multiplication streamed by row panels
+is multiplied (see ``streams_row_panels``)."""
 
 # =================================================================================================
 # AUXILIARY METHODS for Server operations
@@ -99,14 +139,801 @@ def check_size(size, new_size):
         return size
 
 
+def get_protocol_version(md: dict) -> int:
+    """Get the version of the streaming protocol used by the client.
+
+    Parameters
+    ----------
+    md : dict
+        Metadata provided by the client.
+
+    Returns
+    -------
+    int
+        The ``protocol-version`` metadata or, if not provided, 1 (the original protocol).
+
+    Raises
+    ------
+    RuntimeError
+        In case the version is not handled by the server.
+    """
+    version = int(md.get("protocol-version", 1))
+    if version not in constants.PROTOCOL_VERSIONS:
+        raise RuntimeError("Unsupported protocol version: %d" % version)
+
+    return version
+
+
+def accepts_shared_memory(md: dict) -> bool:
+    """Check whether the client exchanges operands and results through shared memory.
+
+    Only clients on the same host as the server, using version 2 of the streaming
+    protocol, may do so (see the ``sharedmem`` module).
+
+    Parameters
+    ----------
+    md : dict
+        Metadata provided by the client.
+
+    Returns
+    -------
+    bool
+        Whether the ``shared-memory`` metadata is enabled.
+    """
+    return md.get("shared-memory") == "true" and get_protocol_version(md) == 2
+
+
+def is_local_peer(peer: str) -> bool:
+    """Check whether a peer is on the same host as the server.
+
+    Parameters
+    ----------
+    peer : str
+        Peer of a call, as given by ``grpc.ServicerContext.peer()``. For example,
+        ``"ipv4:127.0.0.1:51234"`` or ``"unix:/tmp/api-eigen.sock"``.
+
+    Returns
+    -------
+    bool
+        Whether the peer is connected through a Unix domain socket or a loopback
+        address.
+    """
+    if peer.startswith("unix:") or peer.startswith("unix-abstract:"):
+        return True
+    if not peer.startswith(("ipv4:", "ipv6:")):
+        return False
+
+    host = peer[5:].rsplit(":", 1)[0].strip("[]")
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    if getattr(address, "ipv4_mapped", None) is not None:
+        address = address.ipv4_mapped
+    return address.is_loopback
+
+
+def streams_row_panels(md: dict) -> bool:
+    """Check whether the client streams the operands of a multiplication by row panels.
+
+    In that case, the right matrix is sent first, and the left one (in row-major order)
+    is multiplied as its rows arrive (see ``_RowPanels``). Only in version 2 of the
+    streaming protocol.
+
+    Parameters
+    ----------
+    md : dict
+        Metadata provided by the client.
+
+    Returns
+    -------
+    bool
+        Whether the ``row-panels`` metadata is enabled.
+    """
+    return md.get("row-panels") == "true" and get_protocol_version(md) == 2
+
+
+def _spans_chunks(dtype, size: tuple, chunk_size: int) -> bool:
+    # Whether an array of the given type and size is sent in several chunks
+    return int(np.prod(size)) * np.dtype(dtype).itemsize > chunk_size
+
+
+_OperandInfo = namedtuple(
+    "_OperandInfo", ["dtype", "size", "order", "chunks", "handle", "segment"]
+)
+"""Description of an operand to receive (``None`` for the values that are unknown)."""
+
+
+class _ChunkAssembler:
+    """Reassemble a stream of partial vector or matrix messages into numpy arrays.
+
+    Messages are processed one at a time, which allows the same logic to be
+    shared by the synchronous and the asynchronous servicers.
+
+    Two versions of the streaming protocol are handled (see ``get_protocol_version``).
+    In version 1, the number of operands and the number of chunks of each operand are
+    provided as metadata (``full-vectors`` and ``vec%d-messages``, for example). In
+    version 2, the first message carries a ``Manifest`` describing the operands, and
+    the last chunk of each operand is flagged with ``end_of_operand``. Thus, the
+    number of chunks (and even the size of vectors) is not known in advance.
+
+    Parameters
+    ----------
+    message_type : str
+        Type of message being received. Options are ``vectors`` and ``matrices``.
+    md : dict
+        Metadata provided by the client.
+    fold : callable, optional
+        Function used to fold each incoming chunk into the first operand, such as
+        ``fold(reduction_chunk, chunk) -> new_reduction_chunk``. When provided, only
+        the reduction of all operands is kept in memory (and returned). The default
+        is ``None``, in which case all operands are returned.
+    hasher : hashlib.blake2b, optional
+        Hash object to update with the data type, shape and bytes of every operand.
+        The default is ``None``.
+    store : OperandStore, optional
+        Store from which the operands referenced by a handle (see the ``vec%d-handle``
+        and ``mat%d-handle`` metadata) are taken. The default is ``None``.
+    client : str, optional
+        Identifier of the client, owner of the handles. The default is ``None``.
+    admit : callable, optional
+        Function called with the size of the operands as soon as it is known (that is,
+        before receiving the rest of the chunks), such as ``AdmissionTicket.admit``.
+        The default is ``None``.
+    progress : callable, optional
+        Function called after each chunk of an operand of known size is received, such
+        as ``progress(operands, operand, received)``. It is given the operands complete
+        so far, the operand being received (whose first ``received`` elements, in memory
+        order, are already filled in) and the number of elements received. The default
+        is ``None``.
+    shared_memory : bool, optional
+        Whether operands may be provided in shared memory segments (see the
+        ``sharedmem`` module). The default is ``False``.
+    pins : contextlib.ExitStack, optional
+        Stack of the call in which the operands taken from the store are pinned (see
+        ``OperandStore.pin``), so that they are unpinned once the call is done with
+        them. It is required to take operands from the store. The default is ``None``.
+    """
+
+    def __init__(
+        self,
+        message_type: str,
+        md: dict,
+        fold=None,
+        hasher=None,
+        store=None,
+        client=None,
+        admit=None,
+        progress=None,
+        shared_memory=False,
+        pins=None,
+    ):
+        """Initialize the assembler from the metadata provided by the client."""
+        self._is_matrix = message_type == "matrices"
+        abbrev = "mat" if self._is_matrix else "vec"
+        self._fold = fold
+        self._hasher = hasher
+        self._store = store
+        self._client = client
+        self._admit = admit
+        self._progress = progress
+        self._shared_memory = shared_memory
+        self._pins = pins
+
+        # Chunks may be compressed (see the compression module)
+        self._codec = md.get("chunk-codec")
+
+        # Each operand is described by its data type, size, memory order, number of
+        # chunks and handle. In version 2, they are provided by the manifest.
+        self._infos = None
+        if get_protocol_version(md) == 1:
+            # Determine how many full messages are to be processed and how many
+            # partial messages constitute each full message
+            full_msgs = int(md.get("full-" + message_type))
+            self._infos = [
+                _OperandInfo(
+                    None,
+                    None,
+                    None,
+                    int(md.get("%s%d-messages" % (abbrev, msg))),
+                    md.get("%s%d-handle" % (abbrev, msg)),
+                    None,
+                )
+                for msg in range(1, full_msgs + 1)
+            ]
+
+        # Initialize the output list and some aux vars
+        self.dtype = None
+        self.size = None
+        self.operands = []
+        self._operand = None
+        self._order = None
+        self._parts = None
+        self._processed = 0
+        self._chunk_idx = 0
+        self._offset = 0
+
+        # When folding, the reduction of the operands (as a flat array in memory order)
+        self._reduction = None
+        self._reduction_order = None
+        self._fold_chunks = False
+
+        # The leading operands may not be streamed at all
+        if self._infos is not None:
+            self._take_stored_operands()
+
+    @property
+    def done(self) -> bool:
+        """Whether all the expected full messages have been processed."""
+        return self._infos is not None and self._processed == len(self._infos)
+
+    def process(self, chunk):
+        """Process a partial vector or matrix message.
+
+        Parameters
+        ----------
+        chunk : grpcdemo_pb2.Vector or grpcdemo_pb2.Matrix
+            Partial message received.
+
+        Raises
+        ------
+        RuntimeError
+            In case the message does not fit in the full message being processed.
+        """
+        # The first message of a version 2 stream only describes the operands
+        if self._infos is None:
+            self._read_manifest(chunk)
+            return
+
+        payload = chunk.matrix_as_chunk if self._is_matrix else chunk.vector_as_chunk
+
+        # Inform about the size of the message content
+        click.echo("Size of message: " + constants.human_size(payload))
+        if self._codec is not None:
+            payload = decompress_chunk(payload, self._codec)
+
+        # If processing the first chunk of the message, fill in some data
+        if self._chunk_idx == 0:
+            self._start_operand(chunk)
+
+        # Parse the chunk (no copy) and place it in the output operand... or fold it
+        # into the reduction of the previous operands
+        tmp = np.frombuffer(payload, dtype=self.dtype)
+        if self._hasher is not None:
+            self._hasher.update(payload)
+        target = self._reduction if self._fold_chunks else self._operand
+        if target is None:
+            # The size is unknown... keep the chunks until the operand is complete
+            self._parts.append(tmp)
+        elif self._offset + tmp.size > target.size:
+            raise RuntimeError(self._error_msg())
+        else:
+            chunk_slice = slice(self._offset, self._offset + tmp.size)
+            if self._fold_chunks:
+                target[chunk_slice] = self._fold(target[chunk_slice], tmp)
+            else:
+                target[chunk_slice] = tmp
+        self._offset += tmp.size
+        self._chunk_idx += 1
+
+        # Let the caller work on the part of the operand already received
+        if self._progress is not None and target is self._operand is not None:
+            self._progress(
+                self.operands,
+                np.reshape(self._operand, self.size, order=self._order),
+                self._offset,
+            )
+
+        # If this was the last chunk of the message, the operand is complete
+        chunks = self._infos[self._processed].chunks
+        if chunk.end_of_operand if chunks is None else self._chunk_idx == chunks:
+            self._finish_operand()
+
+    def _read_manifest(self, chunk):
+        # Read the description of the operands
+        if not chunk.HasField("manifest"):
+            raise RuntimeError("The first message of the stream must be a manifest.")
+
+        self._infos = []
+        for info in chunk.manifest.operands:
+            if info.handle:
+                self._infos.append(
+                    _OperandInfo(None, None, None, None, info.handle, None)
+                )
+                continue
+
+            # Only vectors may be of unknown size (unless they are in shared memory)
+            size = tuple(info.shape) or None
+            if size is None and (self._is_matrix or info.HasField("segment")):
+                raise RuntimeError(self._error_msg())
+            if size is not None and len(size) != (2 if self._is_matrix else 1):
+                raise RuntimeError(self._error_msg())
+
+            dtype = constants.DATATYPE_TO_NP_DTYPE[
+                grpcdemo_pb2.DataType.Name(info.data_type)
+            ]
+            order = constants.LAYOUT_TO_ORDER[grpcdemo_pb2.Layout.Name(info.layout)]
+            segment = info.segment if info.HasField("segment") else None
+            self._infos.append(_OperandInfo(dtype, size, order, None, None, segment))
+
+        # The leading operands may not be streamed at all
+        self._take_stored_operands()
+
+    def _check_operand(self, dtype, size, order):
+        # Check the data type and size of the incoming vector or matrix
+        self.dtype = check_data_type(self.dtype, dtype)
+        self.size = check_size(self.size, size)
+
+        # The call is admitted once the size of its operands is known
+        if self._admit is not None:
+            admit, self._admit = self._admit, None
+            admit(self.size)
+
+        # Operands of different types, shapes or layouts must not share the same key
+        if self._hasher is not None:
+            self._hasher.update(
+                ("%s%s%s" % (np.dtype(self.dtype).str, self.size, order)).encode()
+            )
+
+    def _start_operand(self, chunk):
+        # In version 2, the operand is described by the manifest
+        dtype, size, order, _, _, _ = self._infos[self._processed]
+        if dtype is None:
+            # Check the data type of the incoming vector or matrix
+            dtype = constants.DATATYPE_TO_NP_DTYPE.get(
+                grpcdemo_pb2.DataType.Name(chunk.data_type), self.dtype
+            )
+
+            # Check the size (and layout) of the incoming vector or matrix
+            if self._is_matrix:
+                size = (chunk.matrix_rows, chunk.matrix_cols)
+                order = constants.LAYOUT_TO_ORDER[
+                    grpcdemo_pb2.Layout.Name(chunk.layout)
+                ]
+            else:
+                size = (chunk.vector_size,)
+        self._order = order or "C"
+
+        # A vector of unknown size must match the previous operands (if any)
+        size = size or self.size
+        if size is None:
+            self.dtype = check_data_type(self.dtype, dtype)
+        else:
+            self._check_operand(dtype, size, self._order)
+
+        # When folding, chunks are folded into the reduction as they come... unless their
+        # elements are not in the same order (then, the whole operand is folded at the end)
+        self._fold_chunks = self._reduction is not None and (
+            self._order == self._reduction_order
+        )
+
+        # Allocate the full operand once (as a flat array in memory order)... chunks are
+        # copied into their slot
+        if not self._fold_chunks:
+            if size is None:
+                self._operand, self._parts = None, []
+            else:
+                self._operand = np.empty(int(np.prod(self.size)), dtype=self.dtype)
+        self._offset = 0
+
+    def _finish_operand(self):
+        if self._fold_chunks:
+            # Check if the operand folded has the desired size
+            if self._offset != self._reduction.size:
+                raise RuntimeError(self._error_msg())
+        else:
+            # If the size was unknown, join the chunks received
+            if self._operand is None:
+                self._operand = np.concatenate(self._parts or [np.empty(0, self.dtype)])
+                self._parts = None
+                self._check_operand(self.dtype, self._operand.shape, self._order)
+
+            # Check if the final operand has the desired size
+            if self._offset != self._operand.size:
+                raise RuntimeError(self._error_msg())
+
+            # If everything is fine, append to the operands list (reshaping in memory
+            # order is a view)... or fold it into the reduction
+            self._add_operand(np.reshape(self._operand, self.size, order=self._order))
+            self._operand = None
+
+        self._processed += 1
+        self._chunk_idx = 0
+
+        # The following operands may not be streamed at all
+        self._take_stored_operands()
+
+    def _add_operand(self, array):
+        # Without folding, all operands are kept
+        if self._fold is None:
+            self.operands.append(array)
+
+        # The first operand is the initial reduction (copied, unless it is writable)
+        elif self._reduction is None:
+            self._reduction_order = constants.memory_order(array)
+            self._reduction = array.ravel(order=self._reduction_order)
+            if not self._reduction.flags.writeable:
+                self._reduction = self._reduction.copy()
+            self.operands.append(
+                np.reshape(self._reduction, self.size, order=self._reduction_order)
+            )
+
+        # Otherwise, fold the operand (in the order of the reduction)
+        else:
+            self._reduction[:] = self._fold(
+                self._reduction, array.ravel(order=self._reduction_order)
+            )
+
+    def _take_stored_operands(self):
+        # Operands referenced by a handle are taken from the store, and those in shared
+        # memory are mapped (no message is sent)
+        while not self.done:
+            info = self._infos[self._processed]
+            if info.segment is not None:
+                if not self._shared_memory:
+                    raise RuntimeError(
+                        "Shared memory is not enabled for this client and server."
+                    )
+                array = sharedmem.attach(
+                    info.segment, info.dtype, info.size, info.order
+                )
+            elif info.handle is None:
+                break
+            elif self._store is None or self._pins is None:
+                raise RuntimeError("Operand handles are not supported by this server.")
+            else:
+                array = self._pins.enter_context(
+                    self._store.pin(self._client, info.handle)
+                )
+
+            if array.ndim != (2 if self._is_matrix else 1):
+                raise RuntimeError(self._error_msg())
+            order = constants.memory_order(array)
+            self._check_operand(array.dtype.type, array.shape, order)
+            if self._hasher is not None:
+                self._hasher.update(array.ravel(order=order))
+
+            # Stored (and mapped) operands are read-only... they are only copied when
+            # being folded into
+            self._add_operand(array)
+            self._processed += 1
+
+    def _error_msg(self):
+        if self._is_matrix:
+            return "Problems reading client full Matrix message..."
+        else:
+            return "Problems reading client full vector message..."
+
+
+def _call_kernel(kernel: str, cost: int, *arrays):
+    # Run an Eigen kernel in the calling thread (see GRPCDemoServicer._eigen)
+    return getattr(demo_eigen_wrapper, kernel)(*arrays)
+
+
+class _RowPanels:
+    """Multiply the panels of rows of a left matrix by a right matrix, as they arrive.
+
+    The right matrix is received first (see ``streams_row_panels``). Then, each panel of
+    rows of the left matrix is multiplied as soon as it is complete, while the following
+    ones are being received, and the rows of the product are streamed in order as soon
+    as they are computed. Thus, receiving, computing and sending overlap.
+
+    Left matrices that are not received in row-major order (or that are not streamed
+    at all, such as stored ones) are multiplied by panels once complete. Thus, their
+    product is still sent as soon as its first rows are computed (see the
+    ``row_blocks`` parameter of ``GRPCDemoServicer._process``).
+
+    Parameters
+    ----------
+    submit : callable
+        Function running a computation, such as ``submit(cost, function, *args)``, which
+        returns a ``concurrent.futures.Future``. See ``ExecutorLanes.submit``.
+    eigen : callable, optional
+        Function running an Eigen kernel, such as ``eigen(kernel, cost, *arrays)``. See
+        ``GRPCDemoServicer._eigen``. The default is ``None``, in which case the kernels
+        are called by the threads running the computations.
+    stream : bool, optional
+        Whether to build the messages of the product. Otherwise, it is only kept in
+        ``result``. The default is ``True``.
+    frames : bool, optional
+        Whether the chunks are sent as frames of the raw service (see the ``framing``
+        module). The default is ``False``.
+    chunk_size : int, optional
+        Maximum amount of bytes of the chunks sent. The default is ``None``, in which
+        case ``MAX_CHUNKSIZE`` is used.
+    """
+
+    def __init__(
+        self,
+        submit,
+        eigen=None,
+        stream: bool = True,
+        frames: bool = False,
+        chunk_size: int = None,
+    ):
+        """Initialize the multiplication (no panel is submitted yet)."""
+        self.result = None
+        self._submit = submit
+        self._eigen = eigen or _call_kernel
+        self._stream = stream
+        self._frames = frames
+        self._chunk_size = chunk_size or constants.MAX_CHUNKSIZE
+        self._rows = 0
+
+        # Panels submitted (but not sent yet), as (first row, last row, future) tuples
+        self._pending = deque()
+
+    def progress(self, operands: list, operand: np.ndarray, received: int):
+        """Multiply the panels of the left matrix received so far.
+
+        See the ``progress`` parameter of ``_ChunkAssembler``.
+        """
+        # Only the left matrix (that is, the second operand) is multiplied by panels
+        if len(operands) != 1:
+            return
+
+        rows, cols = operand.shape
+        if received == operand.size:
+            self._multiply_rows(operands[0], operand, rows)
+        elif operand.flags.c_contiguous:
+            self._multiply_rows(operands[0], operand, received // cols)
+
+    def finish(self, operands: list):
+        """Multiply the rows of the left matrix that have not been multiplied yet.
+
+        Parameters
+        ----------
+        operands : list of np.array
+            Right and left matrices.
+
+        Raises
+        ------
+        RuntimeError
+            In case a number of matrices other than two is provided.
+        """
+        if len(operands) != 2:
+            raise RuntimeError(
+                "Unexpected number of matrices to be multiplied: "
+                + str(len(operands))
+                + ". You can only multiple two matrices."
+            )
+        self._multiply_rows(operands[0], operands[1], operands[1].shape[0])
+
+    @property
+    def pending(self):
+        """Future of the next panel to send, if any."""
+        return self._pending[0][2] if self._pending else None
+
+    def messages(self, wait: bool = False):
+        """Yield the messages of the panels computed so far (in order).
+
+        Parameters
+        ----------
+        wait : bool, optional
+            Whether to wait for all the panels submitted to be computed. The default
+            is ``False``.
+
+        Yields
+        ------
+        grpcdemo_pb2.Matrix
+            Manifest of the product (before its first rows), followed by the chunks of
+            its rows.
+        """
+        while self._pending and (wait or self._pending[0][2].done()):
+            start, stop, future = self._pending.popleft()
+            self.result[start:stop] = future.result()
+            if not self._stream:
+                continue
+
+            if start == 0:
+                yield grpcdemo_pb2.Matrix(
+                    manifest=grpcdemo_pb2.Manifest(
+                        operands=[
+                            grpcdemo_pb2.OperandInfo(
+                                data_type=constants.NP_DTYPE_TO_DATATYPE[
+                                    self.result.dtype.type
+                                ],
+                                shape=self.result.shape,
+                                layout=constants.ORDER_TO_LAYOUT["C"],
+                                chunk_size=self._chunk_size,
+                            )
+                        ]
+                    )
+                )
+
+            # The rows of the product are contiguous... chunks are views of them
+            panel = self.result[start:stop].ravel()
+            max_elems = max(1, self._chunk_size // panel.itemsize)
+            for idx in range(0, panel.size, max_elems):
+                end_of_operand = (
+                    stop == self.result.shape[0] and idx + max_elems >= panel.size
+                )
+                if self._frames:
+                    yield Frame(panel[idx : idx + max_elems].data, None, end_of_operand)
+                else:
+                    yield grpcdemo_pb2.Matrix(
+                        matrix_as_chunk=panel[idx : idx + max_elems].tobytes(),
+                        end_of_operand=end_of_operand,
+                    )
+
+    def _multiply_rows(self, right, left, complete):
+        # Smaller panels would not be worth packing the right matrix again... and they
+        # are (at least) as large as a chunk
+        rows, cols = left.shape
+        panel_rows = max(
+            -(-rows // ROW_PANELS),
+            self._chunk_size // (cols * left.itemsize),
+            1,
+        )
+
+        # Multiply the complete panels... and the last (smaller) one, once complete
+        while complete - self._rows >= panel_rows:
+            self._multiply(right, left, self._rows + panel_rows)
+        if complete == rows:
+            self._multiply(right, left, rows)
+
+    def _multiply(self, right, left, rows):
+        if rows <= self._rows:
+            return
+
+        # Due to the assembler, both matrices have the same size... check that they are
+        # square. Otherwise, no multiplication is possible
+        if right.shape[0] != right.shape[1]:
+            raise RuntimeError("Only square matrices are allowed for multiplication.")
+        if self.result is None:
+            self.result = np.empty(right.shape, dtype=right.dtype)
+
+        start, self._rows = self._rows, rows
+        cost = (rows - start) * right.shape[0] * right.shape[1]
+        future = self._submit(
+            cost, self._eigen, "multiply_matrices", cost, left[start:rows], right
+        )
+        self._pending.append((start, rows, future))
+
+
 class GRPCDemoServicer(grpcdemo_pb2_grpc.GRPCDemoServicer):
     """Provides methods that implement functionality of the API Eigen Example server."""
 
-    def __init__(self) -> None:
-        """No special init is required for the server... unless data is to be stored in a DB. This is to be determined."""
+    def __init__(
+        self,
+        cache_size: int = 0,
+        stats: ServerStats = None,
+        store_quota: int = 1024**3,
+        store_ttl: float = 600.0,
+        store_capacity: int = 4 * 1024**3,
+        admission_budget: int = DEFAULT_BUDGET,
+        heavy_threshold: int = HEAVY_THRESHOLD,
+        fast_workers: int = 8,
+        heavy_workers: int = 2,
+        max_heavy_calls: int = None,
+        batch_window: float = 0.0,
+        max_batch_size: int = 64,
+        coalesce: bool = False,
+        compute_processes: int = 0,
+        max_message_size: int = None,
+        chunk_size: int = None,
+        store_budget: int = None,
+        spill_dir: str = None,
+        shared_memory: bool = False,
+    ) -> None:
+        """Initialize the servicer.
+
+        Parameters
+        ----------
+        cache_size : int, optional
+            Maximum amount of bytes of the responses stored in the result cache, which
+            serves repeated requests without computing them again. The default is 0,
+            in which case the cache is disabled.
+        stats : ServerStats, optional
+            Statistics of the RPCs served (recorded by a ``StatsInterceptor``), which
+            are reported by the ``GetStats`` RPC. The default is ``None``.
+        store_quota : int, optional
+            Maximum amount of bytes of the operands stored (see the ``Upload*`` RPCs)
+            per client. The default is 1 GB.
+        store_ttl : float, optional
+            Number of seconds after which an unused stored operand expires. The
+            default is 600.
+        store_capacity : int, optional
+            Maximum amount of bytes of the operands stored for all clients, which bounds
+            the store regardless of the identifiers announced by the clients. The
+            default is 4 GB. If ``None``, only the quota of each client applies.
+        admission_budget : int, optional
+            Maximum estimated cost of the calls in flight (see the ``admission``
+            module). Calls exceeding it are rejected with ``RESOURCE_EXHAUSTED``. The
+            default is ``DEFAULT_BUDGET``. If 0, all calls are admitted.
+        heavy_threshold : int, optional
+            Estimated cost from which computations are run in the heavy lane, instead
+            of the fast one (see the ``lanes`` module). The default is
+            ``HEAVY_THRESHOLD``.
+        fast_workers : int, optional
+            Number of threads of the fast lane. The default is 8.
+        heavy_workers : int, optional
+            Number of threads of the heavy lane. The default is 2.
+        max_heavy_calls : int, optional
+            Maximum number of calls of the heavy lane in flight. Calls exceeding it are
+            rejected with ``RESOURCE_EXHAUSTED``, so that they cannot take all the threads
+            serving the requests (see ``serve``). The default is ``None``, in which case
+            they are only limited by ``admission_budget``.
+        batch_window : float, optional
+            Number of seconds during which small vector and matrix multiplications
+            (those of the fast lane) are held, to be run in batches with the ones of
+            the same type and shape (see the ``batcher`` module). The default is 0, in
+            which case they are not batched.
+        max_batch_size : int, optional
+            Maximum number of multiplications per batch. The default is 64.
+        coalesce : bool, optional
+            Whether identical requests arriving while one of them is being computed
+            wait for its result, instead of computing it again (see ``SingleFlight``).
+            The default is ``False``.
+        compute_processes : int, optional
+            Number of worker processes running the computations of the heavy lane (see
+            the ``offload`` module), so that they do not hold the GIL of the server.
+            The default is 0, in which case they are run by the threads of the lane.
+        max_message_size : int, optional
+            Maximum amount of bytes of the messages received and sent by the server
+            (see ``serve``), which is announced by the ``GetCapabilities`` RPC. The
+            default is ``None``, in which case the default of gRPC (4 MB) is assumed.
+        chunk_size : int, optional
+            Preferred maximum amount of bytes of the chunks, which is announced by the
+            ``GetCapabilities`` RPC. Chunks of such a size are only sent to the clients
+            requesting them (see the ``chunk-size`` metadata). The default is ``None``,
+            in which case the largest chunks that fit in ``max_message_size`` are
+            preferred (or ``MAX_CHUNKSIZE``, if it is not given).
+        store_budget : int, optional
+            Maximum amount of bytes of the stored operands kept in memory (for all
+            clients). Least recently used operands exceeding it are spilled to disk,
+            and mapped back when used (see ``OperandStore``). The default is ``None``,
+            in which case all stored operands are kept in memory.
+        spill_dir : str, optional
+            Directory in which the operands spilled to disk are written. The default is
+            ``None``, in which case the temporary directory of the system is used.
+        shared_memory : bool, optional
+            Whether clients on the same host (connected through a Unix domain socket or
+            a loopback address) may exchange operands and results through shared memory
+            segments (see the ``sharedmem`` module). The default is ``False``.
+
+        Raises
+        ------
+        RuntimeError
+            In case the chunks do not fit in the messages.
+        """
         # TODO : is it required to store the input vectors in a DB?
         super().__init__()
 
+        self.cache = ResultCache(cache_size) if cache_size > 0 else None
+        self.flights = SingleFlight() if coalesce else None
+        self.stats = stats
+        self.store = OperandStore(
+            store_quota, store_ttl, store_budget, spill_dir, store_capacity
+        )
+        self.shared_memory = shared_memory
+        self.admission = AdmissionController(
+            admission_budget, heavy_threshold, max_heavy_calls
+        )
+        self.lanes = ExecutorLanes(heavy_threshold, fast_workers, heavy_workers)
+        self.batcher = None
+        if batch_window > 0:
+            self.batcher = MicroBatcher(self._submit, batch_window, max_batch_size)
+        self.offload = None
+        if compute_processes > 0:
+            self.offload = ProcessOffload(compute_processes)
+
+        # Chunk size preferred by the server (None for MAX_CHUNKSIZE)
+        self.max_message_size = max_message_size
+        self.chunk_size = chunk_size
+        if chunk_size is None and max_message_size is not None:
+            self.chunk_size = constants.fit_chunk_size(max_message_size)
+        message_size = max_message_size or constants.MAX_MESSAGE_SIZE
+        if (self.chunk_size or 0) > constants.fit_chunk_size(message_size):
+            raise RuntimeError(
+                "Chunks of %d bytes do not fit in messages of %d bytes."
+                % (self.chunk_size, message_size)
+            )
+
+        # Calls abandoned by their client (cancelled or past their deadline), per stage
+        self._abandoned = dict.fromkeys(ABANDON_STAGES, 0)
+        self._abandoned_lock = threading.Lock()
+
     # =================================================================================================
     # PUBLIC METHODS for Server operations
     # =================================================================================================
@@ -150,17 +977,10 @@ class GRPCDemoServicer(grpcdemo_pb2_grpc.GRPCDemoServicer):
         """
         click.echo("Vector flip requested.")
 
-        # Process the metadata
-        md = self._read_client_metadata(context)
-
-        # Process the input messages
-        dtype, size, vector_list = self._get_vectors(request_iterator, md)
-
         # Flip it --> assuming that only one vector is passed
-        nparray_flipped = np.flip(vector_list[0])
-
-        # Send the response
-        return self._send_vectors(context, nparray_flipped)
+        return self._process(
+            "FlipVector", "vectors", request_iterator, context, self._flip_vector
+        )
 
     def AddVectors(self, request_iterator, context):
         """Add vectors.
@@ -178,24 +998,17 @@ class GRPCDemoServicer(grpcdemo_pb2_grpc.GRPCDemoServicer):
             Vector message.
         """
         click.echo("Vector addition requested.")
-        # Process the metadata
-        md = self._read_client_metadata(context)
-
-        # Process the input messages
-        dtype, size, vector_list = self._get_vectors(request_iterator, md)
-
-        # Create an empty array with the input arguments characteristics (dtype, size)
-        result = np.zeros(size, dtype=dtype)
 
-        # Add all provided vectors using the Eigen library
-        for vector in vector_list:
-            # Casting is needed due to interface with Eigen library... Not the desired approach,
-            # but works. Ideally, vectors should be passed directly, but errors appear
-            cast_vector = np.array(vector, dtype=dtype)
-            result = demo_eigen_wrapper.add_vectors(result, cast_vector)
-
-        # Send the response
-        return self._send_vectors(context, result)
+        # Each vector is added to the result as soon as its chunks arrive, so only the
+        # result is kept in memory
+        return self._process(
+            "AddVectors",
+            "vectors",
+            request_iterator,
+            context,
+            self._add_vectors,
+            self._add_chunk,
+        )
 
     def MultiplyVectors(self, request_iterator, context):
         """Multiply two vectors.
@@ -214,32 +1027,14 @@ class GRPCDemoServicer(grpcdemo_pb2_grpc.GRPCDemoServicer):
         """
         click.echo("Vector dot product requested")
 
-        # Process the metadata
-        md = self._read_client_metadata(context)
-
-        # Process the input messages
-        dtype, size, vector_list = self._get_vectors(request_iterator, md)
-
-        # Check that the vctor list contains a maximum of two vectors
-        if len(vector_list) != 2:
-            raise RuntimeError(
-                "Unexpected number of vectors to be multiplied: "
-                + len(vector_list)
-                + ". Only 2 is valid."
-            )
-
         # Perform the dot product of the provided vectors using the Eigen library
-        # casting is needed due to interface with Eigen library... Not the desired approach,
-        # but works. Ideally, vectors should be passed directly, but errors appear
-        vec_1 = np.array(vector_list[0], dtype=dtype)
-        vec_2 = np.array(vector_list[1], dtype=dtype)
-        result = demo_eigen_wrapper.multiply_vectors(vec_1, vec_2)
-
-        # Return the result as a numpy.ndarray
-        result = np.array(result, dtype=dtype, ndmin=1)
-
-        # Finally, send the response
-        return self._send_vectors(context, result)
+        return self._process(
+            "MultiplyVectors",
+            "vectors",
+            request_iterator,
+            context,
+            self._multiply_vectors,
+        )
 
     def AddMatrices(self, request_iterator, context):
         """Add matrices.
@@ -257,24 +1052,17 @@ class GRPCDemoServicer(grpcdemo_pb2_grpc.GRPCDemoServicer):
             Matrix message.
         """
         click.echo("Matrix addition requested!")
-        # Process the metadata
-        md = self._read_client_metadata(context)
-
-        # Process the input messages
-        dtype, size, matrix_list = self._get_matrices(request_iterator, md)
-
-        # Create an empty array with the input arguments characteristics (dtype, size)
-        result = np.zeros(size, dtype=dtype)
-
-        # Add all provided matrices using the Eigen library
-        for matrix in matrix_list:
-            # Casting is needed due to interface with Eigen library... Not the desired approach,
-            # but works. Ideally, we would want to pass matrix directly, but errors appear
-            cast_matrix = np.array(matrix, dtype=dtype)
-            result = demo_eigen_wrapper.add_matrices(result, cast_matrix)
 
-        # Send the response
-        return self._send_matrices(context, result)
+        # Each matrix is added to the result as soon as its chunks arrive, so only the
+        # result is kept in memory
+        return self._process(
+            "AddMatrices",
+            "matrices",
+            request_iterator,
+            context,
+            self._add_matrices,
+            self._add_chunk,
+        )
 
     def MultiplyMatrices(self, request_iterator, context):
         """Multiply two matrices.
@@ -293,359 +1081,2555 @@ class GRPCDemoServicer(grpcdemo_pb2_grpc.GRPCDemoServicer):
         """
         click.echo("Matrix multiplication requested.")
 
-        # Process the metadata
-        md = self._read_client_metadata(context)
-
-        # Process the input messages
-        dtype, size, matrix_list = self._get_matrices(request_iterator, md)
-
-        # Check that the matrix list contains a maximum of two matrices
-        if len(matrix_list) != 2:
-            raise RuntimeError(
-                "Unexpected number of matrices to be multiplied: "
-                + len(matrix_list)
-                + ". You can only multiple two matrices."
-            )
-
-        # Due to the previous _get_matrices method, the size of all
-        # matrices is the same... check that it is a square matrix. Otherwise, no multiplication
-        # is possible
-        if size[0] != size[1]:
-            raise RuntimeError("Only square matrices are allowed for multiplication.")
+        # The left matrix may be multiplied as it arrives
+        if streams_row_panels(self._read_client_metadata(context)):
+            return self._multiply_row_panels(request_iterator, context)
 
         # Perform the matrix multiplication of the provided matrices using the Eigen library
-        # Casting is needed due to interface with Eigen library... Not the desired approach,
-        # but works. Ideally, vector should be passed directly, but errors appear
-        mat_1 = np.array(matrix_list[0], dtype=dtype)
-        mat_2 = np.array(matrix_list[1], dtype=dtype)
-        result = demo_eigen_wrapper.multiply_matrices(mat_1, mat_2)
-
-        # Finally, send the response
-        return self._send_matrices(context, result)
+        return self._process(
+            "MultiplyMatrices",
+            "matrices",
+            request_iterator,
+            context,
+            self._multiply_matrices,
+            row_blocks=True,
+        )
 
-    # =================================================================================================
-    # PRIVATE METHODS for Server operations
-    # =================================================================================================
+    def BatchAddVectors(self, request_iterator, context):
+        """Add many independent pairs of vectors.
 
-    def _get_vectors(self, request_iterator, md: dict):
-        """Process a stream of vector messages.
+        Each side of the pairs is received stacked into a single vector, and so
+        is the result. See the ``batch-size`` metadata.
 
         Parameters
         ----------
         request_iterator : iterator
-            Iterator to the received request messages of type Vector.
-        md : dict
-            Metadata provided by the client.
+            Iterator to the stream of vector messages provided.
+        context : grpc.ServicerContext
+            gRPC-specific information.
 
         Returns
         -------
-        np.type, tuple, list of np.array
-            Type of data, size of the vectors, and list of vectors to process.
+        grpcdemo_pb2.Vector
+            Vector message.
         """
-        # First, determine how many full vector messages are to be processed
-        full_msgs = int(md.get("full-vectors"))
-
-        # Initialize the output vector list and some aux vars
-        vector_list = []
-        dtype = None
-        size = None
-
-        # Loop over the expected full messages
-        for msg in range(1, full_msgs + 1):
-
-            # Find out how many partial vector messages constitute this full vector message
-            chunks = int(md.get("vec%d-messages" % msg))
-
-            # Initialize the output vector
-            vector = None
-
-            # Loop over the expected chunks
-            for chunk_msg in range(chunks):
-                # Read the vector message
-                chunk_vec = next(request_iterator)
-
-                # Inform about the size of the message content
-                click.echo(
-                    "Size of message: "
-                    + constants.human_size(chunk_vec.vector_as_chunk)
-                )
-
-                # If processing the first chunk of the message, fill in some data
-                if chunk_msg == 0:
-                    # Check the data type of the incoming vector
-                    if chunk_vec.data_type == grpcdemo_pb2.DataType.Value("INTEGER"):
-                        dtype = check_data_type(dtype, np.int32)
-                    elif chunk_vec.data_type == grpcdemo_pb2.DataType.Value("DOUBLE"):
-                        dtype = check_data_type(dtype, np.float64)
-
-                    # Check the size of the incoming vector
-                    size = check_size(size, (chunk_vec.vector_size,))
-
-                # Parse the chunk
-                if vector is None:
-                    vector = np.frombuffer(chunk_vec.vector_as_chunk, dtype=dtype)
-                else:
-                    tmp = np.frombuffer(chunk_vec.vector_as_chunk, dtype=dtype)
-                    vector = np.concatenate((vector, tmp))
-
-            # Check if the final vector has the desired size
-            if vector.size != size[0]:
-                raise RuntimeError("Problems reading client full vector message...")
-            else:
-                # If everything is fine, append to vector_list
-                vector_list.append(vector)
+        click.echo("Batch vector addition requested.")
+
+        # Adding the stacked vectors adds all pairs at once... chunks are folded as usual
+        return self._process(
+            "BatchAddVectors",
+            "vectors",
+            request_iterator,
+            context,
+            self._add_vectors,
+            self._add_chunk,
+            batched=True,
+        )
 
-        # Return the input vector list (as a list of numpy.ndarray)
-        return dtype, size, vector_list
+    def BatchMultiplyMatrices(self, request_iterator, context):
+        """Multiply many independent pairs of matrices.
 
-    def _get_matrices(self, request_iterator, md: dict):
-        """Process a stream of matrix messages.
+        Each side of the pairs is received stacked into a single matrix, and so
+        is the result. See the ``batch-size`` metadata.
 
         Parameters
         ----------
         request_iterator : iterator
-            Iterator to the received request messages of type ``Matrix``.
-        md : dict
-            Metadata provided by the client.
+            Iterator to the stream of matrix messages provided.
+        context : grpc.ServicerContext
+            gRPC-specific information.
 
         Returns
         -------
-        np.type, tuple, list of np.array
-            Type of data, shape of the matrices, and list of matrices to process.
+        grpcdemo_pb2.Matrix
+            Matrix message.
         """
-        # Determine how many full matrix messages are to be processed
-        full_msgs = int(md.get("full-matrices"))
-
-        # Initialize the output matrix list and some aux vars
-        matrix_list = []
-        dtype = None
-        size = None
-
-        # Loop over the expected full messages
-        for msg in range(1, full_msgs + 1):
-
-            # Find out how many partial matrix messages constitute this full matrix message
-            chunks = int(md.get("mat%d-messages" % msg))
-
-            # Initialize the output matrix
-            matrix = None
+        click.echo("Batch matrix multiplication requested.")
+
+        return self._process(
+            "BatchMultiplyMatrices",
+            "matrices",
+            request_iterator,
+            context,
+            self._batch_multiply_matrices,
+            batched=True,
+        )
 
-            # Loop over the expected chunks
-            for chunk_msg in range(chunks):
-                # Read the matrix message
-                chunk_mat = next(request_iterator)
+    def UploadVector(self, request_iterator, context):
+        """Store a vector in the server.
 
-                # Inform about the size of the message content
-                click.echo(
-                    "Size of message: "
-                    + constants.human_size(chunk_mat.matrix_as_chunk)
+        Parameters
+        ----------
+        request_iterator : iterator
+            Iterator to the stream of vector messages provided.
+        context : grpc.ServicerContext
+            gRPC-specific information.
+
+        Returns
+        -------
+        grpcdemo_pb2.Handle
+            Handle of the stored vector.
+        """
+        click.echo("Vector upload requested.")
+
+        md = self._read_client_metadata(context)
+        client = self._client_id(context, md)
+        with contextlib.ExitStack() as pins:
+            _, _, vector_list = self._get_vectors(
+                request_iterator, md, client=client, context=context, pins=pins
+            )
+
+            return grpcdemo_pb2.Handle(
+                handle=self._store_operand(context, client, vector_list)
+            )
+
+    def UploadMatrix(self, request_iterator, context):
+        """Store a matrix in the server.
+
+        Parameters
+        ----------
+        request_iterator : iterator
+            Iterator to the stream of matrix messages provided.
+        context : grpc.ServicerContext
+            gRPC-specific information.
+
+        Returns
+        -------
+        grpcdemo_pb2.Handle
+            Handle of the stored matrix.
+        """
+        click.echo("Matrix upload requested.")
+
+        md = self._read_client_metadata(context)
+        client = self._client_id(context, md)
+        with contextlib.ExitStack() as pins:
+            _, _, matrix_list = self._get_matrices(
+                request_iterator, md, client=client, context=context, pins=pins
+            )
+
+            return grpcdemo_pb2.Handle(
+                handle=self._store_operand(context, client, matrix_list)
+            )
+
+    def DownloadVector(self, request, context):
+        """Retrieve a stored vector.
+
+        Parameters
+        ----------
+        request : Handle
+            Handle of the vector.
+        context : grpc.ServicerContext
+            gRPC-specific information.
+
+        Yields
+        ------
+        grpcdemo_pb2.Vector
+            Vector message.
+        """
+        click.echo("Vector download requested.")
+
+        # The operand is pinned while it is sent
+        with contextlib.ExitStack() as pins:
+            try:
+                vector = pins.enter_context(
+                    self._stored_operand(context, "vectors", request.handle)
+                )
+            except RuntimeError as err:
+                context.abort(grpc.StatusCode.NOT_FOUND, str(err))
+
+            yield from self._send_vectors(context, vector)
+
+    def DownloadMatrix(self, request, context):
+        """Retrieve a stored matrix.
+
+        Parameters
+        ----------
+        request : Handle
+            Handle of the matrix.
+        context : grpc.ServicerContext
+            gRPC-specific information.
+
+        Yields
+        ------
+        grpcdemo_pb2.Matrix
+            Matrix message.
+        """
+        click.echo("Matrix download requested.")
+
+        # The operand is pinned while it is sent
+        with contextlib.ExitStack() as pins:
+            try:
+                matrix = pins.enter_context(
+                    self._stored_operand(context, "matrices", request.handle)
+                )
+            except RuntimeError as err:
+                context.abort(grpc.StatusCode.NOT_FOUND, str(err))
+
+            yield from self._send_matrices(context, matrix)
+
+    def Release(self, request, context):
+        """Release a stored operand.
+
+        Parameters
+        ----------
+        request : Handle
+            Handle of the operand.
+        context : grpc.ServicerContext
+            gRPC-specific information.
+
+        Returns
+        -------
+        grpcdemo_pb2.ReleaseReply
+            Whether the operand was stored (and has been released).
+        """
+        md = self._read_client_metadata(context)
+        released = self.store.release(self._client_id(context, md), request.handle)
+
+        return grpcdemo_pb2.ReleaseReply(released=released)
+
+    def GetStats(self, request, context):
+        """Report the statistics of the RPCs served.
+
+        Parameters
+        ----------
+        request : StatsRequest
+            Statistics request sent by the client.
+        context : grpc.ServicerContext
+            gRPC-specific information.
+
+        Returns
+        -------
+        grpcdemo_pb2.StatsReply
+           Statistics report. Each line contains the ``key=value`` statistics of
+           an RPC method and request size bucket (see ``ServerStats.report()``),
+           of the calls abandoned by their clients (per stage), of the admission
+           control, of the executor lanes (such as their queue depth), of the
+           micro-batcher, of the coalescing of identical requests, of the compute
+           offload, or of the result cache.
+        """
+        lines = []
+        if self.stats is not None:
+            lines.append(self.stats.report())
+        with self._abandoned_lock:
+            lines.append(
+                " ".join("abandoned_%s=%d" % item for item in self._abandoned.items())
+            )
+        lines.append(
+            " ".join(
+                "admission_%s=%d" % item for item in self.admission.stats().items()
+            )
+        )
+        lines.append(
+            " ".join("lane_%s=%d" % item for item in self.lanes.stats().items())
+        )
+        if self.batcher is not None:
+            lines.append(
+                " ".join(
+                    "batcher_%s=%d" % item for item in self.batcher.stats().items()
+                )
+            )
+        if self.flights is not None:
+            lines.append(
+                " ".join(
+                    "coalesce_%s=%d" % item for item in self.flights.stats().items()
+                )
+            )
+        if self.offload is not None:
+            lines.append(
+                " ".join(
+                    "offload_%s=%d" % item for item in self.offload.stats().items()
+                )
+            )
+        if self.cache is not None:
+            lines.append(
+                " ".join("cache_%s=%d" % item for item in self.cache.stats().items())
+            )
+        lines.append(
+            " ".join("store_%s=%d" % item for item in self.store.stats().items())
+        )
+
+        return grpcdemo_pb2.StatsReply(report="\n".join(line for line in lines if line))
+
+    def GetCapabilities(self, request, context):
+        """Report the capabilities of the server.
+
+        Parameters
+        ----------
+        request : CapabilitiesRequest
+            Capabilities request sent by the client.
+        context : grpc.ServicerContext
+            gRPC-specific information.
+
+        Returns
+        -------
+        grpcdemo_pb2.CapabilitiesReply
+           Data types, codecs and protocol versions handled, and the maximum message
+           size and preferred chunk size of the server.
+        """
+        return grpcdemo_pb2.CapabilitiesReply(
+            data_types=list(constants.NP_DTYPE_TO_DATATYPE.values()),
+            codecs=list(GRPC_CODECS) + list(CHUNK_CODECS),
+            protocol_versions=constants.PROTOCOL_VERSIONS,
+            max_message_size=self.max_message_size or constants.MAX_MESSAGE_SIZE,
+            chunk_size=self._preferred_chunk_size(),
+        )
+
+    # =================================================================================================
+    # PRIVATE METHODS for Server operations
+    # =================================================================================================
+
+    def _process(
+        self,
+        rpc_name: str,
+        message_type: str,
+        request_iterator,
+        context,
+        operation,
+        fold=None,
+        batched=False,
+        row_blocks=False,
+    ):
+        """Read the operands of a request, perform the operation and send the response.
+
+        Parameters
+        ----------
+        rpc_name : str
+            Name of the RPC requested.
+        message_type : str
+            Type of message being processed. Options are ``vectors`` and ``matrices``.
+        request_iterator : iterator
+            Iterator to the received request messages.
+        context : grpc.ServicerContext
+            gRPC-specific information.
+        operation : callable
+            Operation to perform, such as ``operation(dtype, size, operands) -> result``.
+        fold : callable, optional
+            Function used to fold each chunk into the reduction of the operands. See
+            ``_ChunkAssembler``. The default is ``None``.
+        batched : bool, optional
+            Whether the operands are batches of independent items. See ``_batched``.
+            The default is ``False``.
+        row_blocks : bool, optional
+            Whether the result is a matrix product, which can be computed by blocks of
+            rows. If so (and the response spans several chunks, streamed in version 2
+            without being cached), each block is sent in row-major order as soon as it
+            is computed. See ``_RowPanels``. The default is ``False``.
+
+        Returns
+        -------
+        iterator
+            Response messages.
+        """
+        # Process the metadata
+        md = self._read_client_metadata(context)
+        client = self._client_id(context, md)
+        store_result = md.get("store-result") == "true"
+        version = get_protocol_version(md)
+        chunk_size = self._chunk_size(md)
+
+        # Process the input messages (hashing them, if the result cache is enabled...
+        # results kept in the store, or handed over in shared memory, are not cached)
+        uncached = store_result or self._accepts_shared_memory(context, md)
+        hasher = (
+            None if uncached else self._request_hasher(rpc_name, version, chunk_size)
+        )
+        if batched:
+            operation = self._batched(operation, md, hasher)
+
+        # Results streamed (and not cached) may be sent as their blocks are computed
+        row_blocks = row_blocks and version == 2 and not uncached and hasher is None
+
+        # The call is admitted once the size of its operands is known (its cost is
+        # released once computed)
+        with self.admission.ticket(rpc_name) as ticket, contextlib.ExitStack() as pins:
+            try:
+                if message_type == "vectors":
+                    dtype, size, operands = self._get_vectors(
+                        request_iterator,
+                        md,
+                        fold,
+                        hasher,
+                        client,
+                        context,
+                        ticket.admit,
+                        pins,
+                    )
+                else:
+                    dtype, size, operands = self._get_matrices(
+                        request_iterator,
+                        md,
+                        fold,
+                        hasher,
+                        client,
+                        context,
+                        ticket.admit,
+                        pins,
+                    )
+            except OverloadedError as err:
+                self._reject(context, err)
+
+            # Serve the response straight from the cache, if available
+            key, cached = self._lookup_cache(hasher)
+            if cached is not None:
+                return self._send_cached(context, cached)
+
+            # Perform the operation in its lane... unless the client no longer waits for it
+            self._check_active(context, "compute")
+            if row_blocks and _spans_chunks(dtype, size, chunk_size):
+                panels = _RowPanels(
+                    self.lanes.submit,
+                    self._eigen,
+                    frames=is_raw(context),
+                    chunk_size=chunk_size,
+                )
+                # The panels are those of the first matrix (the left one)
+                panels.finish(operands[::-1])
+                return self._send_panels(
+                    context, panels, ticket.transfer(), pins.pop_all()
+                )
+            result = self._start(
+                rpc_name, operation, dtype, size, operands, ticket.cost, hasher
+            ).result()
+        self._check_active(context, "send")
+
+        # Keep the result in the store (only its handle is sent)... or send it
+        if store_result:
+            handle = self._store_operand(context, client, [result])
+            return self._send_handle(context, message_type, handle)
+        if message_type == "vectors":
+            return self._send_vectors(context, result, cache_key=key)
+        else:
+            return self._send_matrices(context, result, cache_key=key)
+
+    def _start(
+        self,
+        rpc_name: str,
+        operation,
+        dtype,
+        size: tuple,
+        operands: list,
+        cost: int,
+        hasher=None,
+    ) -> futures.Future:
+        """Start the computation of a request.
+
+        The request joins the computation of an identical one in flight (if coalescing),
+        or it is held in the micro-batcher (if it can be batched), or it is run on its
+        own in its lane.
+
+        Parameters
+        ----------
+        rpc_name : str
+            Name of the RPC requested.
+        operation : callable
+            Operation to perform, such as ``operation(dtype, size, operands) -> result``.
+        dtype : np.type
+            Type of data of the operands.
+        size : tuple
+            Shape of the operands.
+        operands : list of np.array
+            Operands of the operation.
+        cost : int
+            Estimated cost of the operation.
+        hasher : hashlib.blake2b, optional
+            Hash object updated with the content of the request. The default is ``None``,
+            in which case the request is not coalesced.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Future of the result.
+        """
+
+        def start():
+            future = self._micro_batch(rpc_name, dtype, size, operands, cost)
+            if future is None:
+                future = self._submit(cost, operation, dtype, size, operands)
+            return future
+
+        if self.flights is None or hasher is None:
+            return start()
+        return self.flights.join(hasher.digest(), start)
+
+    def _micro_batch(
+        self, rpc_name: str, dtype, size: tuple, operands: list, cost: int
+    ):
+        """Hold a small multiplication in the micro-batcher, if it can be batched.
+
+        Parameters
+        ----------
+        rpc_name : str
+            Name of the RPC requested. Only ``MultiplyVectors`` and ``MultiplyMatrices``
+            are batched.
+        dtype : np.type
+            Type of data of the operands.
+        size : tuple
+            Shape of the operands.
+        operands : list of np.array
+            Operands of the multiplication.
+        cost : int
+            Estimated cost of the multiplication. Only those of the fast lane are
+            batched.
+
+        Returns
+        -------
+        concurrent.futures.Future or None
+            Future of the result, or ``None`` if the multiplication is not batched
+            (it is then run on its own, which also reports its errors).
+        """
+        if (
+            self.batcher is None
+            or len(operands) != 2
+            or self.lanes.lane(cost) != "fast"
+        ):
+            return None
+
+        if rpc_name == "MultiplyVectors":
+            kernel = self._stacked_multiply_vectors
+        elif rpc_name == "MultiplyMatrices" and size[0] == size[1]:
+            kernel = self._stacked_multiply_matrices
+        else:
+            return None
+
+        return self.batcher.submit(
+            (rpc_name, np.dtype(dtype).str, size), kernel, cost, operands
+        )
+
+    def _submit(self, cost: int, function, *args) -> futures.Future:
+        """Submit a (blocking) function to its lane."""
+        return self.lanes.submit(cost, function, *args)
+
+    def _eigen(self, kernel: str, cost: int, *arrays: np.ndarray):
+        """Run an Eigen kernel, offloading it to a worker process if it is heavy.
+
+        Parameters
+        ----------
+        kernel : str
+            Name of the function of ``demo_eigen_wrapper`` to run.
+        cost : int
+            Estimated cost of the computation (see ``estimate_cost``).
+        *arrays : np.ndarray
+            Operands of the kernel.
+
+        Returns
+        -------
+        np.array
+            Result of the kernel.
+        """
+        if self.offload is not None and self.lanes.lane(cost) == "heavy":
+            return self.offload.run(kernel, *arrays)
+        return _call_kernel(kernel, cost, *arrays)
+
+    def _multiply_row_panels(self, request_iterator, context):
+        """Multiply two matrices, computing the product as the left matrix arrives.
+
+        The right matrix is received first, and the rows of the product are sent as soon
+        as they are computed (see ``_RowPanels``). Such calls are not cached.
+
+        Parameters
+        ----------
+        request_iterator : iterator
+            Iterator to the received request messages of type ``Matrix``.
+        context : grpc.ServicerContext
+            gRPC-specific information.
+
+        Yields
+        ------
+        grpcdemo_pb2.Matrix
+            Matrix messages.
+        """
+        md = self._read_client_metadata(context)
+        client = self._client_id(context, md)
+        store_result = md.get("store-result") == "true"
+
+        # The call is admitted once the size of the right matrix is known
+        with self.admission.ticket(
+            "MultiplyMatrices"
+        ) as ticket, contextlib.ExitStack() as pins:
+            panels = _RowPanels(
+                self.lanes.submit,
+                self._eigen,
+                stream=not store_result,
+                frames=is_raw(context),
+                chunk_size=self._chunk_size(md),
+            )
+            assembler = _ChunkAssembler(
+                "matrices",
+                md,
+                store=self.store,
+                client=client,
+                admit=ticket.admit,
+                progress=panels.progress,
+                shared_memory=self._accepts_shared_memory(context, md),
+                pins=pins,
+            )
+            try:
+                while not assembler.operands and not assembler.done:
+                    self._check_active(context, "receive")
+                    assembler.process(self._next_chunk(request_iterator))
+            except OverloadedError as err:
+                self._reject(context, err)
+
+            messages = self._row_panel_messages(
+                assembler, panels, request_iterator, context
+            )
+
+            # Keep the product in the store (only its handle is sent)... or stream it
+            if store_result:
+                for _ in messages:
+                    pass
+                handle = self._store_operand(context, client, [panels.result])
+                yield from self._send_handle(context, "matrices", handle)
+                return
+
+            response_md, messages = self._encode_response(
+                context, [], messages, assembler.operands[0].nbytes
+            )
+            context.send_initial_metadata(response_md)
+            yield from messages
+
+    def _row_panel_messages(self, assembler, panels, request_iterator, context):
+        """Receive the rest of the left matrix, yielding the rows of the product as they are computed."""
+        while not assembler.done:
+            self._check_active(context, "receive")
+            assembler.process(self._next_chunk(request_iterator))
+            yield from panels.messages()
+
+        panels.finish(assembler.operands)
+        yield from panels.messages(wait=True)
+
+    def _next_chunk(self, request_iterator):
+        """Read the next message of a stream, which must not have ended."""
+        # StopIteration must not escape... generators would turn it into an obscure error
+        try:
+            return next(request_iterator)
+        except StopIteration:
+            raise RuntimeError("Stream ended before the operand was complete.")
+
+    def _request_hasher(self, rpc_name: str, version: int = 1, chunk_size: int = None):
+        """Create the hash object for computing the cache key of a request.
+
+        Parameters
+        ----------
+        rpc_name : str
+            Name of the RPC requested.
+        version : int, optional
+            Version of the streaming protocol used by the client. Responses are
+            cached per version, since their messages differ. The default is 1.
+        chunk_size : int, optional
+            Maximum amount of bytes of the chunks of the response, which is cached per
+            chunk size too. The default is ``None``, in which case ``MAX_CHUNKSIZE``
+            is used.
+
+        Returns
+        -------
+        hashlib.blake2b or None
+            Hash object, or ``None`` if both the result cache and the coalescing of
+            identical requests are disabled.
+        """
+        if self.cache is None and self.flights is None:
+            return None
+
+        hasher = ResultCache.hasher(rpc_name)
+        hasher.update(b"protocol-version=%d" % version)
+        hasher.update(b"chunk-size=%d" % (chunk_size or constants.MAX_CHUNKSIZE))
+        return hasher
+
+    def _accepts_shared_memory(self, context, md: dict) -> bool:
+        """Check whether operands and results are exchanged through shared memory.
+
+        Parameters
+        ----------
+        context : grpc.ServicerContext or None
+            gRPC-specific information.
+        md : dict
+            Metadata provided by the client.
+
+        Returns
+        -------
+        bool
+            Whether shared memory is enabled in the server, requested by the client (see
+            ``accepts_shared_memory``) and the client is on the same host.
+        """
+        return (
+            self.shared_memory
+            and context is not None
+            and accepts_shared_memory(md)
+            and is_local_peer(context.peer())
+        )
+
+    def _preferred_chunk_size(self) -> int:
+        """Return the maximum amount of bytes of the chunks preferred by the server."""
+        if self.chunk_size is None:
+            return constants.MAX_CHUNKSIZE
+        return self.chunk_size
+
+    def _chunk_size(self, md: dict) -> int:
+        """Determine the maximum amount of bytes of the chunks of a response.
+
+        Parameters
+        ----------
+        md : dict
+            Metadata of the client. Clients aware of the capabilities of the server
+            request the size of the chunks with the ``chunk-size`` metadata.
+
+        Returns
+        -------
+        int
+            Chunk size requested by the client (up to the one preferred by the server).
+            Otherwise, chunks are not larger than ``MAX_CHUNKSIZE``, so that they fit
+            in the default maximum message size of the client.
+        """
+        preferred = self._preferred_chunk_size()
+        if "chunk-size" not in md:
+            return min(preferred, constants.MAX_CHUNKSIZE)
+        return max(1, min(int(md["chunk-size"]), preferred))
+
+    def _lookup_cache(self, hasher):
+        """Look up the response to a request in the result cache.
+
+        Parameters
+        ----------
+        hasher : hashlib.blake2b or None
+            Hash object updated with the content of the request.
+
+        Returns
+        -------
+        bytes or None, CachedResponse or None
+            Key of the request and the response stored for it (if any). Both are
+            ``None`` if the result cache is disabled.
+        """
+        if hasher is None or self.cache is None:
+            return None, None
+
+        key = hasher.digest()
+        return key, self.cache.get(key)
+
+    def _client_id(self, context, md: dict) -> str:
+        """Return the identifier of the client, owner of the operands it stores.
+
+        Parameters
+        ----------
+        context : grpc.ServicerContext
+            gRPC-specific information.
+        md : dict
+            Metadata provided by the client.
+
+        Returns
+        -------
+        str
+            The ``client-id`` metadata or, if not provided, the peer of the call.
+        """
+        return md.get("client-id") or context.peer()
+
+    def _abandoned_status(self, context):
+        """Check whether the client no longer waits for the response of a call.
+
+        Parameters
+        ----------
+        context : grpc.ServicerContext
+            gRPC-specific information.
+
+        Returns
+        -------
+        tuple or None
+            Status code and details with which to abort the call, or ``None`` if the
+            client still waits for the response.
+        """
+        if not context.is_active():
+            return grpc.StatusCode.CANCELLED, "The call was cancelled by the client."
+
+        remaining = context.time_remaining()
+        if remaining is not None and remaining <= 0:
+            return grpc.StatusCode.DEADLINE_EXCEEDED, "The deadline was exceeded."
+
+        return None
+
+    def _abandon(self, stage: str):
+        """Count a call abandoned by its client at the given stage (see ``ABANDON_STAGES``)."""
+        with self._abandoned_lock:
+            self._abandoned[stage] += 1
+
+    def _check_active(self, context, stage: str):
+        """Abort the call if its client no longer waits for the response.
+
+        Thus, no more chunks are read, nor the operation performed, for a client that
+        has cancelled the call or whose deadline has been exceeded.
+
+        Parameters
+        ----------
+        context : grpc.ServicerContext
+            gRPC-specific information.
+        stage : str
+            Stage of the call. Options are those of ``ABANDON_STAGES``.
+        """
+        status = self._abandoned_status(context)
+        if status is not None:
+            self._abandon(stage)
+            context.abort(*status)
+
+    def _reject(self, context, err: OverloadedError):
+        """Abort a call that has not been admitted, hinting when to retry it.
+
+        The hint is sent as the ``retry-after-ms`` trailing metadata.
+
+        Parameters
+        ----------
+        context : grpc.ServicerContext
+            gRPC-specific information.
+        err : OverloadedError
+            Error raised when admitting the call.
+        """
+        context.set_trailing_metadata(
+            [("retry-after-ms", "%d" % round(1000 * err.retry_after))]
+        )
+        context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(err))
+
+    def _store_operand(self, context, client: str, operands: list):
+        """Store an operand, aborting the call if the quota of the client is exceeded.
+
+        Parameters
+        ----------
+        context : grpc.ServicerContext
+            gRPC-specific information.
+        client : str
+            Identifier of the client.
+        operands : list of np.array
+            Operands received (a single one is expected).
+
+        Returns
+        -------
+        str
+            Handle of the stored operand.
+        """
+        if len(operands) != 1:
+            raise RuntimeError("Only a single operand can be stored at a time.")
+
+        try:
+            return self.store.put(client, operands[0])
+        except QuotaExceededError as err:
+            context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(err))
+
+    def _stored_operand(self, context, message_type: str, handle: str):
+        """Retrieve a stored operand, pinning it while it is used.
+
+        Parameters
+        ----------
+        context : grpc.ServicerContext
+            gRPC-specific information.
+        message_type : str
+            Type of operand expected. Options are ``vectors`` and ``matrices``.
+        handle : str
+            Handle of the operand.
+
+        Returns
+        -------
+        contextlib.AbstractContextManager
+            Context manager yielding the stored operand (see ``OperandStore.pin``).
+
+        Raises
+        ------
+        RuntimeError
+            In case the handle is unknown, or it is not of the expected type.
+        """
+        prefix = "vec-" if message_type == "vectors" else "mat-"
+        if not handle.startswith(prefix):
+            raise RuntimeError(
+                "Operand handle %s is not one of %s." % (handle, message_type)
+            )
+
+        md = self._read_client_metadata(context)
+        return self.store.pin(self._client_id(context, md), handle)
+
+    def _handle_response(self, message_type: str, handle: str, version: int = 1):
+        """Generate the response whose result is kept in the store.
+
+        Parameters
+        ----------
+        message_type : str
+            Type of message of the response. Options are ``vectors`` and ``matrices``.
+        handle : str
+            Handle of the stored result.
+        version : int, optional
+            Version of the streaming protocol used by the client. The default is 1.
+
+        Returns
+        -------
+        list[tuple], list
+            Metadata to be sent by the server and the response messages. In version 1,
+            the handle is sent as metadata (no messages follow). In version 2, it is
+            sent in the manifest (no chunks follow).
+        """
+        if version == 1:
+            return [("full-" + message_type, "0"), ("result-handle", handle)], []
+
+        manifest = grpcdemo_pb2.Manifest(
+            operands=[grpcdemo_pb2.OperandInfo(handle=handle)]
+        )
+        if message_type == "vectors":
+            return [], [grpcdemo_pb2.Vector(manifest=manifest)]
+        else:
+            return [], [grpcdemo_pb2.Matrix(manifest=manifest)]
+
+    def _batched(self, operation, md: dict, hasher=None):
+        """Adapt an operation to operands that stack a batch of independent items.
+
+        Each operand stacks the K items of the batch along its first dimension (that is,
+        K vectors of size N are received as a vector of size K*N, and K matrices of
+        shape R x C as a matrix of shape K*R x C). The adapted operation receives the
+        operands as K x N (or K x R x C) arrays, and its K results are stacked back.
+
+        Parameters
+        ----------
+        operation : callable
+            Operation to adapt, such as ``operation(dtype, size, operands) -> result``.
+            It receives the size of a single item.
+        md : dict
+            Metadata provided by the client, containing the ``batch-size`` (K).
+        hasher : hashlib.blake2b, optional
+            Hash object to update with the batch size. The default is ``None``.
+
+        Returns
+        -------
+        callable
+            Adapted operation.
+
+        Raises
+        ------
+        RuntimeError
+            In case the batch size is not provided, or the operands cannot be split into it.
+        """
+        batch_size = int(md.get("batch-size", 0))
+        if batch_size <= 0:
+            raise RuntimeError("Batch requests must provide a positive batch-size.")
+
+        # Batches of different sizes must not share the same key
+        if hasher is not None:
+            hasher.update(b"batch-size=%d" % batch_size)
+
+        def batch_operation(dtype, size, operands):
+            if size[0] % batch_size != 0:
+                raise RuntimeError(
+                    "Operands cannot be split into %d batch items." % batch_size
+                )
+
+            # Splitting (and stacking back) the items is just a reshape... no copies
+            item_size = (size[0] // batch_size,) + size[1:]
+            stacks = [np.reshape(arg, (batch_size,) + item_size) for arg in operands]
+            result = operation(dtype, item_size, stacks)
+            return np.reshape(result, (-1,) + result.shape[2:])
+
+        return batch_operation
+
+    def _flip_vector(self, dtype, size, vector_list):
+        """Flip the first vector provided.
+
+        Parameters
+        ----------
+        dtype : np.type
+            Type of data of the vectors.
+        size : tuple
+            Size of the vectors.
+        vector_list : list of np.array
+            Vectors to process.
+
+        Returns
+        -------
+        np.array
+            Flipped vector.
+        """
+        return np.flip(vector_list[0])
+
+    def _add_vectors(self, dtype, size, vector_list):
+        """Add all provided vectors using the Eigen library.
+
+        Parameters
+        ----------
+        dtype : np.type
+            Type of data of the vectors.
+        size : tuple
+            Size of the vectors.
+        vector_list : list of np.array
+            Vectors to process.
+
+        Returns
+        -------
+        np.array
+            Sum of the vectors.
+        """
+        # Accumulate on the first vector (if the vectors were already folded while
+        # reading them, there is nothing left to add)
+        result = vector_list[0]
+
+        # Add all provided vectors using the Eigen library
+        for vector in vector_list[1:]:
+            result = demo_eigen_wrapper.add_vectors(result, vector)
+
+        return result
+
+    def _multiply_vectors(self, dtype, size, vector_list):
+        """Perform the dot product of two vectors using the Eigen library.
+
+        Parameters
+        ----------
+        dtype : np.type
+            Type of data of the vectors.
+        size : tuple
+            Size of the vectors.
+        vector_list : list of np.array
+            Vectors to process.
+
+        Returns
+        -------
+        np.array
+            Dot product of the vectors (as a single-element vector).
+
+        Raises
+        ------
+        RuntimeError
+            In case a number of vectors other than two is provided.
+        """
+        # Check that the vctor list contains a maximum of two vectors
+        if len(vector_list) != 2:
+            raise RuntimeError(
+                "Unexpected number of vectors to be multiplied: "
+                + str(len(vector_list))
+                + ". Only 2 is valid."
+            )
+
+        # Perform the dot product of the provided vectors using the Eigen library (which
+        # provides a kernel for each of the handled data types... no casting is needed)
+        result = demo_eigen_wrapper.multiply_vectors(vector_list[0], vector_list[1])
+
+        # Return the result as a numpy.ndarray
+        return np.array(result, dtype=dtype, ndmin=1)
+
+    def _add_chunk(self, reduction_chunk, chunk):
+        """Add a chunk of an operand to the matching chunk of the reduction using the Eigen library.
+
+        Chunks line up element-wise, so vectors and matrices are both added as flat vectors.
+
+        Parameters
+        ----------
+        reduction_chunk : np.array
+            Chunk of the reduction of the previous operands.
+        chunk : np.array
+            Matching chunk of the operand being received.
+
+        Returns
+        -------
+        np.array
+            Sum of both chunks.
+        """
+        # Chunks come straight from the (read-only) message buffer... which Eigen reads
+        # without copying it
+        return demo_eigen_wrapper.add_vectors(reduction_chunk, chunk)
+
+    def _add_matrices(self, dtype, size, matrix_list):
+        """Add all provided matrices using the Eigen library.
+
+        Parameters
+        ----------
+        dtype : np.type
+            Type of data of the matrices.
+        size : tuple
+            Shape of the matrices.
+        matrix_list : list of np.array
+            Matrices to process.
+
+        Returns
+        -------
+        np.array
+            Sum of the matrices.
+        """
+        # Accumulate on the first matrix (if the matrices were already folded while
+        # reading them, there is nothing left to add)
+        result = matrix_list[0]
+
+        # Add all provided matrices using the Eigen library
+        for matrix in matrix_list[1:]:
+            result = demo_eigen_wrapper.add_matrices(result, matrix)
+
+        return result
+
+    def _multiply_matrices(self, dtype, size, matrix_list):
+        """Multiply two matrices using the Eigen library.
+
+        Parameters
+        ----------
+        dtype : np.type
+            Type of data of the matrices.
+        size : tuple
+            Shape of the matrices.
+        matrix_list : list of np.array
+            Matrices to process.
+
+        Returns
+        -------
+        np.array
+            Product of the matrices.
+
+        Raises
+        ------
+        RuntimeError
+            In case a number of matrices other than two is provided, or if they are not square.
+        """
+        # Check that the matrix list contains a maximum of two matrices
+        if len(matrix_list) != 2:
+            raise RuntimeError(
+                "Unexpected number of matrices to be multiplied: "
+                + str(len(matrix_list))
+                + ". You can only multiple two matrices."
+            )
+
+        # Due to the previous _get_matrices method, the size of all
+        # matrices is the same... check that it is a square matrix. Otherwise, no multiplication
+        # is possible
+        if size[0] != size[1]:
+            raise RuntimeError("Only square matrices are allowed for multiplication.")
+
+        # Perform the matrix multiplication of the provided matrices using the Eigen library
+        # (which provides a kernel for each of the handled data types... no casting is needed)
+        return self._eigen(
+            "multiply_matrices",
+            size[0] * size[1] * size[1],
+            matrix_list[0],
+            matrix_list[1],
+        )
+
+    def _stacked_multiply_vectors(self, lefts, rights):
+        """Perform the dot products of many pairs of vectors in a single Eigen call.
+
+        Parameters
+        ----------
+        lefts : list of np.array
+            First vector of each pair.
+        rights : list of np.array
+            Second vector of each pair.
+
+        Returns
+        -------
+        np.array
+            Dot products of the pairs (each one as a single-element vector).
+        """
+        products = demo_eigen_wrapper.batch_multiply_vectors(
+            np.stack(lefts), np.stack(rights)
+        )
+        return np.reshape(products, (-1, 1))
+
+    def _stacked_multiply_matrices(self, lefts, rights):
+        """Multiply many pairs of square matrices in a single Eigen call.
+
+        Parameters
+        ----------
+        lefts : list of np.array
+            Left matrix of each pair.
+        rights : list of np.array
+            Right matrix of each pair.
+
+        Returns
+        -------
+        np.array
+            Products of the pairs (as a K x R x C array).
+        """
+        # Products computed on their own are column-major... as (AB)^T = B^T A^T, stacking
+        # the transposed matrices (instead of the matrices) yields them in that layout
+        products = demo_eigen_wrapper.batch_multiply_matrices(
+            np.stack([matrix.T for matrix in rights]),
+            np.stack([matrix.T for matrix in lefts]),
+        )
+        return np.transpose(products, (0, 2, 1))
+
+    def _batch_multiply_matrices(self, dtype, size, matrix_list):
+        """Multiply the matching items of two batches of matrices using the Eigen library.
+
+        Parameters
+        ----------
+        dtype : np.type
+            Type of data of the matrices.
+        size : tuple
+            Shape of a single matrix of the batches.
+        matrix_list : list of np.array
+            Batches of matrices to process (as K x R x C arrays).
+
+        Returns
+        -------
+        np.array
+            Products of the matrices (as a K x R x C array).
+        """
+        if len(matrix_list) != 2:
+            raise RuntimeError(
+                "Unexpected number of matrices to be multiplied: "
+                + str(len(matrix_list))
+                + ". You can only multiple two matrices."
+            )
+        if size[0] != size[1]:
+            raise RuntimeError("Only square matrices are allowed for multiplication.")
+
+        # Multiply all pairs of items in a single call
+        return self._eigen(
+            "batch_multiply_matrices",
+            matrix_list[0].shape[0] * size[0] * size[1] * size[1],
+            *matrix_list,
+        )
+
+    def _get_vectors(
+        self,
+        request_iterator,
+        md: dict,
+        fold=None,
+        hasher=None,
+        client=None,
+        context=None,
+        admit=None,
+        pins=None,
+    ):
+        """Process a stream of vector messages.
+
+        Parameters
+        ----------
+        request_iterator : iterator
+            Iterator to the received request messages of type Vector.
+        md : dict
+            Metadata provided by the client.
+        fold : callable, optional
+            Function used to fold each chunk into the reduction of the vectors. See
+            ``_ChunkAssembler``. The default is ``None``.
+        hasher : hashlib.blake2b, optional
+            Hash object to update with the content of the vectors. The default is ``None``.
+        client : str, optional
+            Identifier of the client, owner of the handles of stored vectors. The
+            default is ``None``.
+        context : grpc.ServicerContext, optional
+            gRPC-specific information. If provided, the call is aborted as soon as the
+            client no longer waits for it. The default is ``None``.
+        admit : callable, optional
+            Function admitting the call, given the size of the vectors. See
+            ``_ChunkAssembler``. The default is ``None``.
+        pins : contextlib.ExitStack, optional
+            Stack of the call in which the stored vectors are pinned. See
+            ``_ChunkAssembler``. The default is ``None``.
+
+        Returns
+        -------
+        np.type, tuple, list of np.array
+            Type of data, size of the vectors, and list of vectors to process.
+        """
+        assembler = _ChunkAssembler(
+            "vectors",
+            md,
+            fold,
+            hasher,
+            self.store,
+            client,
+            admit,
+            shared_memory=self._accepts_shared_memory(context, md),
+            pins=pins,
+        )
+
+        # Read messages until all expected full vector messages are processed
+        while not assembler.done:
+            if context is not None:
+                self._check_active(context, "receive")
+            assembler.process(self._next_chunk(request_iterator))
+
+        # Return the input vector list (as a list of numpy.ndarray)
+        return assembler.dtype, assembler.size, assembler.operands
+
+    def _get_matrices(
+        self,
+        request_iterator,
+        md: dict,
+        fold=None,
+        hasher=None,
+        client=None,
+        context=None,
+        admit=None,
+        pins=None,
+    ):
+        """Process a stream of matrix messages.
+
+        Parameters
+        ----------
+        request_iterator : iterator
+            Iterator to the received request messages of type ``Matrix``.
+        md : dict
+            Metadata provided by the client.
+        fold : callable, optional
+            Function used to fold each chunk into the reduction of the matrices. See
+            ``_ChunkAssembler``. The default is ``None``.
+        hasher : hashlib.blake2b, optional
+            Hash object to update with the content of the matrices. The default is ``None``.
+        client : str, optional
+            Identifier of the client, owner of the handles of stored matrices. The
+            default is ``None``.
+        context : grpc.ServicerContext, optional
+            gRPC-specific information. If provided, the call is aborted as soon as the
+            client no longer waits for it. The default is ``None``.
+        admit : callable, optional
+            Function admitting the call, given the size of the matrices. See
+            ``_ChunkAssembler``. The default is ``None``.
+        pins : contextlib.ExitStack, optional
+            Stack of the call in which the stored matrices are pinned. See
+            ``_ChunkAssembler``. The default is ``None``.
+
+        Returns
+        -------
+        np.type, tuple, list of np.array
+            Type of data, shape of the matrices, and list of matrices to process.
+        """
+        assembler = _ChunkAssembler(
+            "matrices",
+            md,
+            fold,
+            hasher,
+            self.store,
+            client,
+            admit,
+            shared_memory=self._accepts_shared_memory(context, md),
+            pins=pins,
+        )
+
+        # Read messages until all expected full matrix messages are processed
+        while not assembler.done:
+            if context is not None:
+                self._check_active(context, "receive")
+            assembler.process(self._next_chunk(request_iterator))
+
+        # Return the input matrix list (as a list of numpy.ndarray)
+        return assembler.dtype, assembler.size, assembler.operands
+
+    def _read_client_metadata(self, context):
+        """Return the metadata as a dictionary.
+
+        Parameters
+        ----------
+        context : grpc.ServicerContext
+            gRPC-specific information.
+
+        Returns
+        -------
+        dict
+            Python-readable metadata in dictionary form.
+        """
+        metadata = context.invocation_metadata()
+        metadata_dict = {}
+        for key, value in metadata:
+            metadata_dict[key] = value
+
+        return metadata_dict
+
+    def _generate_md(
+        self, message_type: str, abbrev: str, *args: np.ndarray, chunk_size=None
+    ):
+        """Generate the server metadata sent to the client and determine the number of chunks in which to decompose each message.
+
+        Parameters
+        ----------
+        message_type : str
+            Type of message being sent. Options are``vectors`` and ``matrices``.
+        abbrev : str
+            Abbreviated form of the message being sent. Options are ``vec`` and ``mat``.
+        chunk_size : int, optional
+            Maximum amount of bytes of the chunks. The default is ``None``, in which
+            case ``MAX_CHUNKSIZE`` is used.
+
+        Returns
+        -------
+        list[tuple], list[list[int]]
+            Metadata to be sent by the server and the chunk indices for the list
+            of messages to send.
+
+        Raises
+        ------
+        RuntimeError
+            In case of an invalid use of this function.
+        """
+        # Initialize the metadata and the chunks list for each full message
+        md = []
+        chunks = []
+
+        # Find how many arguments are to be transmitted
+        md.append(("full-" + message_type, str(len(args))))
+
+        # Loop over all input arguments
+        idx = 1
+        for arg in args:
+            # Determine the chunks needed and append the results
+            last_idx_chunk = self._chunk_indices(arg, chunk_size)
+            md.append((abbrev + str(idx) + "-messages", str(len(last_idx_chunk))))
+            chunks.append(last_idx_chunk)
+
+            # Increase idx by 1
+            idx += 1
+
+        # Return the metadata and the chunks list for each vector or matrix
+        return md, chunks
+
+    def _chunk_indices(self, arg: np.ndarray, chunk_size: int = None):
+        """Determine the chunks in which to decompose an array.
+
+        Parameters
+        ----------
+        arg : np.ndarray
+            Array to transmit.
+        chunk_size : int, optional
+            Maximum amount of bytes of the chunks. The default is ``None``, in which
+            case ``MAX_CHUNKSIZE`` is used.
+
+        Returns
+        -------
+        list[int]
+            Last index (of the raveled array) up to which to process in each chunk.
+        """
+        chunk_size = chunk_size or constants.MAX_CHUNKSIZE
+
+        # If the maximum chunk size is not surpassed, a single chunk is needed
+        if arg.nbytes <= chunk_size:
+            return [arg.size]
+
+        # Otherwise, fill in chunks of the maximum amount of elements... and include
+        # one last partial chunk with the remainder (if any)
+        max_elems = max(1, chunk_size // arg.itemsize)
+        return list(range(max_elems, arg.size, max_elems)) + [arg.size]
+
+    def _send_vectors(
+        self, context: grpc.ServicerContext, *args: np.ndarray, cache_key=None
+    ):
+        """Send the response vector messages.
+
+        Parameters
+        ----------
+        context : grpc.ServicerContext
+            gRPC context.
+        args : np.ndarray
+            Variable size of np.arrays to transmit.
+        cache_key : bytes, optional
+            Key under which the response is stored in the result cache. The default
+            is ``None``, in which case the response is not stored.
+
+        Yields
+        ------
+        grpcdemo_pb2.Vector
+            Vector messages streamed (full or partial, depending on the metadata)
+        """
+
+        # Generate the metadata and the messages (in the protocol version of the client)
+        client_md = self._read_client_metadata(context)
+        md, messages = self._build_response(
+            "vectors",
+            cache_key,
+            *args,
+            version=get_protocol_version(client_md),
+            shared_memory=self._accepts_shared_memory(context, client_md),
+            frames=is_raw(context),
+            chunk_size=self._chunk_size(client_md),
+        )
+
+        # Compress the response (if requested and worth it) and send the initial metadata
+        md, messages = self._encode_response(
+            context, md, messages, sum(arg.nbytes for arg in args)
+        )
+        context.send_initial_metadata(md)
+
+        # Yield the vector messages
+        yield from messages
+
+    def _send_matrices(
+        self, context: grpc.ServicerContext, *args: np.ndarray, cache_key=None
+    ):
+        """Sending the response matrix messages.
+
+        Parameters
+        ----------
+        context : grpc.ServicerContext
+            gRPC context.
+        args : np.ndarray
+            Variable size of np.arrays to transmit.
+        cache_key : bytes, optional
+            Key under which the response is stored in the result cache. The default
+            is ``None``, in which case the response is not stored.
+
+        Yields
+        ------
+        grpcdemo_pb2.Matrix
+            Matrix messages streamed (full or partial, depending on the metadata)
+        """
+
+        # Generate the metadata and the messages (in the protocol version of the client)
+        client_md = self._read_client_metadata(context)
+        md, messages = self._build_response(
+            "matrices",
+            cache_key,
+            *args,
+            version=get_protocol_version(client_md),
+            shared_memory=self._accepts_shared_memory(context, client_md),
+            frames=is_raw(context),
+            chunk_size=self._chunk_size(client_md),
+        )
+
+        # Compress the response (if requested and worth it) and send the initial metadata
+        md, messages = self._encode_response(
+            context, md, messages, sum(arg.nbytes for arg in args)
+        )
+        context.send_initial_metadata(md)
+
+        # Yield the matrix messages
+        yield from messages
+
+    def _send_panels(self, context: grpc.ServicerContext, panels, ticket, pins):
+        """Send a matrix product as its blocks of rows are computed.
+
+        Parameters
+        ----------
+        context : grpc.ServicerContext
+            gRPC context.
+        panels : _RowPanels
+            Multiplication whose panels have been submitted.
+        ticket : AdmissionTicket
+            Admission of the call, released once the product is sent.
+        pins : contextlib.ExitStack
+            Stored operands pinned by the call, unpinned once the product is sent.
+
+        Yields
+        ------
+        grpcdemo_pb2.Matrix
+            Matrix messages.
+        """
+        with ticket, pins:
+            md, messages = self._encode_response(
+                context, [], panels.messages(wait=True), panels.result.nbytes
+            )
+            context.send_initial_metadata(md)
+            yield from messages
+
+    def _send_cached(self, context: grpc.ServicerContext, cached: CachedResponse):
+        """Send a response stored in the result cache.
+
+        Parameters
+        ----------
+        context : grpc.ServicerContext
+            gRPC context.
+        cached : CachedResponse
+            Response stored in the cache.
+
+        Yields
+        ------
+        grpcdemo_pb2.Vector or grpcdemo_pb2.Matrix
+            Messages of the cached response.
+        """
+        md, messages = self._encode_response(
+            context, cached.metadata, cached.messages, cached.nbytes
+        )
+        context.send_initial_metadata(md)
+        yield from messages
+
+    def _send_handle(self, context: grpc.ServicerContext, message_type: str, handle):
+        """Send the handle of a result kept in the store (instead of the result).
+
+        Parameters
+        ----------
+        context : grpc.ServicerContext
+            gRPC context.
+        message_type : str
+            Type of message of the response. Options are ``vectors`` and ``matrices``.
+        handle : str
+            Handle of the stored result.
+
+        Yields
+        ------
+        grpcdemo_pb2.Vector or grpcdemo_pb2.Matrix
+            Manifest message (only in version 2 of the protocol).
+        """
+        version = get_protocol_version(self._read_client_metadata(context))
+        md, messages = self._handle_response(message_type, handle, version)
+        context.send_initial_metadata(md)
+        yield from messages
+
+    def _encode_response(self, context, md: list, messages, nbytes: int):
+        """Compress the response with the codec requested by the client (if any).
+
+        Responses whose payload is below the ``codec-threshold`` of the client, or
+        requesting a codec unavailable in the server, are not compressed. See the
+        ``compression`` module for the negotiation metadata.
+
+        Parameters
+        ----------
+        context : grpc.ServicerContext
+            gRPC context.
+        md : list[tuple]
+            Metadata of the response.
+        messages : iterator
+            Response messages.
+        nbytes : int
+            Payload bytes of the response.
+
+        Returns
+        -------
+        list[tuple], iterator
+            Metadata to be sent by the server and the (compressed) response messages.
+        """
+        client_md = self._read_client_metadata(context)
+        codec = client_md.get("accept-codec")
+        if codec is None:
+            return md, messages
+
+        # Let the client know which chunk codecs it can use for its requests... results
+        # handed over in shared memory are not worth compressing (and frames of the raw
+        # service are only compressed by gRPC codecs)
+        md = md + [("accept-chunk-codecs", ",".join(CHUNK_CODECS))]
+        if self._accepts_shared_memory(context, client_md):
+            return md, messages
+        if nbytes < int(client_md.get("codec-threshold", COMPRESSION_THRESHOLD)):
+            return md, messages
+
+        if codec in GRPC_CODECS:
+            context.set_compression(GRPC_CODECS[codec])
+        elif codec in CHUNK_CODECS and not is_raw(context):
+            md = md + [("chunk-codec", codec)]
+            messages = (compress_message(message, codec) for message in messages)
+
+        return md, messages
+
+    def _build_response(
+        self,
+        message_type: str,
+        cache_key,
+        *args: np.ndarray,
+        version: int = 1,
+        shared_memory: bool = False,
+        frames: bool = False,
+        chunk_size: int = None,
+    ):
+        """Generate the metadata and the messages of a response.
+
+        Parameters
+        ----------
+        message_type : str
+            Type of message being sent. Options are ``vectors`` and ``matrices``.
+        cache_key : bytes or None
+            Key under which the response is stored in the result cache (if any).
+        args : np.ndarray
+            Variable size of np.arrays to transmit.
+        version : int, optional
+            Version of the streaming protocol used by the client. The default is 1.
+        shared_memory : bool, optional
+            Whether to hand the arrays over in shared memory segments (only in version
+            2), instead of streaming them. Such responses must not be cached. The
+            default is ``False``.
+        frames : bool, optional
+            Whether to send the chunks as frames of the raw service (only in version
+            2). Responses to be cached are built as protobuf messages regardless, since
+            they may be served to any client. The default is ``False``.
+        chunk_size : int, optional
+            Maximum amount of bytes of the chunks (see ``_chunk_size``). The default is
+            ``None``, in which case ``MAX_CHUNKSIZE`` is used.
+
+        Returns
+        -------
+        list[tuple], iterator
+            Metadata to be sent by the server and the response messages.
+        """
+        if version == 2:
+            md = []
+            messages = self._manifest_messages(
+                message_type,
+                *args,
+                shared_memory=shared_memory,
+                frames=frames and cache_key is None,
+                chunk_size=chunk_size,
+            )
+        elif message_type == "vectors":
+            md, chunks = self._generate_md(
+                "vectors", "vec", *args, chunk_size=chunk_size
+            )
+            messages = self._vector_messages(chunks, *args)
+        else:
+            md, chunks = self._generate_md(
+                "matrices", "mat", *args, chunk_size=chunk_size
+            )
+            messages = self._matrix_messages(chunks, *args)
+
+        # Keep the messages to serve the same request again
+        if cache_key is not None:
+            messages = list(messages)
+            self.cache.put(cache_key, CachedResponse(md, messages))
+
+        return md, messages
+
+    def _vector_messages(self, chunks: "list[list[int]]", *args: np.ndarray):
+        """Build the vector messages (full or partial) for the given arrays.
+
+        Parameters
+        ----------
+        chunks : list[list[int]]
+            Chunk indices for each of the arrays, as returned by ``_generate_md``.
+        args : np.ndarray
+            Variable size of np.arrays to transmit.
+
+        Yields
+        ------
+        grpcdemo_pb2.Vector
+            Vector messages.
+        """
+        # Loop over all input arguments
+        for arg, vector_chunks in zip(args, chunks):
+            # Loop over the chunk indices
+            processed_idx = 0
+            for last_idx_chunk in vector_chunks:
+                # Use tmp_idx in yield function and update the processed_idx afterwards
+                tmp_idx = processed_idx
+                processed_idx = last_idx_chunk
+
+                # Yield!
+                yield grpcdemo_pb2.Vector(
+                    data_type=constants.NP_DTYPE_TO_DATATYPE[arg.dtype.type],
+                    vector_size=arg.shape[0],
+                    vector_as_chunk=arg[tmp_idx:last_idx_chunk].tobytes(),
+                )
+
+    def _matrix_messages(self, chunks: "list[list[int]]", *args: np.ndarray):
+        """Build the matrix messages (full or partial) for the given arrays.
+
+        Parameters
+        ----------
+        chunks : list[list[int]]
+            Chunk indices for each of the arrays, as returned by ``_generate_md``.
+        args : np.ndarray
+            Variable size of np.arrays to transmit.
+
+        Yields
+        ------
+        grpcdemo_pb2.Matrix
+            Matrix messages.
+        """
+        # Loop over all input arguments
+        for arg, matrix_chunks in zip(args, chunks):
+            # Since we are dealing with matrices, ravel it to a 1D array. In version 1,
+            # matrices are always sent in row-major order (clients may ignore the layout)
+            arg_as_vec = arg.ravel()
+
+            # Loop over the chunk indices
+            processed_idx = 0
+            for last_idx_chunk in matrix_chunks:
+                # Use tmp_idx in yield function and update the processed_idx afterwards
+                tmp_idx = processed_idx
+                processed_idx = last_idx_chunk
+
+                # Yield!
+                yield grpcdemo_pb2.Matrix(
+                    data_type=constants.NP_DTYPE_TO_DATATYPE[arg.dtype.type],
+                    matrix_rows=arg.shape[0],
+                    matrix_cols=arg.shape[1],
+                    matrix_as_chunk=arg_as_vec[tmp_idx:last_idx_chunk].tobytes(),
                 )
 
-                # If processing the first chunk of the message, fill in some data
-                if chunk_msg == 0:
-                    # Check the data type of the incoming matrix
-                    if chunk_mat.data_type == grpcdemo_pb2.DataType.Value("INTEGER"):
-                        dtype = check_data_type(dtype, np.int32)
-                    elif chunk_mat.data_type == grpcdemo_pb2.DataType.Value("DOUBLE"):
-                        dtype = check_data_type(dtype, np.float64)
-
-                    # Check the size of the incoming matrix
-                    size = check_size(
-                        size,
-                        (
-                            chunk_mat.matrix_rows,
-                            chunk_mat.matrix_cols,
-                        ),
-                    )
+    def _manifest_messages(
+        self,
+        message_type: str,
+        *args: np.ndarray,
+        shared_memory: bool = False,
+        frames: bool = False,
+        chunk_size: int = None,
+    ):
+        """Build the version 2 messages (manifest and chunks) for the given arrays.
+
+        Parameters
+        ----------
+        message_type : str
+            Type of message being sent. Options are ``vectors`` and ``matrices``.
+        args : np.ndarray
+            Variable size of np.arrays to transmit.
+        shared_memory : bool, optional
+            Whether to hand the arrays over in shared memory segments, which are then
+            owned by the client (see the ``sharedmem`` module). The default is ``False``.
+        frames : bool, optional
+            Whether to send the chunks as frames of the raw service, which are views of
+            the arrays (see the ``framing`` module). The default is ``False``.
+        chunk_size : int, optional
+            Maximum amount of bytes of the chunks. The default is ``None``, in which
+            case ``MAX_CHUNKSIZE`` is used.
+
+        Yields
+        ------
+        grpcdemo_pb2.Vector or grpcdemo_pb2.Matrix
+            Manifest message, followed by the chunks of each array (if any).
+        """
+        chunk_size = chunk_size or constants.MAX_CHUNKSIZE
+        if frames:
+            message_class, chunk_field = Frame, "chunk"
+        elif message_type == "vectors":
+            message_class, chunk_field = grpcdemo_pb2.Vector, "vector_as_chunk"
+        else:
+            message_class, chunk_field = grpcdemo_pb2.Matrix, "matrix_as_chunk"
+
+        # Arrays are sent in their memory order (for example, the column-major results of
+        # Eigen), so that they are not copied
+        orders = [constants.memory_order(arg) for arg in args]
+
+        # Describe all the arrays first (copied into shared memory, if requested)
+        yield message_class(
+            manifest=grpcdemo_pb2.Manifest(
+                operands=[
+                    grpcdemo_pb2.OperandInfo(
+                        data_type=constants.NP_DTYPE_TO_DATATYPE[arg.dtype.type],
+                        shape=arg.shape,
+                        layout=constants.ORDER_TO_LAYOUT[order],
+                        chunk_size=chunk_size,
+                        segment=sharedmem.export(arg) if shared_memory else None,
+                    )
+                    for arg, order in zip(args, orders)
+                ]
+            )
+        )
+        if shared_memory:
+            return
+
+        # Chunks only carry their content... the last one of each array is flagged
+        for arg, order in zip(args, orders):
+            arg_as_vec = arg.ravel(order=order)
+            processed_idx = 0
+            last_idx_chunks = self._chunk_indices(arg, chunk_size)
+            for last_idx_chunk in last_idx_chunks:
+                chunk = arg_as_vec[processed_idx:last_idx_chunk]
+                yield message_class(
+                    **{chunk_field: chunk.data if frames else chunk.tobytes()},
+                    end_of_operand=last_idx_chunk == last_idx_chunks[-1],
+                )
+                processed_idx = last_idx_chunk
+
+
+class AsyncGRPCDemoServicer(GRPCDemoServicer):
+    """Provides the ``grpc.aio`` (asyncio) implementation of the API Eigen Example server.
+
+    Chunks are read and written on the event loop, while they are processed (that is,
+    decoded and folded into the reduction of the operands) and the Eigen computations
+    are run in an executor. Thus, a large number of concurrent streams can be served
+    without needing a thread per stream.
+
+    Parameters
+    ----------
+    executor : concurrent.futures.Executor, optional
+        Executor in which all the computations are run. The default is ``None``, in
+        which case they are run in the fast and heavy lanes of the servicer (see the
+        ``lanes`` module).
+    **kwargs : dict, optional
+        Additional options of the servicer. See ``GRPCDemoServicer``.
+    """
+
+    def __init__(self, executor=None, **kwargs) -> None:
+        """Initialize the asyncio servicer."""
+        super().__init__(**kwargs)
+        self._executor = executor
+
+    # =================================================================================================
+    # PUBLIC METHODS for Server operations
+    # =================================================================================================
+
+    async def SayHello(self, request, context):
+        """Test the greeter method to see if the server is up and running correctly.
+
+        Parameters
+        ----------
+        request : HelloRequest
+            Greeting request sent by the client.
+        context : grpc.aio.ServicerContext
+            gRPC-specific information.
+
+        Returns
+        -------
+        grpcdemo_pb2.HelloReply
+           Reply to greeting by the server.
+        """
+        return super().SayHello(request, context)
+
+    async def FlipVector(self, request_iterator, context):
+        """Flip a given vector.
+
+        Parameters
+        ----------
+        request_iterator : async iterator
+            Iterator to the stream of vector messages provided.
+        context : grpc.aio.ServicerContext
+            gRPC-specific information.
+
+        Yields
+        ------
+        grpcdemo_pb2.Vector
+            Flipped vector message.
+        """
+        click.echo("Vector flip requested.")
+        async for message in self._process(
+            "FlipVector", "vectors", request_iterator, context, self._flip_vector
+        ):
+            yield message
+
+    async def AddVectors(self, request_iterator, context):
+        """Add vectors.
+
+        Parameters
+        ----------
+        request_iterator : async iterator
+            Iterator to the stream of vector messages provided.
+        context : grpc.aio.ServicerContext
+            gRPC-specific information.
+
+        Yields
+        ------
+        grpcdemo_pb2.Vector
+            Vector message.
+        """
+        click.echo("Vector addition requested.")
+        async for message in self._process(
+            "AddVectors",
+            "vectors",
+            request_iterator,
+            context,
+            self._add_vectors,
+            self._add_chunk,
+        ):
+            yield message
+
+    async def MultiplyVectors(self, request_iterator, context):
+        """Multiply two vectors.
+
+        Parameters
+        ----------
+        request_iterator : async iterator
+            Iterator to the stream of vector messages provided.
+        context : grpc.aio.ServicerContext
+            gRPC-specific information.
+
+        Yields
+        ------
+        grpcdemo_pb2.Vector
+            Vector message.
+        """
+        click.echo("Vector dot product requested")
+        async for message in self._process(
+            "MultiplyVectors",
+            "vectors",
+            request_iterator,
+            context,
+            self._multiply_vectors,
+        ):
+            yield message
+
+    async def AddMatrices(self, request_iterator, context):
+        """Add matrices.
+
+        Parameters
+        ----------
+        request_iterator : async iterator
+            Iterator to the stream of matrix messages provided.
+        context : grpc.aio.ServicerContext
+            gRPC-specific information.
+
+        Yields
+        ------
+        grpcdemo_pb2.Matrix
+            Matrix message.
+        """
+        click.echo("Matrix addition requested!")
+        async for message in self._process(
+            "AddMatrices",
+            "matrices",
+            request_iterator,
+            context,
+            self._add_matrices,
+            self._add_chunk,
+        ):
+            yield message
+
+    async def MultiplyMatrices(self, request_iterator, context):
+        """Multiply two matrices.
+
+        Parameters
+        ----------
+        request_iterator : async iterator
+            Iterator to the stream of matrix messages provided.
+        context : grpc.aio.ServicerContext
+            gRPC-specific information.
 
-                # Parse the chunk
-                if matrix is None:
-                    matrix = np.frombuffer(chunk_mat.matrix_as_chunk, dtype=dtype)
-                else:
-                    tmp = np.frombuffer(chunk_mat.matrix_as_chunk, dtype=dtype)
-                    matrix = np.concatenate((matrix, tmp))
+        Yields
+        ------
+        grpcdemo_pb2.Matrix
+            Matrix message.
+        """
+        click.echo("Matrix multiplication requested.")
 
-            # Check if the final matrix has the desired size
-            if matrix.size != size[0] * size[1]:
-                raise RuntimeError("Problems reading client full Matrix message...")
-            else:
-                # If everything is fine, append to matrix_list
-                matrix = np.reshape(matrix, size)
-                matrix_list.append(matrix)
+        # The left matrix may be multiplied as it arrives
+        if streams_row_panels(self._read_client_metadata(context)):
+            async for message in self._multiply_row_panels(request_iterator, context):
+                yield message
+            return
+
+        async for message in self._process(
+            "MultiplyMatrices",
+            "matrices",
+            request_iterator,
+            context,
+            self._multiply_matrices,
+            row_blocks=True,
+        ):
+            yield message
+
+    async def BatchAddVectors(self, request_iterator, context):
+        """Add many independent pairs of vectors.
 
-        # Return the input matrix list (as a list of numpy.ndarray)
-        return dtype, size, matrix_list
+        Parameters
+        ----------
+        request_iterator : async iterator
+            Iterator to the stream of vector messages provided.
+        context : grpc.aio.ServicerContext
+            gRPC-specific information.
 
-    def _read_client_metadata(self, context):
-        """Return the metadata as a dictionary.
+        Yields
+        ------
+        grpcdemo_pb2.Vector
+            Vector message.
+        """
+        click.echo("Batch vector addition requested.")
+        async for message in self._process(
+            "BatchAddVectors",
+            "vectors",
+            request_iterator,
+            context,
+            self._add_vectors,
+            self._add_chunk,
+            batched=True,
+        ):
+            yield message
+
+    async def BatchMultiplyMatrices(self, request_iterator, context):
+        """Multiply many independent pairs of matrices.
 
         Parameters
         ----------
-        context : grpc.ServicerContext
+        request_iterator : async iterator
+            Iterator to the stream of matrix messages provided.
+        context : grpc.aio.ServicerContext
+            gRPC-specific information.
+
+        Yields
+        ------
+        grpcdemo_pb2.Matrix
+            Matrix message.
+        """
+        click.echo("Batch matrix multiplication requested.")
+        async for message in self._process(
+            "BatchMultiplyMatrices",
+            "matrices",
+            request_iterator,
+            context,
+            self._batch_multiply_matrices,
+            batched=True,
+        ):
+            yield message
+
+    async def UploadVector(self, request_iterator, context):
+        """Store a vector in the server.
+
+        Parameters
+        ----------
+        request_iterator : async iterator
+            Iterator to the stream of vector messages provided.
+        context : grpc.aio.ServicerContext
             gRPC-specific information.
 
         Returns
         -------
-        dict
-            Python-readable metadata in dictionary form.
+        grpcdemo_pb2.Handle
+            Handle of the stored vector.
         """
-        metadata = context.invocation_metadata()
-        metadata_dict = {}
-        for c in metadata:
-            metadata_dict[c.key] = c.value
-
-        return metadata_dict
+        click.echo("Vector upload requested.")
+        return await self._upload("vectors", request_iterator, context)
 
-    def _generate_md(self, message_type: str, abbrev: str, *args: np.ndarray):
-        """Generate the server metadata sent to the client and determine the number of chunks in which to decompose each message.
+    async def UploadMatrix(self, request_iterator, context):
+        """Store a matrix in the server.
 
         Parameters
         ----------
-        message_type : str
-            Type of message being sent. Options are``vectors`` and ``matrices``.
-        abbrev : str
-            Abbreviated form of the message being sent. Options are ``vec`` and ``mat``.
+        request_iterator : async iterator
+            Iterator to the stream of matrix messages provided.
+        context : grpc.aio.ServicerContext
+            gRPC-specific information.
 
         Returns
         -------
-        list[tuple], list[list[int]]
-            Metadata to be sent by the server and the chunk indices for the list
-            of messages to send.
+        grpcdemo_pb2.Handle
+            Handle of the stored matrix.
+        """
+        click.echo("Matrix upload requested.")
+        return await self._upload("matrices", request_iterator, context)
 
-        Raises
+    async def DownloadVector(self, request, context):
+        """Retrieve a stored vector.
+
+        Parameters
+        ----------
+        request : Handle
+            Handle of the vector.
+        context : grpc.aio.ServicerContext
+            gRPC-specific information.
+
+        Yields
         ------
-        RuntimeError
-            In case of an invalid use of this function.
+        grpcdemo_pb2.Vector
+            Vector message.
         """
-        # Initialize the metadata and the chunks list for each full message
-        md = []
-        chunks = []
+        click.echo("Vector download requested.")
+        async for message in self._download("vectors", request, context):
+            yield message
 
-        # Find how many arguments are to be transmitted
-        md.append(("full-" + message_type, str(len(args))))
+    async def DownloadMatrix(self, request, context):
+        """Retrieve a stored matrix.
 
-        # Loop over all input arguments
-        idx = 1
-        for arg in args:
-            # Check the size of the arrays
-            # If size is surpassed, determine chunks needed
-            if arg.nbytes > constants.MAX_CHUNKSIZE:
-                # Let us determine how many chunks we will need
-                #
-                # Max amount of elements per chunk
-                max_elems = constants.MAX_CHUNKSIZE // arg.itemsize
-
-                # Bulk number of chunks needed
-                bulk_chunks = arg.size // max_elems
-
-                # The remainder amount of elements (if any)
-                remainder = arg.size % max_elems
-
-                # This list provides the last index up to which to
-                # process in each partial vector or matrix message
-                last_idx_chunk = []
-                for i in range(1, bulk_chunks + 1):
-                    last_idx_chunk.append(i * max_elems)
-
-                # Take into account that if there is a remainder,
-                # include one last partial vector or matrix message.
-                if remainder != 0:
-                    last_idx_chunk.append(arg.size)
-
-                # Append the results
-                md.append((abbrev + str(idx) + "-messages", str(len(last_idx_chunk))))
-                chunks.append(last_idx_chunk)
+        Parameters
+        ----------
+        request : Handle
+            Handle of the matrix.
+        context : grpc.aio.ServicerContext
+            gRPC-specific information.
 
-            else:
-                # Otherwise dealing with a single message.. Append results.
-                md.append((abbrev + str(idx) + "-messages", str(1)))
-                chunks.append([arg.size])
+        Yields
+        ------
+        grpcdemo_pb2.Matrix
+            Matrix message.
+        """
+        click.echo("Matrix download requested.")
+        async for message in self._download("matrices", request, context):
+            yield message
 
-            # Increase idx by 1
-            idx += 1
+    async def Release(self, request, context):
+        """Release a stored operand.
 
-        # Return the metadata and the chunks list for each vector or matrix
-        return md, chunks
+        Parameters
+        ----------
+        request : Handle
+            Handle of the operand.
+        context : grpc.aio.ServicerContext
+            gRPC-specific information.
 
-    def _send_vectors(self, context: grpc.ServicerContext, *args: np.ndarray):
-        """Send the response vector messages.
+        Returns
+        -------
+        grpcdemo_pb2.ReleaseReply
+            Whether the operand was stored (and has been released).
+        """
+        return super().Release(request, context)
+
+    async def GetStats(self, request, context):
+        """Report the statistics of the RPCs served.
 
         Parameters
         ----------
-        context : grpc.ServicerContext
-            gRPC context.
-        args : np.ndarray
-            Variable size of np.arrays to transmit.
+        request : StatsRequest
+            Statistics request sent by the client.
+        context : grpc.aio.ServicerContext
+            gRPC-specific information.
 
-        Yields
-        ------
-        grpcdemo_pb2.Vector
-            Vector messages streamed (full or partial, depending on the metadata)
+        Returns
+        -------
+        grpcdemo_pb2.StatsReply
+           Statistics report. See ``GRPCDemoServicer.GetStats()``.
         """
+        return super().GetStats(request, context)
 
-        # Generate the metadata and info on the chunks
-        md, chunks = self._generate_md("vectors", "vec", *args)
+    async def GetCapabilities(self, request, context):
+        """Report the capabilities of the server.
 
-        # Send the initial metadata
-        context.send_initial_metadata(md)
+        Parameters
+        ----------
+        request : CapabilitiesRequest
+            Capabilities request sent by the client.
+        context : grpc.aio.ServicerContext
+            gRPC-specific information.
 
-        # Loop over all input arguments
-        for arg, vector_chunks in zip(args, chunks):
-            # Loop over the chunk indices
-            processed_idx = 0
-            for last_idx_chunk in vector_chunks:
-                # Use tmp_idx in yield function and update the processed_idx afterwards
-                tmp_idx = processed_idx
-                processed_idx = last_idx_chunk
+        Returns
+        -------
+        grpcdemo_pb2.CapabilitiesReply
+           Capabilities of the server. See ``GRPCDemoServicer.GetCapabilities()``.
+        """
+        return super().GetCapabilities(request, context)
 
-                # Yield!
-                yield grpcdemo_pb2.Vector(
-                    data_type=constants.NP_DTYPE_TO_DATATYPE[arg.dtype.type],
-                    vector_size=arg.shape[0],
-                    vector_as_chunk=arg[tmp_idx:last_idx_chunk].tobytes(),
+    # =================================================================================================
+    # PRIVATE METHODS for Server operations
+    # =================================================================================================
+
+    async def _process(
+        self,
+        rpc_name: str,
+        message_type: str,
+        request_iterator,
+        context,
+        operation,
+        fold=None,
+        batched=False,
+        row_blocks=False,
+    ):
+        """Read the operands, run the operation in the executor and stream back the result.
+
+        See ``GRPCDemoServicer._process`` for a description of the parameters.
+        """
+        md = self._read_client_metadata(context)
+        client = self._client_id(context, md)
+        store_result = md.get("store-result") == "true"
+        version = get_protocol_version(md)
+        chunk_size = self._chunk_size(md)
+        shared_memory = self._accepts_shared_memory(context, md)
+        uncached = store_result or shared_memory
+        hasher = (
+            None if uncached else self._request_hasher(rpc_name, version, chunk_size)
+        )
+        if batched:
+            operation = self._batched(operation, md, hasher)
+        row_blocks = row_blocks and version == 2 and not uncached and hasher is None
+
+        # The call is admitted once the size of its operands is known (its cost is
+        # released once computed)
+        with self.admission.ticket(rpc_name) as ticket, contextlib.ExitStack() as pins:
+            try:
+                dtype, size, operands = await self._aget(
+                    message_type,
+                    request_iterator,
+                    md,
+                    fold,
+                    hasher,
+                    client,
+                    context,
+                    ticket.admit,
+                    pins,
+                )
+            except OverloadedError as err:
+                await self._areject(context, err)
+
+            # Serve the response straight from the cache, if available
+            key, cached = self._lookup_cache(hasher)
+            if cached is None:
+                # Perform the operation... unless the client no longer waits for it
+                await self._acheck_active(context, "compute")
+                if row_blocks and _spans_chunks(dtype, size, chunk_size):
+                    panels = _RowPanels(
+                        self._submit,
+                        self._eigen,
+                        frames=is_raw(context),
+                        chunk_size=chunk_size,
+                    )
+                    panels.finish(operands[::-1])
+                    async for message in self._astream(
+                        context, self._apanel_messages(panels), panels.result.nbytes
+                    ):
+                        yield message
+                    return
+                result = await asyncio.wrap_future(
+                    self._start(
+                        rpc_name, operation, dtype, size, operands, ticket.cost, hasher
+                    )
                 )
 
-    def _send_matrices(self, context: grpc.ServicerContext, *args: np.ndarray):
-        """Sending the response matrix messages.
+        if cached is not None:
+            response_md, messages = self._encode_response(
+                context, cached.metadata, cached.messages, cached.nbytes
+            )
+        else:
+            await self._acheck_active(context, "send")
+            if store_result:
+                handle = await self._astore_operand(context, client, [result])
+                response_md, messages = self._handle_response(
+                    message_type, handle, version
+                )
+            else:
+                response_md, messages = self._encode_response(
+                    context,
+                    *self._build_response(
+                        message_type,
+                        key,
+                        result,
+                        version=version,
+                        shared_memory=shared_memory,
+                        frames=is_raw(context),
+                        chunk_size=chunk_size,
+                    ),
+                    result.nbytes,
+                )
+
+        await context.send_initial_metadata(response_md)
+        for message in messages:
+            yield message
+
+    async def _aget(
+        self,
+        message_type: str,
+        request_iterator,
+        md: dict,
+        fold=None,
+        hasher=None,
+        client=None,
+        context=None,
+        admit=None,
+        pins=None,
+    ):
+        """Process an asynchronous stream of vector or matrix messages.
 
         Parameters
         ----------
-        context : grpc.ServicerContext
-            gRPC context.
-        args : np.ndarray
-            Variable size of np.arrays to transmit.
+        message_type : str
+            Type of message being received. Options are ``vectors`` and ``matrices``.
+        request_iterator : async iterator
+            Iterator to the received request messages.
+        md : dict
+            Metadata provided by the client.
+        fold : callable, optional
+            Function used to fold each chunk into the reduction of the operands. See
+            ``_ChunkAssembler``. The default is ``None``.
+        hasher : hashlib.blake2b, optional
+            Hash object to update with the content of the operands. The default is ``None``.
+        client : str, optional
+            Identifier of the client, owner of the handles of stored operands. The
+            default is ``None``.
+        context : grpc.aio.ServicerContext, optional
+            gRPC-specific information. If provided, the call is aborted as soon as the
+            client no longer waits for it. The default is ``None``.
+        admit : callable, optional
+            Function admitting the call, given the size of the operands. See
+            ``_ChunkAssembler``. The default is ``None``.
+        pins : contextlib.ExitStack, optional
+            Stack of the call in which the stored operands are pinned. See
+            ``_ChunkAssembler``. The default is ``None``.
 
-        Yields
-        ------
-        grpcdemo_pb2.Matrix
-            Matrix messages streamed (full or partial, depending on the metadata)
+        Returns
+        -------
+        np.type, tuple, list of np.array
+            Type of data, shape of the operands, and list of operands to process.
         """
+        # Stored operands may already be folded by the assembler... off the event loop
+        assembler = await self._aprocess(
+            functools.partial(
+                _ChunkAssembler,
+                message_type,
+                md,
+                fold,
+                hasher,
+                self.store,
+                client,
+                admit,
+                shared_memory=self._accepts_shared_memory(context, md),
+                pins=pins,
+            )
+        )
 
-        # Generate the metadata and info on the chunks
-        md, chunks = self._generate_md("matrices", "mat", *args)
+        # Read messages until all expected full messages are processed
+        if not assembler.done:
+            async for chunk in request_iterator:
+                if context is not None:
+                    await self._acheck_active(context, "receive")
+                await self._aprocess(assembler.process, chunk)
+                if assembler.done:
+                    break
 
-        # Send the initial metadata
-        context.send_initial_metadata(md)
+        if not assembler.done:
+            raise RuntimeError("Stream ended before the operand was complete.")
 
-        # Loop over all input arguments
-        for arg, matrix_chunks in zip(args, chunks):
-            # Since we are dealing with matrices, ravel it to a 1D array (avoids copy)
-            arg_as_vec = arg.ravel()
+        return assembler.dtype, assembler.size, assembler.operands
 
-            # Loop over the chunk indices
-            processed_idx = 0
-            for last_idx_chunk in matrix_chunks:
-                # Use tmp_idx in yield function and update the processed_idx afterwards
-                tmp_idx = processed_idx
-                processed_idx = last_idx_chunk
+    async def _multiply_row_panels(self, request_iterator, context):
+        """Multiply two matrices, computing the product as the left matrix arrives.
 
-                # Yield!
-                yield grpcdemo_pb2.Matrix(
-                    data_type=constants.NP_DTYPE_TO_DATATYPE[arg.dtype.type],
-                    matrix_rows=arg.shape[0],
-                    matrix_cols=arg.shape[1],
-                    matrix_as_chunk=arg_as_vec[tmp_idx:last_idx_chunk].tobytes(),
+        See ``GRPCDemoServicer._multiply_row_panels``.
+        """
+        md = self._read_client_metadata(context)
+        client = self._client_id(context, md)
+        store_result = md.get("store-result") == "true"
+        chunks = request_iterator.__aiter__()
+
+        with self.admission.ticket(
+            "MultiplyMatrices"
+        ) as ticket, contextlib.ExitStack() as pins:
+            panels = _RowPanels(
+                self._submit,
+                self._eigen,
+                stream=not store_result,
+                frames=is_raw(context),
+                chunk_size=self._chunk_size(md),
+            )
+            assembler = _ChunkAssembler(
+                "matrices",
+                md,
+                store=self.store,
+                client=client,
+                admit=ticket.admit,
+                progress=panels.progress,
+                shared_memory=self._accepts_shared_memory(context, md),
+                pins=pins,
+            )
+            try:
+                while not assembler.operands and not assembler.done:
+                    await self._acheck_active(context, "receive")
+                    chunk = await self._anext_chunk(chunks)
+                    await self._aprocess(assembler.process, chunk)
+            except OverloadedError as err:
+                await self._areject(context, err)
+
+            messages = self._arow_panel_messages(assembler, panels, chunks, context)
+
+            # Keep the product in the store (only its handle is sent)... or stream it
+            if store_result:
+                async for _ in messages:
+                    pass
+                handle = await self._astore_operand(context, client, [panels.result])
+                response_md, messages = self._handle_response(
+                    "matrices", handle, get_protocol_version(md)
+                )
+                await context.send_initial_metadata(response_md)
+                for message in messages:
+                    yield message
+                return
+
+            async for message in self._astream(
+                context, messages, assembler.operands[0].nbytes
+            ):
+                yield message
+
+    async def _arow_panel_messages(self, assembler, panels, chunks, context):
+        """Receive the rest of the left matrix, yielding the rows of the product as they are computed."""
+        while not assembler.done:
+            await self._acheck_active(context, "receive")
+            chunk = await self._anext_chunk(chunks)
+            await self._aprocess(assembler.process, chunk)
+            for message in panels.messages():
+                yield message
+
+        panels.finish(assembler.operands)
+        async for message in self._apanel_messages(panels):
+            yield message
+
+    async def _apanel_messages(self, panels):
+        """Yield the messages of a matrix product as its panels are computed."""
+        while panels.pending is not None:
+            await asyncio.wrap_future(panels.pending)
+            for message in panels.messages():
+                yield message
+
+    async def _astream(self, context, messages, nbytes: int):
+        """Send the initial metadata and the messages (produced asynchronously) of a response."""
+        # Chunk codecs are applied here, since the messages are not an iterator
+        response_md, _ = self._encode_response(context, [], iter(()), nbytes)
+        codec = dict(response_md).get("chunk-codec")
+        await context.send_initial_metadata(response_md)
+        async for message in messages:
+            yield message if codec is None else compress_message(message, codec)
+
+    async def _aprocess(self, function, *args):
+        """Run a step of a ``_ChunkAssembler`` off the event loop.
+
+        Steps may decode chunks and fold them with the Eigen library, so they are run in
+        the executor of the servicer (or in its fast lane).
+        """
+        return await asyncio.wrap_future(self._submit(0, function, *args))
+
+    async def _anext_chunk(self, chunks):
+        """Read the next message of a stream, which must not have ended."""
+        try:
+            return await chunks.__anext__()
+        except StopAsyncIteration:
+            raise RuntimeError("Stream ended before the operand was complete.")
+
+    async def _upload(self, message_type: str, request_iterator, context):
+        """Read an operand and store it, returning its handle."""
+        md = self._read_client_metadata(context)
+        client = self._client_id(context, md)
+        with contextlib.ExitStack() as pins:
+            _, _, operands = await self._aget(
+                message_type,
+                request_iterator,
+                md,
+                client=client,
+                context=context,
+                pins=pins,
+            )
+
+            return grpcdemo_pb2.Handle(
+                handle=await self._astore_operand(context, client, operands)
+            )
+
+    async def _download(self, message_type: str, request, context):
+        """Stream back a stored operand (pinned while it is sent)."""
+        with contextlib.ExitStack() as pins:
+            try:
+                operand = pins.enter_context(
+                    self._stored_operand(context, message_type, request.handle)
                 )
+            except RuntimeError as err:
+                await context.abort(grpc.StatusCode.NOT_FOUND, str(err))
+
+            client_md = self._read_client_metadata(context)
+            response_md, messages = self._encode_response(
+                context,
+                *self._build_response(
+                    message_type,
+                    None,
+                    operand,
+                    version=get_protocol_version(client_md),
+                    shared_memory=self._accepts_shared_memory(context, client_md),
+                    frames=is_raw(context),
+                    chunk_size=self._chunk_size(client_md),
+                ),
+                operand.nbytes,
+            )
+            await context.send_initial_metadata(response_md)
+            for message in messages:
+                yield message
+
+    async def _astore_operand(self, context, client: str, operands: list):
+        """Store an operand, aborting the call if the quota of the client is exceeded."""
+        if len(operands) != 1:
+            raise RuntimeError("Only a single operand can be stored at a time.")
+
+        try:
+            return self.store.put(client, operands[0])
+        except QuotaExceededError as err:
+            await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(err))
+
+    def _abandoned_status(self, context):
+        """Check whether the client no longer waits for the response of a call.
+
+        See ``GRPCDemoServicer._abandoned_status``.
+        """
+        if context.cancelled() or context.done():
+            return grpc.StatusCode.CANCELLED, "The call was cancelled by the client."
+
+        remaining = context.time_remaining()
+        if remaining is not None and remaining <= 0:
+            return grpc.StatusCode.DEADLINE_EXCEEDED, "The deadline was exceeded."
+
+        return None
+
+    async def _acheck_active(self, context, stage: str):
+        """Abort the call if its client no longer waits for the response.
+
+        See ``GRPCDemoServicer._check_active``.
+        """
+        status = self._abandoned_status(context)
+        if status is not None:
+            self._abandon(stage)
+            await context.abort(*status)
+
+    async def _areject(self, context, err: OverloadedError):
+        """Abort a call that has not been admitted, hinting when to retry it.
+
+        See ``GRPCDemoServicer._reject``.
+        """
+        context.set_trailing_metadata(
+            [("retry-after-ms", "%d" % round(1000 * err.retry_after))]
+        )
+        await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(err))
+
+    def _submit(self, cost: int, function, *args) -> futures.Future:
+        """Submit a (blocking) function to the executor of the servicer (or to its lane)."""
+        if self._executor is None:
+            return super()._submit(cost, function, *args)
+
+        return self._executor.submit(function, *args)
 
 
 # =================================================================================================
@@ -653,15 +3637,451 @@ class GRPCDemoServicer(grpcdemo_pb2_grpc.GRPCDemoServicer):
 # =================================================================================================
 
 
-def serve():
-    """Deploy the API Eigen Example server."""
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    grpcdemo_pb2_grpc.add_GRPCDemoServicer_to_server(GRPCDemoServicer(), server)
-    server.add_insecure_port("[::]:50051")
+def _addresses(address):
+    # A single address or several of them... TCP and Unix domain sockets can be mixed
+    addresses = [address] if isinstance(address, str) else list(address)
+    if not addresses:
+        raise RuntimeError("The server needs at least one address to listen on.")
+    return addresses
+
+
+def _add_ports(server, address):
+    for item in _addresses(address):
+        server.add_insecure_port(item)
+
+
+def _message_options(servicer_options: dict) -> list:
+    # Let gRPC carry messages of the maximum size announced by the servicer
+    max_message_size = servicer_options.get("max_message_size")
+    if max_message_size is None:
+        return []
+    return [
+        ("grpc.max_receive_message_length", max_message_size),
+        ("grpc.max_send_message_length", max_message_size),
+    ]
+
+
+def _handler_threads(max_workers, servicer_options: dict) -> int:
+    # Each call holds a thread while its computation is queued in its lane... so
+    # that cheap calls always find one, the heavy calls in flight are limited
+    fast_workers = servicer_options.get("fast_workers", 8)
+    heavy_workers = servicer_options.get("heavy_workers", 2)
+    if max_workers is None:
+        max_workers = fast_workers + heavy_workers
+    if servicer_options.get("max_heavy_calls") is None:
+        servicer_options["max_heavy_calls"] = max(
+            1, min(heavy_workers, max_workers - 1)
+        )
+    return max_workers
+
+
+def serve(address="[::]:50051", max_workers=None, options=None, **servicer_options):
+    """Deploy the API Eigen Example server.
+
+    The heavy calls in flight are limited (see ``max_heavy_calls``) below the number of
+    threads serving the requests, so that heavy calls cannot take all of them.
+
+    Parameters
+    ----------
+    address : str or list[str], optional
+        Address (or addresses) on which to listen. Unix domain sockets are given as
+        ``"unix:<path>"``. The default is ``"[::]:50051"``.
+    max_workers : int, optional
+        Number of threads serving the requests. The default is ``None``, in which case
+        there are as many as threads in the lanes (``fast_workers + heavy_workers``).
+    options : list[tuple], optional
+        Additional gRPC channel arguments for the server. The default is ``None``.
+    **servicer_options : dict, optional
+        Options of the servicer, such as ``cache_size``. See ``GRPCDemoServicer``.
+    """
+    max_workers = _handler_threads(max_workers, servicer_options)
+    stats = ServerStats()
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=max_workers),
+        interceptors=[StatsInterceptor(stats)],
+        options=list(options or []) + _message_options(servicer_options),
+    )
+    servicer = GRPCDemoServicer(stats=stats, **servicer_options)
+    grpcdemo_pb2_grpc.add_GRPCDemoServicer_to_server(servicer, server)
+    add_raw_servicer_to_server(servicer, server)
+    _add_ports(server, address)
     server.start()
     server.wait_for_termination()
 
 
+async def _serve_async(address, max_workers, options, servicer_options):
+    # The executor is only used for the computations... the streams are
+    # handled by the event loop. Without it, the lanes of the servicer are used.
+    executor = None
+    if max_workers is not None:
+        executor = futures.ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        stats = ServerStats()
+        server = grpc.aio.server(
+            interceptors=[AsyncStatsInterceptor(stats)],
+            options=list(options or []) + _message_options(servicer_options),
+        )
+        servicer = AsyncGRPCDemoServicer(executor, stats=stats, **servicer_options)
+        grpcdemo_pb2_grpc.add_GRPCDemoServicer_to_server(servicer, server)
+        add_raw_servicer_to_server(servicer, server)
+        _add_ports(server, address)
+        await server.start()
+        await server.wait_for_termination()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def serve_async(
+    address="[::]:50051", max_workers=None, options=None, **servicer_options
+):
+    """Deploy the API Eigen Example server using ``grpc.aio`` (asyncio).
+
+    Parameters
+    ----------
+    address : str or list[str], optional
+        Address (or addresses) on which to listen. Unix domain sockets are given as
+        ``"unix:<path>"``. The default is ``"[::]:50051"``.
+    max_workers : int, optional
+        Number of threads of a single executor used for all the computations. The
+        default is ``None``, in which case the computations are run in the fast and
+        heavy lanes of the servicer (see ``fast_workers`` and ``heavy_workers``).
+    options : list[tuple], optional
+        Additional gRPC channel arguments for the server. The default is ``None``.
+    **servicer_options : dict, optional
+        Options of the servicer, such as ``cache_size``. See ``GRPCDemoServicer``.
+    """
+    asyncio.run(_serve_async(address, max_workers, options, servicer_options))
+
+
+def _serve_worker(address, use_asyncio, servicer_options):
+    # All workers listen on the same port... the kernel balances the connections
+    options = [("grpc.so_reuseport", 1)]
+    if use_asyncio:
+        serve_async(address, options=options, **servicer_options)
+    else:
+        serve(address, options=options, **servicer_options)
+
+
+class ServerSupervisor:
+    """Deploys and supervises several API Eigen Example server processes.
+
+    Each worker process builds its own gRPC server, listening on the same port
+    thanks to the ``SO_REUSEPORT`` socket option (Linux only). Thus, requests are
+    served in parallel without being limited by the GIL of a single process.
+    Workers that die are restarted by the supervisor.
+
+    Parameters
+    ----------
+    processes : int, optional
+        Number of worker processes. The default is ``None``, in which case the
+        number of CPUs is used.
+    address : str or list[str], optional
+        Address (or addresses) on which to listen. Unix domain sockets cannot be
+        shared by several processes. The default is ``"[::]:50051"``.
+    use_asyncio : bool, optional
+        Whether the workers serve using the ``grpc.aio`` (asyncio) API. The
+        default is ``False``.
+    **servicer_options : dict, optional
+        Options of the servicer, such as ``cache_size``. See ``GRPCDemoServicer``.
+    """
+
+    def __init__(
+        self,
+        processes=None,
+        address="[::]:50051",
+        use_asyncio=False,
+        **servicer_options,
+    ):
+        """Initialize the supervisor (no worker is started yet)."""
+        if any(item.startswith("unix") for item in _addresses(address)):
+            raise RuntimeError(
+                "Unix domain sockets cannot be shared by several server processes."
+            )
+
+        self.processes = processes or os.cpu_count() or 1
+        self.address = address
+        self.use_asyncio = use_asyncio
+        self.servicer_options = servicer_options
+        self.restarts = 0
+        self.workers = []
+
+        # gRPC must not be initialized before forking... spawn fresh interpreters instead
+        self._mp_context = multiprocessing.get_context("spawn")
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Start all worker processes."""
+        self._stopped.clear()
+        self.workers = [self._start_worker() for _ in range(self.processes)]
+
+    def supervise(self, poll_interval=1.0):
+        """Restart dead worker processes until ``stop()`` is called.
+
+        Parameters
+        ----------
+        poll_interval : float, optional
+            Maximum number of seconds to wait between checks. The default is 1.
+        """
+        while not self._stopped.is_set():
+            multiprocessing.connection.wait(
+                [worker.sentinel for worker in self.workers], timeout=poll_interval
+            )
+            if self._stopped.is_set():
+                break
+
+            for idx, worker in enumerate(self.workers):
+                if not worker.is_alive():
+                    click.echo(
+                        "Server worker %d died (exit code %s)... restarting it."
+                        % (worker.pid, worker.exitcode)
+                    )
+                    self.workers[idx] = self._start_worker()
+                    self.restarts += 1
+
+    def stop(self):
+        """Stop supervising and terminate all worker processes."""
+        self._stopped.set()
+        for worker in self.workers:
+            worker.terminate()
+        for worker in self.workers:
+            worker.join()
+
+    def _start_worker(self):
+        worker = self._mp_context.Process(
+            target=_serve_worker,
+            args=(self.address, self.use_asyncio, self.servicer_options),
+            daemon=True,
+        )
+        worker.start()
+        return worker
+
+
+def serve_multiprocess(
+    processes=None, address="[::]:50051", use_asyncio=False, **servicer_options
+):
+    """Deploy the API Eigen Example server using several worker processes.
+
+    Parameters
+    ----------
+    processes : int, optional
+        Number of worker processes. The default is ``None``, in which case the
+        number of CPUs is used.
+    address : str or list[str], optional
+        Address (or addresses) on which to listen. Unix domain sockets cannot be
+        shared by several processes. The default is ``"[::]:50051"``.
+    use_asyncio : bool, optional
+        Whether the workers serve using the ``grpc.aio`` (asyncio) API. The
+        default is ``False``.
+    **servicer_options : dict, optional
+        Options of the servicer, such as ``cache_size``. See ``GRPCDemoServicer``.
+    """
+    supervisor = ServerSupervisor(processes, address, use_asyncio, **servicer_options)
+    supervisor.start()
+    try:
+        supervisor.supervise()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        supervisor.stop()
+
+
+@click.command()
+@click.option(
+    "--asyncio",
+    "use_asyncio",
+    is_flag=True,
+    default=False,
+    help="Serve using the grpc.aio (asyncio) API.",
+)
+@click.option(
+    "--processes",
+    type=int,
+    default=1,
+    show_default=True,
+    help="Number of server processes sharing the port (0 for one per CPU).",
+)
+@click.option(
+    "--address",
+    "addresses",
+    multiple=True,
+    default=["[::]:50051"],
+    show_default=True,
+    help="Address on which to listen, such as unix:/tmp/api-eigen.sock (repeatable).",
+)
+@click.option(
+    "--cache-size",
+    type=int,
+    default=0,
+    show_default=True,
+    help="Maximum bytes of responses kept in the result cache (0 disables it).",
+)
+@click.option(
+    "--store-quota",
+    type=int,
+    default=1024**3,
+    show_default=True,
+    help="Maximum bytes of operands stored per client.",
+)
+@click.option(
+    "--store-ttl",
+    type=float,
+    default=600.0,
+    show_default=True,
+    help="Seconds after which an unused stored operand expires.",
+)
+@click.option(
+    "--store-capacity",
+    type=int,
+    default=4 * 1024**3,
+    show_default=True,
+    help="Maximum bytes of operands stored for all clients.",
+)
+@click.option(
+    "--shared-memory",
+    is_flag=True,
+    default=False,
+    help="Let local clients exchange operands and results through shared memory.",
+)
+@click.option(
+    "--store-budget",
+    type=int,
+    default=None,
+    help="Maximum bytes of stored operands kept in memory (the rest is spilled to disk).",
+)
+@click.option(
+    "--spill-dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Directory in which stored operands are spilled (default: system temporary one).",
+)
+@click.option(
+    "--admission-budget",
+    type=int,
+    default=DEFAULT_BUDGET,
+    show_default=True,
+    help="Maximum estimated cost of the calls in flight (0 admits all calls).",
+)
+@click.option(
+    "--heavy-threshold",
+    type=int,
+    default=HEAVY_THRESHOLD,
+    show_default=True,
+    help="Estimated cost from which computations are run in the heavy lane.",
+)
+@click.option(
+    "--fast-workers",
+    type=int,
+    default=8,
+    show_default=True,
+    help="Number of threads of the fast lane.",
+)
+@click.option(
+    "--heavy-workers",
+    type=int,
+    default=2,
+    show_default=True,
+    help="Number of threads of the heavy lane.",
+)
+@click.option(
+    "--max-heavy-calls",
+    type=int,
+    default=None,
+    help="Maximum heavy calls in flight (default: --heavy-workers, unless --asyncio).",
+)
+@click.option(
+    "--batch-window-us",
+    type=float,
+    default=0.0,
+    show_default=True,
+    help="Microseconds during which small multiplications wait to be batched (0 disables it).",
+)
+@click.option(
+    "--max-batch-size",
+    type=int,
+    default=64,
+    show_default=True,
+    help="Maximum number of multiplications per batch.",
+)
+@click.option(
+    "--coalesce",
+    is_flag=True,
+    default=False,
+    help="Let identical requests in flight wait for a single computation.",
+)
+@click.option(
+    "--compute-processes",
+    type=int,
+    default=0,
+    show_default=True,
+    help="Number of worker processes running the heavy computations (0 to use threads).",
+)
+@click.option(
+    "--max-message-size",
+    type=int,
+    default=None,
+    help="Maximum bytes of the messages received and sent (gRPC default: 4 MB).",
+)
+@click.option(
+    "--chunk-size",
+    type=int,
+    default=None,
+    help="Preferred maximum bytes of the chunks (default: the largest that fit in messages).",
+)
+def main(
+    use_asyncio,
+    processes,
+    addresses,
+    cache_size,
+    store_quota,
+    store_ttl,
+    store_capacity,
+    admission_budget,
+    heavy_threshold,
+    fast_workers,
+    heavy_workers,
+    max_heavy_calls,
+    batch_window_us,
+    max_batch_size,
+    coalesce,
+    compute_processes,
+    max_message_size,
+    chunk_size,
+    shared_memory,
+    store_budget,
+    spill_dir,
+):
+    """Deploy the API Eigen Example server."""
+    servicer_options = {
+        "cache_size": cache_size,
+        "store_quota": store_quota,
+        "store_ttl": store_ttl,
+        "store_capacity": store_capacity,
+        "admission_budget": admission_budget,
+        "heavy_threshold": heavy_threshold,
+        "fast_workers": fast_workers,
+        "heavy_workers": heavy_workers,
+        "max_heavy_calls": max_heavy_calls,
+        "batch_window": batch_window_us * 1e-6,
+        "max_batch_size": max_batch_size,
+        "coalesce": coalesce,
+        "compute_processes": compute_processes,
+        "max_message_size": max_message_size,
+        "chunk_size": chunk_size,
+        "store_budget": store_budget,
+        "spill_dir": spill_dir,
+        "shared_memory": shared_memory,
+    }
+    if processes != 1:
+        serve_multiprocess(
+            processes or None, addresses, use_asyncio=use_asyncio, **servicer_options
+        )
+    elif use_asyncio:
+        serve_async(addresses, **servicer_options)
+    else:
+        serve(addresses, **servicer_options)
+
+
 if __name__ == "__main__":
     logging.basicConfig()
-    serve()
+    main()
@@ -0,0 +1,351 @@
+# Copyright (C) 2023 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Python implementation of the shared memory transport of both gRPC server and client.
+
+Clients on the same host as the server can exchange the operands and results through
+POSIX shared memory segments, instead of streaming them as chunks. Only the segment
+(name, offset and size) of each operand is sent in the manifest (see version 2 of the
+streaming protocol), which is described by its data type, shape and layout as usual.
+
+Segments are owned by whoever reads them last: the client releases the segment of
+its operands once the call has finished, and the server hands the segments of the
+results over to the client, which releases them once read. Operands are mapped by
+the server without copying them.
+
+Only segments created by this module (whose name starts with ``SEGMENT_PREFIX``) are
+opened, so that peers cannot make the server map any other segment of the host.
+"""
+
+import ctypes
+from multiprocessing import resource_tracker, shared_memory
+import secrets
+
+import numpy as np
+
+import ansys.eigen.python.grpc.constants as constants
+import ansys.eigen.python.grpc.generated.grpcdemo_pb2 as grpcdemo_pb2
+
+ALIGNMENT = 64
+"""Alignment (in bytes) of the operands within a segment."""
+
+SEGMENT_PREFIX = "api-eigen-"
+"""Prefix of the names of the segments created (and accepted) by this module."""
+
+# Segments created (and tracked) by this process... opening them again in this process
+# must not untrack them, since the resource tracker does not count references
+_created = set()
+
+
+class _MappedSegment:
+    """Keeps a segment mapped while the arrays viewing it are alive.
+
+    The arrays are built from the address of the segment (and not from its buffer),
+    so that the segment can be closed whenever the last of them is released.
+    """
+
+    def __init__(self, segment, offset, dtype, count):
+        self._segment = segment
+        view = ctypes.c_char.from_buffer(segment.buf)
+        address = ctypes.addressof(view)
+        del view
+
+        self.__array_interface__ = {
+            "version": 3,
+            "data": (address + offset, True),
+            "shape": (count,),
+            "typestr": np.dtype(dtype).str,
+        }
+
+
+def _untrack(segment):
+    # The segment is owned by another process... do not unlink it at exit
+    if segment._name in _created:
+        return
+    resource_tracker.unregister(segment._name, "shared_memory")
+
+
+def _check_name(name: str):
+    if not name.startswith(SEGMENT_PREFIX) or "/" in name:
+        raise RuntimeError("Invalid shared memory segment name: %s" % name)
+
+
+def _create(nbytes, name=None):
+    shm = shared_memory.SharedMemory(
+        name=name or segment_name(), create=True, size=max(nbytes, 1)
+    )
+    _created.add(shm._name)
+    return shm
+
+
+def _unlink(shm):
+    shm.unlink()
+    _created.discard(shm._name)
+
+
+def _open(segment: grpcdemo_pb2.SharedSegment, dtype, shape, untrack=True):
+    # Open a segment, checking that it holds the expected operand... it is only tracked
+    # if it is to be unlinked by this process
+    _check_name(segment.name)
+
+    count = int(np.prod(shape))
+    nbytes = count * np.dtype(dtype).itemsize
+    if segment.nbytes != nbytes:
+        raise RuntimeError(
+            "Shared memory segment %s holds %d bytes, while %d bytes were expected."
+            % (segment.name, segment.nbytes, nbytes)
+        )
+
+    shm = shared_memory.SharedMemory(name=segment.name)
+    if untrack:
+        _untrack(shm)
+    if segment.offset < 0 or segment.offset + nbytes > shm.size:
+        shm.close()
+        if not untrack:
+            _untrack(shm)
+        raise RuntimeError("Out of bounds shared memory segment: %s" % segment.name)
+
+    return shm, count
+
+
+def segment_name() -> str:
+    """Return a new name for a shared memory segment.
+
+    Returns
+    -------
+    str
+        Random name, starting with ``SEGMENT_PREFIX``.
+    """
+    return SEGMENT_PREFIX + secrets.token_hex(12)
+
+
+def share(arrays: list, name: str = None):
+    """Copy arrays into a new shared memory segment.
+
+    Parameters
+    ----------
+    arrays : list[np.ndarray]
+        Arrays to copy. Each of them is copied in its memory order.
+    name : str, optional
+        Name of the segment (see ``segment_name``). The default is ``None``, in which
+        case a new name is used.
+
+    Returns
+    -------
+    multiprocessing.shared_memory.SharedMemory, list[grpcdemo_pb2.SharedSegment]
+        New segment, which is to be released by the caller (see ``release``), and the
+        region of each array.
+    """
+    offsets = []
+    nbytes = 0
+    for array in arrays:
+        offsets.append(nbytes)
+        nbytes += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+    shm = _create(nbytes, name)
+    regions = []
+    for array, offset in zip(arrays, offsets):
+        order = constants.memory_order(array)
+        region = np.ndarray(
+            (array.size,), dtype=array.dtype, buffer=shm.buf, offset=offset
+        )
+        region[:] = array.ravel(order=order)
+        del region
+        regions.append(
+            grpcdemo_pb2.SharedSegment(
+                name=shm.name, offset=offset, nbytes=array.nbytes
+            )
+        )
+
+    return shm, regions
+
+
+def export(array: np.ndarray, name: str = None) -> grpcdemo_pb2.SharedSegment:
+    """Copy an array into a new shared memory segment, owned by the receiver.
+
+    Parameters
+    ----------
+    array : np.ndarray
+        Array to copy, in its memory order.
+    name : str, optional
+        Name of the segment, chosen by the receiver so that it can release the segment
+        even if it is never handed over (see ``discard``). The default is ``None``, in
+        which case a new name is used.
+
+    Returns
+    -------
+    grpcdemo_pb2.SharedSegment
+        Region of the array, which is to be released by the receiver (see ``take``).
+    """
+    shm, regions = share([array], name)
+    _created.discard(shm._name)
+    _untrack(shm)
+    shm.close()
+    return regions[0]
+
+
+def attach(
+    segment: grpcdemo_pb2.SharedSegment,
+    dtype,
+    shape: tuple,
+    order: str = "C",
+    untrack: bool = True,
+) -> np.ndarray:
+    """Map an operand held in a shared memory segment (without copying it).
+
+    Parameters
+    ----------
+    segment : grpcdemo_pb2.SharedSegment
+        Region of the operand.
+    dtype : np.type
+        Data type of the operand.
+    shape : tuple
+        Shape of the operand.
+    order : str, optional
+        Memory order of the operand. The default is ``"C"``.
+    untrack : bool, optional
+        Whether to untrack the segment, which is owned by another process. The default
+        is ``True``. Child processes (which share the resource tracker of their parent)
+        must not untrack the segments owned by their parent.
+
+    Returns
+    -------
+    np.ndarray
+        Operand (read-only). The segment remains mapped while it is alive.
+
+    Raises
+    ------
+    RuntimeError
+        In case the region does not hold the operand.
+    """
+    shm, count = _open(segment, dtype, shape, untrack=untrack)
+    flat = np.asarray(_MappedSegment(shm, segment.offset, dtype, count))
+    return np.reshape(flat, shape, order=order)
+
+
+def adopt(
+    segment: grpcdemo_pb2.SharedSegment, dtype, shape: tuple, order: str = "C"
+) -> np.ndarray:
+    """Map an operand handed over in a shared memory segment, releasing the segment.
+
+    Unlike ``take``, the operand is not copied: the segment is unlinked right away,
+    but it remains mapped while the operand is alive.
+
+    Parameters
+    ----------
+    segment : grpcdemo_pb2.SharedSegment
+        Region of the operand (see ``export``).
+    dtype : np.type
+        Data type of the operand.
+    shape : tuple
+        Shape of the operand.
+    order : str, optional
+        Memory order of the operand. The default is ``"C"``.
+
+    Returns
+    -------
+    np.ndarray
+        Operand (read-only).
+
+    Raises
+    ------
+    RuntimeError
+        In case the region does not hold the operand.
+    """
+    shm, count = _open(segment, dtype, shape, untrack=False)
+    try:
+        flat = np.asarray(_MappedSegment(shm, segment.offset, dtype, count))
+    finally:
+        _unlink(shm)
+    return np.reshape(flat, shape, order=order)
+
+
+def take(
+    segment: grpcdemo_pb2.SharedSegment, dtype, shape: tuple, order: str = "C"
+) -> np.ndarray:
+    """Copy an operand out of a shared memory segment, releasing the segment.
+
+    Parameters
+    ----------
+    segment : grpcdemo_pb2.SharedSegment
+        Region of the operand.
+    dtype : np.type
+        Data type of the operand.
+    shape : tuple
+        Shape of the operand.
+    order : str, optional
+        Memory order of the operand. The default is ``"C"``.
+
+    Returns
+    -------
+    np.ndarray
+        Copy of the operand.
+
+    Raises
+    ------
+    RuntimeError
+        In case the region does not hold the operand.
+    """
+    shm, count = _open(segment, dtype, shape, untrack=False)
+    try:
+        region = np.ndarray(
+            (count,), dtype=dtype, buffer=shm.buf, offset=segment.offset
+        )
+        result = region.copy()
+        del region
+    finally:
+        shm.close()
+        _unlink(shm)
+
+    return np.reshape(result, shape, order=order)
+
+
+def discard(name: str):
+    """Release a shared memory segment that was to be handed over, if it exists.
+
+    For example, the segment of a result exported by a process that failed before
+    handing it over.
+
+    Parameters
+    ----------
+    name : str
+        Name of the segment (see ``export``).
+    """
+    _check_name(name)
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    _unlink(shm)
+
+
+def release(shm: shared_memory.SharedMemory):
+    """Release a shared memory segment created by ``share``.
+
+    Parameters
+    ----------
+    shm : multiprocessing.shared_memory.SharedMemory
+        Segment to release.
+    """
+    shm.close()
+    _unlink(shm)
@@ -0,0 +1,412 @@
+# Copyright (C) 2023 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Python implementation of the statistics collected by the gRPC API Eigen Example server."""
+
+import bisect
+import threading
+import time
+
+import grpc
+
+from ansys.eigen.python.grpc.constants import HUMAN_SIZES
+
+HISTOGRAM_BOUNDS = [1e-6 * 2 ** (i / 4) for i in range(4 * 28)]
+"""Upper bounds (in seconds) of the latency histogram buckets: from 1 us to ~4 min, in 2^(1/4) steps."""
+
+PHASES = ["wall", "deserialize", "compute", "serialize"]
+"""Phases of an RPC whose latency is recorded."""
+
+
+def size_bucket(nbytes: int) -> str:
+    """Return the (power of two) size bucket of a request.
+
+    Parameters
+    ----------
+    nbytes : int
+        Number of bytes of the request.
+
+    Returns
+    -------
+    str
+        Size bucket in human-readable format. For example, ``"<=4MB"``.
+    """
+    power = max(nbytes - 1, 0).bit_length()
+    idx = min(power // 10, len(HUMAN_SIZES) - 1)
+    return "<=%d%s" % (2 ** (power - 10 * idx), HUMAN_SIZES[idx])
+
+
+class LatencyHistogram:
+    """Provides a histogram of latencies with logarithmic buckets.
+
+    See ``HISTOGRAM_BOUNDS`` for the buckets used. Percentiles are estimated
+    with the upper bound of the bucket they fall in (that is, with an error
+    below 19%).
+    """
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.counts = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, seconds: float):
+        """Record a latency.
+
+        Parameters
+        ----------
+        seconds : float
+            Latency to record.
+        """
+        self.counts[bisect.bisect_left(HISTOGRAM_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, q: float) -> float:
+        """Estimate a percentile of the recorded latencies.
+
+        Parameters
+        ----------
+        q : float
+            Percentile to estimate, between 0 and 100.
+
+        Returns
+        -------
+        float
+            Estimated latency (in seconds). If nothing was recorded, 0 is returned.
+        """
+        if self.count == 0:
+            return 0.0
+
+        target = max(1, q / 100.0 * self.count)
+        cumulative = 0
+        for idx, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target:
+                break
+
+        return HISTOGRAM_BOUNDS[min(idx, len(HISTOGRAM_BOUNDS) - 1)]
+
+
+class _CallRecord:
+    """Byte counters and phase timings of a single call."""
+
+    def __init__(self):
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.request_chunks = 0
+        self.response_chunks = 0
+        self.deserialize = 0.0
+        self.serialize = 0.0
+
+
+class _MethodStats:
+    """Aggregated statistics of a method (for a given size bucket)."""
+
+    def __init__(self):
+        self.calls = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.request_chunks = 0
+        self.response_chunks = 0
+        self.histograms = {phase: LatencyHistogram() for phase in PHASES}
+
+
+class ServerStats:
+    """Provides the statistics of the RPCs served, per method and request size bucket.
+
+    For every method and size bucket, the number of calls, the request and response
+    bytes and chunks, and the latency histograms of the call phases (see ``PHASES``)
+    are recorded. The ``compute`` phase is the wall time minus the time spent
+    deserializing and serializing messages... which also includes the time spent
+    waiting for the client to stream its messages.
+    """
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self._methods = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, call: _CallRecord, wall: float):
+        """Record a finished call.
+
+        Parameters
+        ----------
+        method : str
+            Full name of the method called.
+        call : _CallRecord
+            Counters and timings of the call.
+        wall : float
+            Wall time (in seconds) of the call.
+        """
+        compute = max(wall - call.deserialize - call.serialize, 0.0)
+        key = (method, size_bucket(call.request_bytes))
+
+        with self._lock:
+            stats = self._methods.get(key)
+            if stats is None:
+                stats = self._methods[key] = _MethodStats()
+
+            stats.calls += 1
+            stats.request_bytes += call.request_bytes
+            stats.response_bytes += call.response_bytes
+            stats.request_chunks += call.request_chunks
+            stats.response_chunks += call.response_chunks
+            stats.histograms["wall"].record(wall)
+            stats.histograms["deserialize"].record(call.deserialize)
+            stats.histograms["compute"].record(compute)
+            stats.histograms["serialize"].record(call.serialize)
+
+    def report(self) -> str:
+        """Return the statistics in text format.
+
+        Each line contains the statistics of a method and size bucket as
+        ``key=value`` pairs. Latencies are given in milliseconds.
+
+        Returns
+        -------
+        str
+            Statistics report.
+        """
+        lines = []
+        with self._lock:
+            for (method, bucket), stats in sorted(self._methods.items()):
+                fields = [
+                    "method=%s" % method,
+                    "size=%s" % bucket,
+                    "calls=%d" % stats.calls,
+                    "request_bytes=%d" % stats.request_bytes,
+                    "response_bytes=%d" % stats.response_bytes,
+                    "request_chunks=%d" % stats.request_chunks,
+                    "response_chunks=%d" % stats.response_chunks,
+                ]
+                for phase in PHASES:
+                    histogram = stats.histograms[phase]
+                    for q in (50, 99):
+                        fields.append(
+                            "%s_p%d_ms=%.3f" % (phase, q, 1e3 * histogram.percentile(q))
+                        )
+                lines.append(" ".join(fields))
+
+        return "\n".join(lines)
+
+    # =================================================================================================
+    # Wrapping of the RPC method handlers
+    # =================================================================================================
+
+    def wrap_handler(self, method: str, handler, asynchronous: bool = False):
+        """Wrap an RPC method handler so that its calls are recorded.
+
+        The wrapped handler receives and sends the serialized messages, which are
+        (de)serialized by the wrapping behavior itself. Thus, the time spent in
+        each phase can be attributed to the call, whichever thread gRPC uses for
+        reading the messages.
+
+        Parameters
+        ----------
+        method : str
+            Full name of the method.
+        handler : grpc.RpcMethodHandler
+            Handler to wrap.
+        asynchronous : bool, optional
+            Whether the handler behaviors are coroutines (``grpc.aio``). The
+            default is ``False``.
+
+        Returns
+        -------
+        grpc.RpcMethodHandler
+            Wrapped handler.
+        """
+        if handler.request_streaming and handler.response_streaming:
+            behavior, factory = (
+                handler.stream_stream,
+                grpc.stream_stream_rpc_method_handler,
+            )
+        elif handler.request_streaming:
+            behavior, factory = (
+                handler.stream_unary,
+                grpc.stream_unary_rpc_method_handler,
+            )
+        elif handler.response_streaming:
+            behavior, factory = (
+                handler.unary_stream,
+                grpc.unary_stream_rpc_method_handler,
+            )
+        else:
+            behavior, factory = handler.unary_unary, grpc.unary_unary_rpc_method_handler
+
+        wrap = _wrap_async_behavior if asynchronous else _wrap_behavior
+        return factory(wrap(self, method, behavior, handler))
+
+
+class _CallRecorder:
+    """Provides the (de)serialization of the messages of a call, recording it."""
+
+    def __init__(self, stats: ServerStats, method: str, handler):
+        self.stats = stats
+        self.method = method
+        self.call = _CallRecord()
+        self.start = time.perf_counter()
+        self._deserializer = handler.request_deserializer
+        self._serializer = handler.response_serializer
+
+    def deserialize(self, serialized):
+        start = time.perf_counter()
+        message = self._deserializer(serialized) if self._deserializer else serialized
+        self.call.deserialize += time.perf_counter() - start
+        self.call.request_bytes += len(serialized)
+        self.call.request_chunks += 1
+        return message
+
+    def serialize(self, message):
+        start = time.perf_counter()
+        serialized = self._serializer(message) if self._serializer else message
+        self.call.serialize += time.perf_counter() - start
+        self.call.response_bytes += len(serialized)
+        self.call.response_chunks += 1
+        return serialized
+
+    def finish(self):
+        self.stats.record(self.method, self.call, time.perf_counter() - self.start)
+
+
+def _wrap_behavior(stats, method, behavior, handler):
+    def request(recorder, serialized):
+        if not handler.request_streaming:
+            return recorder.deserialize(serialized)
+        return (recorder.deserialize(chunk) for chunk in serialized)
+
+    def wrapped(serialized, context):
+        recorder = _CallRecorder(stats, method, handler)
+        try:
+            return recorder.serialize(behavior(request(recorder, serialized), context))
+        finally:
+            recorder.finish()
+
+    def wrapped_streaming(serialized, context):
+        recorder = _CallRecorder(stats, method, handler)
+        try:
+            for response in behavior(request(recorder, serialized), context):
+                yield recorder.serialize(response)
+        finally:
+            recorder.finish()
+
+    return wrapped_streaming if handler.response_streaming else wrapped
+
+
+def _wrap_async_behavior(stats, method, behavior, handler):
+    async def request_iterator(recorder, serialized):
+        async for chunk in serialized:
+            yield recorder.deserialize(chunk)
+
+    def request(recorder, serialized):
+        if not handler.request_streaming:
+            return recorder.deserialize(serialized)
+        return request_iterator(recorder, serialized)
+
+    async def wrapped(serialized, context):
+        recorder = _CallRecorder(stats, method, handler)
+        try:
+            response = await behavior(request(recorder, serialized), context)
+            return recorder.serialize(response)
+        finally:
+            recorder.finish()
+
+    async def wrapped_streaming(serialized, context):
+        recorder = _CallRecorder(stats, method, handler)
+        try:
+            async for response in behavior(request(recorder, serialized), context):
+                yield recorder.serialize(response)
+        finally:
+            recorder.finish()
+
+    return wrapped_streaming if handler.response_streaming else wrapped
+
+
+class StatsInterceptor(grpc.ServerInterceptor):
+    """Provides a server interceptor that records the statistics of every RPC.
+
+    Parameters
+    ----------
+    stats : ServerStats
+        Statistics in which to record the RPCs.
+    """
+
+    def __init__(self, stats: ServerStats):
+        """Initialize the interceptor."""
+        self.stats = stats
+
+    def intercept_service(self, continuation, handler_call_details):
+        """Wrap the handler of the RPC so that its call is recorded.
+
+        Parameters
+        ----------
+        continuation : callable
+            Function returning the handler of the RPC.
+        handler_call_details : grpc.HandlerCallDetails
+            Details of the RPC.
+
+        Returns
+        -------
+        grpc.RpcMethodHandler
+            Wrapped handler.
+        """
+        handler = continuation(handler_call_details)
+        if handler is None:
+            return None
+        return self.stats.wrap_handler(handler_call_details.method, handler)
+
+
+class AsyncStatsInterceptor(grpc.aio.ServerInterceptor):
+    """Provides a ``grpc.aio`` server interceptor that records the statistics of every RPC.
+
+    Parameters
+    ----------
+    stats : ServerStats
+        Statistics in which to record the RPCs.
+    """
+
+    def __init__(self, stats: ServerStats):
+        """Initialize the interceptor."""
+        self.stats = stats
+
+    async def intercept_service(self, continuation, handler_call_details):
+        """Wrap the handler of the RPC so that its call is recorded.
+
+        Parameters
+        ----------
+        continuation : callable
+            Coroutine returning the handler of the RPC.
+        handler_call_details : grpc.HandlerCallDetails
+            Details of the RPC.
+
+        Returns
+        -------
+        grpc.RpcMethodHandler
+            Wrapped handler.
+        """
+        handler = await continuation(handler_call_details)
+        if handler is None:
+            return None
+        return self.stats.wrap_handler(
+            handler_call_details.method, handler, asynchronous=True
+        )
@@ -0,0 +1,412 @@
+# Copyright (C) 2023 - 2026 Synopsys, Inc. and ANSYS, Inc. All rights reserved.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Python implementation of the operand store of the gRPC API Eigen Example server.
+
+The store may be given a budget of the bytes it keeps in memory. Once exceeded, the
+least recently used operands are spilled to ``.npy`` files in a scratch directory,
+which are memory-mapped back (lazily) when the operands are used again. Operands in
+use by calls in flight are pinned (see ``OperandStore.pin``), so they are not spilled
+until they are unpinned. The files are written without holding the lock of the store,
+so that the rest of the calls do not wait for them.
+"""
+
+from collections import OrderedDict
+from concurrent import futures
+import contextlib
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+import numpy as np
+
+
+class QuotaExceededError(RuntimeError):
+    """Raised when storing an operand would exceed the quota of a client, or the
+    capacity of the store."""
+
+
+class _StoredOperand:
+    """Operand stored on behalf of a client."""
+
+    def __init__(self, client, array, expires):
+        self.client = client
+        self.array = array
+        self.nbytes = array.nbytes
+        self.expires = expires
+
+        # Number of calls using the operand
+        self.pins = 0
+
+        # File holding the operand, once spilled (its array is then mapped lazily)
+        self.path = None
+
+        # Whether the operand is being written to its file
+        self.spilling = False
+
+
+class OperandStore:
+    """Provides the storage of operands (and results) referenced by handles.
+
+    Operands are stored on behalf of a client, which is the only one allowed to use
+    their handle. Each client has a quota of stored bytes, all of them share the
+    capacity of the store, and operands that are not used for ``ttl`` seconds expire.
+
+    Handles are prefixed by ``vec-`` or ``mat-``, depending on whether the operand
+    is a vector or a matrix.
+
+    Parameters
+    ----------
+    quota : int
+        Maximum amount of bytes stored per client.
+    ttl : float
+        Number of seconds after which an unused operand expires.
+    memory_budget : int, optional
+        Maximum amount of bytes kept in memory (for all clients). Least recently used
+        operands exceeding it are spilled to disk, unless they are pinned (pinned ones
+        are spilled in the background once unpinned). The default is ``None``, in which
+        case all operands are kept in memory.
+    spill_dir : str, optional
+        Directory in which the scratch directory of the spilled operands is created.
+        The default is ``None``, in which case the temporary directory of the system is
+        used.
+    capacity : int, optional
+        Maximum amount of bytes stored (for all clients, in memory or spilled to disk).
+        Since clients identify themselves, it bounds the store even if they do so under
+        several identities. The default is ``None``, in which case only the quota of
+        each client applies.
+    """
+
+    def __init__(
+        self,
+        quota: int,
+        ttl: float,
+        memory_budget: int = None,
+        spill_dir: str = None,
+        capacity: int = None,
+    ):
+        """Initialize an empty store."""
+        self.quota = quota
+        self.ttl = ttl
+        self.capacity = capacity
+        self.memory_budget = memory_budget
+        self.spill_dir = spill_dir
+        self.nbytes = 0
+        self.resident = 0
+        self._spilling = 0
+        self._usage = {}
+        self._scratch = None
+
+        # Spills of the operands unpinned while the budget is exceeded
+        self._spiller = None
+        self._spill_scheduled = False
+        if memory_budget is not None:
+            self._spiller = futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="store-spill"
+            )
+
+        # Sorted by last use (and thus by expiration time)
+        self._entries = OrderedDict()
+
+        self._lock = threading.Lock()
+
+    def put(self, client: str, array: np.ndarray) -> str:
+        """Store an operand.
+
+        Operands exceeding the memory budget are written to disk in the calling thread
+        (without holding the lock of the store).
+
+        Parameters
+        ----------
+        client : str
+            Identifier of the client storing the operand.
+        array : np.ndarray
+            Operand to store. It is made read-only (and contiguous, copying it if needed...
+            column-major operands are kept as such).
+
+        Returns
+        -------
+        str
+            Handle of the stored operand.
+
+        Raises
+        ------
+        QuotaExceededError
+            In case the operand does not fit in the quota of the client, or in the
+            capacity of the store.
+        """
+        if not (array.flags.c_contiguous or array.flags.f_contiguous):
+            array = np.ascontiguousarray(array)
+        array.flags.writeable = False
+        handle = ("vec-" if array.ndim == 1 else "mat-") + uuid.uuid4().hex
+
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+
+            usage = self._usage.get(client, 0)
+            if usage + array.nbytes > self.quota:
+                raise QuotaExceededError(
+                    "Storing %d bytes exceeds the quota of the client (%d of %d bytes used)."
+                    % (array.nbytes, usage, self.quota)
+                )
+            if self.capacity is not None and self.nbytes + array.nbytes > self.capacity:
+                raise QuotaExceededError(
+                    "Storing %d bytes exceeds the capacity of the store (%d of %d bytes "
+                    "used)." % (array.nbytes, self.nbytes, self.capacity)
+                )
+
+            self._entries[handle] = _StoredOperand(client, array, now + self.ttl)
+            self._usage[client] = usage + array.nbytes
+            self.nbytes += array.nbytes
+            self.resident += array.nbytes
+
+        self._spill()
+        return handle
+
+    @contextlib.contextmanager
+    def pin(self, client: str, handle: str):
+        """Retrieve a stored operand, pinning it while it is used.
+
+        Pinned operands are not spilled to disk (which would not free their memory).
+        The lifetime of the operand is extended.
+
+        Parameters
+        ----------
+        client : str
+            Identifier of the client requesting the operand.
+        handle : str
+            Handle of the operand.
+
+        Yields
+        ------
+        np.ndarray
+            Stored operand (read-only). Spilled operands are mapped from their file.
+
+        Raises
+        ------
+        RuntimeError
+            In case the handle is unknown (or expired) for the client.
+        """
+        entry, array = self._pin(client, handle)
+        try:
+            yield array
+        finally:
+            self._unpin(entry)
+
+    def _pin(self, client: str, handle: str):
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+
+            entry = self._entries.get(handle)
+            if entry is None or entry.client != client:
+                raise RuntimeError("Unknown (or expired) operand handle: %s" % handle)
+
+            entry.expires = now + self.ttl
+            self._entries.move_to_end(handle)
+
+            # Spilled operands are mapped back on their first use (the kernel pages
+            # them in and out, without counting them towards the budget)
+            if entry.array is None:
+                entry.array = np.load(entry.path, mmap_mode="r")
+
+            entry.pins += 1
+            return entry, entry.array
+
+    def release(self, client: str, handle: str) -> bool:
+        """Release a stored operand.
+
+        Parameters
+        ----------
+        client : str
+            Identifier of the client releasing the operand.
+        handle : str
+            Handle of the operand.
+
+        Returns
+        -------
+        bool
+            Whether the operand was stored (and has been released).
+        """
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is None or entry.client != client:
+                return False
+
+            self._remove(handle)
+            return True
+
+    def usage(self, client: str) -> int:
+        """Return the amount of bytes stored by a client.
+
+        Parameters
+        ----------
+        client : str
+            Identifier of the client.
+
+        Returns
+        -------
+        int
+            Bytes stored by the client (in memory or spilled to disk).
+        """
+        with self._lock:
+            self._expire(time.monotonic())
+            return self._usage.get(client, 0)
+
+    def __len__(self):
+        """Return the number of operands stored."""
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """Return the counters of the store.
+
+        Returns
+        -------
+        dict
+            Operands, bytes and clients stored, bytes kept in memory, and operands
+            spilled to disk and pinned.
+        """
+        with self._lock:
+            self._expire(time.monotonic())
+            return {
+                "entries": len(self._entries),
+                "nbytes": self.nbytes,
+                "clients": len(self._usage),
+                "resident": self.resident,
+                "spilled": sum(
+                    entry.path is not None for entry in self._entries.values()
+                ),
+                "pinned": sum(entry.pins > 0 for entry in self._entries.values()),
+            }
+
+    def close(self):
+        """Release all the operands, removing the scratch directory (if any)."""
+        with self._lock:
+            spiller, self._spiller = self._spiller, None
+        if spiller is not None:
+            spiller.shutdown()
+
+        with self._lock:
+            while self._entries:
+                self._remove(next(iter(self._entries)))
+            if self._scratch is not None:
+                self._scratch.cleanup()
+                self._scratch = None
+
+    def _expire(self, now):
+        # Entries are sorted by expiration time... stop at the first one alive
+        while self._entries:
+            handle, entry = next(iter(self._entries.items()))
+            if entry.expires > now:
+                break
+            self._remove(handle)
+
+    def _spill(self):
+        # Write the least recently used operands to disk until the budget is met. The
+        # victims are chosen (and swapped for their files) under the lock, but their
+        # files are written without it
+        if self.memory_budget is None:
+            return
+
+        with self._lock:
+            victims = self._spill_victims()
+        written = []
+        for handle, entry, path in victims:
+            try:
+                np.save(path, entry.array)
+            except OSError:
+                # Operands that cannot be written are kept in memory
+                path = None
+            written.append((handle, entry, path))
+
+        with self._lock:
+            for handle, entry, path in written:
+                entry.spilling = False
+                self._spilling -= entry.nbytes
+                if path is None:
+                    continue
+
+                # Operands released or pinned in the meantime are not swapped
+                if self._entries.get(handle) is not entry or entry.pins > 0:
+                    os.remove(path)
+                    continue
+                entry.path = path
+                entry.array = None
+                self.resident -= entry.nbytes
+
+    def _spill_victims(self) -> list:
+        # Least recently used operands exceeding the budget (besides the ones already
+        # being spilled)... pinned ones are in use, so spilling them would not free
+        # their memory
+        victims = []
+        for handle, entry in self._entries.items():
+            if self.resident - self._spilling <= self.memory_budget:
+                break
+            if entry.path is not None or entry.pins > 0 or entry.spilling:
+                continue
+
+            if self._scratch is None:
+                self._scratch = tempfile.TemporaryDirectory(
+                    prefix="api-eigen-store-", dir=self.spill_dir
+                )
+            entry.spilling = True
+            self._spilling += entry.nbytes
+            victims.append(
+                (handle, entry, os.path.join(self._scratch.name, handle + ".npy"))
+            )
+        return victims
+
+    def _unpin(self, entry):
+        # Operands kept in memory while pinned are spilled once unpinned... in the
+        # background, since calls may unpin them from an event loop
+        with self._lock:
+            entry.pins -= 1
+            schedule = (
+                entry.pins == 0
+                and self._spiller is not None
+                and not self._spill_scheduled
+                and self.resident - self._spilling > self.memory_budget
+            )
+            if schedule:
+                self._spill_scheduled = True
+                self._spiller.submit(self._scheduled_spill)
+
+    def _scheduled_spill(self):
+        with self._lock:
+            self._spill_scheduled = False
+        self._spill()
+
+    def _remove(self, handle):
+        entry = self._entries.pop(handle)
+        self.nbytes -= entry.nbytes
+        if entry.path is None:
+            self.resident -= entry.nbytes
+        else:
+            # Arrays mapping the file (if any) remain valid once it is removed
+            entry.array = None
+            os.remove(entry.path)
+        usage = self._usage.pop(entry.client, 0) - entry.nbytes
+        if usage > 0:
+            self._usage[entry.client] = usage
@@ -22,6 +22,7 @@
 
 import demo_eigen_wrapper
 import numpy as np
+import pytest
 
 
 def test_function():
@@ -63,3 +64,37 @@ def test_function():
     assert mat_3[0, 1] == 4
     assert mat_3[1, 0] == 23
     assert mat_3[1, 1] == 12
+
+
+@pytest.mark.parametrize(
+    "dtype", [np.float64, np.float32, np.int32, np.int64, np.complex128]
+)
+def test_function_dtypes(dtype):
+
+    # Testing that each data type is computed as such (no casting to float64)
+
+    array_1 = np.array([1, 2, 3, 4], dtype=dtype)
+    array_2 = np.array([5, 4, 2, 0], dtype=dtype)
+
+    array_3 = demo_eigen_wrapper.add_vectors(array_1, array_2)
+    assert array_3.dtype == dtype
+    np.testing.assert_array_equal(array_3, array_1 + array_2)
+    assert demo_eigen_wrapper.multiply_vectors(array_1, array_2) == 19
+
+    mat_1 = np.reshape(array_1, (2, 2))
+    mat_2 = np.reshape(array_2, (2, 2))
+
+    mat_3 = demo_eigen_wrapper.add_matrices(mat_1, mat_2)
+    assert mat_3.dtype == dtype
+    np.testing.assert_array_equal(mat_3, mat_1 + mat_2)
+
+    mat_3 = demo_eigen_wrapper.multiply_matrices(mat_1, mat_2)
+    assert mat_3.dtype == dtype
+    np.testing.assert_array_equal(mat_3, mat_1 @ mat_2)
+
+    # Read-only arrays (such as the ones built on top of a message) are accepted too
+
+    array_1.flags.writeable = False
+    np.testing.assert_array_equal(
+        demo_eigen_wrapper.add_vectors(array_1, array_2), array_1 + array_2
+    )
@@ -20,6 +20,11 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+from concurrent import futures
+from contextlib import contextmanager
+import time
+
+import grpc
 import numpy as np
 import pytest
 
@@ -61,6 +66,64 @@ def grpc_stub(grpc_channel):
     return GRPCDemoStub(grpc_channel)
 
 
+@pytest.fixture(scope="module")
+def grpc_aio_port():
+    """Deploy the asyncio server on a free port, running on a background event loop."""
+    import asyncio
+    import threading
+
+    from ansys.eigen.python.grpc.framing import add_raw_servicer_to_server
+    from ansys.eigen.python.grpc.generated.grpcdemo_pb2_grpc import (
+        add_GRPCDemoServicer_to_server,
+    )
+    from ansys.eigen.python.grpc.server import AsyncGRPCDemoServicer
+    from ansys.eigen.python.grpc.stats import AsyncStatsInterceptor, ServerStats
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    async def start():
+        stats = ServerStats()
+        server = grpc.aio.server(interceptors=[AsyncStatsInterceptor(stats)])
+        servicer = AsyncGRPCDemoServicer(stats=stats, shared_memory=True)
+        add_GRPCDemoServicer_to_server(servicer, server)
+        add_raw_servicer_to_server(servicer, server)
+        port = server.add_insecure_port("127.0.0.1:0")
+        await server.start()
+        return server, port
+
+    server, port = asyncio.run_coroutine_threadsafe(start(), loop).result()
+    yield port
+
+    asyncio.run_coroutine_threadsafe(server.stop(None), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+
+
+@contextmanager
+def deployed_servicer(servicer, interceptors=None, options=None, max_workers=10):
+    """Deploy the given servicer on a free port, yielding the port."""
+    from ansys.eigen.python.grpc.framing import add_raw_servicer_to_server
+    from ansys.eigen.python.grpc.generated.grpcdemo_pb2_grpc import (
+        add_GRPCDemoServicer_to_server,
+    )
+
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=max_workers),
+        interceptors=interceptors,
+        options=options,
+    )
+    add_GRPCDemoServicer_to_server(servicer, server)
+    add_raw_servicer_to_server(servicer, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    try:
+        yield port
+    finally:
+        server.stop(None)
+
+
 # ================================================================================
 # Unit tests for client-server interaction
 # ================================================================================
@@ -168,3 +231,1455 @@ def test_multiply_matrices_grpc(grpc_stub, sz):
     mat_mult = client.multiply_matrices(mat_1, mat_2)
 
     np.testing.assert_allclose(mat_mult, np.matmul(mat_1, mat_2))
+
+
+@pytest.mark.parametrize(
+    "dtype", [np.float64, np.float32, np.int32, np.int64, np.complex128]
+)
+def test_data_types_grpc(grpc_stub, dtype):
+    """Unit test to verify that all the handled data types travel and compute as such."""
+    vec_1 = np.arange(1, 1001).astype(dtype)
+    vec_2 = np.arange(1001, 1, -1).astype(dtype)
+    mat_1 = np.reshape(np.arange(1, 17), (4, 4)).astype(dtype)
+    mat_2 = np.transpose(mat_1) + 1
+
+    for version in (1, 2):
+        client = DemoGRPCClient(test=grpc_stub, protocol_version=version)
+
+        for result, expected in (
+            (client.flip_vector(vec_1), np.flip(vec_1)),
+            (client.add_vectors(vec_1, vec_2, vec_1), 2 * vec_1 + vec_2),
+            (client.multiply_vectors(vec_1, vec_2), [vec_1.dot(vec_2)]),
+            (client.add_matrices(mat_1, mat_2), mat_1 + mat_2),
+            (client.multiply_matrices(mat_1, mat_2), mat_1 @ mat_2),
+        ):
+            assert result.dtype == dtype
+            np.testing.assert_allclose(result, expected, rtol=1e-6)
+
+
+def test_column_major_grpc(grpc_stub):
+    """Unit test to verify that column-major matrices travel and compute as such,
+    also when mixed with row-major ones."""
+    mat_1 = np.asfortranarray(mat_generator(37))
+    mat_2 = np.asfortranarray(mat_generator(37))
+    mat_3 = mat_generator(37)
+
+    for version in (1, 2):
+        client = DemoGRPCClient(test=grpc_stub, protocol_version=version)
+
+        mat_add = client.add_matrices(mat_1, mat_2, mat_3)
+        np.testing.assert_allclose(mat_add, mat_1 + mat_2 + mat_3)
+        mat_add = client.add_matrices(mat_3, mat_1)
+        np.testing.assert_allclose(mat_add, mat_3 + mat_1)
+
+        mat_mult = client.multiply_matrices(mat_1, mat_2)
+        np.testing.assert_allclose(mat_mult, np.matmul(mat_1, mat_2))
+
+        # Handles keep the layout of the operand uploaded
+        handle = client.upload(mat_1)
+        np.testing.assert_array_equal(client.download(handle), mat_1)
+        mat_mult = client.multiply_matrices(handle, mat_3)
+        np.testing.assert_allclose(mat_mult, np.matmul(mat_1, mat_3))
+        client.release(handle)
+
+    # In version 2, matrices are received in their native layout (no copy)
+    assert mat_mult.flags.f_contiguous
+    assert client.add_matrices(mat_1, mat_2).flags.f_contiguous
+
+
+def test_chunked_reassembly_grpc(grpc_stub, monkeypatch):
+    """Unit test to verify that operands split into many uneven chunks
+    are reassembled correctly on both sides of the communication."""
+    import ansys.eigen.python.grpc.constants as constants
+
+    # Force several chunks per operand, with a smaller remainder chunk
+    monkeypatch.setattr(constants, "MAX_CHUNKSIZE", 1000)
+
+    client = DemoGRPCClient(test=grpc_stub)
+
+    vec_1 = vec_generator(1001)
+    vec_2 = vec_generator(1001)
+
+    vec_add = client.add_vectors(vec_1, vec_2)
+    np.testing.assert_allclose(vec_add, vec_1 + vec_2)
+
+    mat_1 = mat_generator(37)
+    mat_2 = mat_generator(37)
+    mat_3 = mat_generator(37)
+
+    mat_mult = client.multiply_matrices(mat_1, mat_2)
+    np.testing.assert_allclose(mat_mult, np.matmul(mat_1, mat_2))
+
+    mat_add = client.add_matrices(mat_1, mat_2, mat_3)
+    np.testing.assert_allclose(mat_add, mat_1 + mat_2 + mat_3)
+
+
+def test_row_panels_grpc(grpc_aio_port, monkeypatch):
+    """Unit test to verify that matrices multiplied by row panels (as the first one
+    arrives, or once received) give the expected product, on both the sync and asyncio
+    servers."""
+    import ansys.eigen.python.grpc.constants as constants
+    from ansys.eigen.python.grpc.server import ROW_PANELS, GRPCDemoServicer
+
+    # Force several chunks (and panels) per matrix
+    monkeypatch.setattr(constants, "MAX_CHUNKSIZE", 1000)
+
+    mat_1 = mat_generator(37)
+    mat_2 = mat_generator(37)
+    product = np.matmul(mat_1, mat_2)
+
+    servicer = GRPCDemoServicer()
+    with deployed_servicer(servicer) as port:
+        # The first matrix (in row-major order) is multiplied by panels
+        client = DemoGRPCClient(ip="127.0.0.1", port=port)
+        np.testing.assert_allclose(
+            client.multiply_matrices(mat_1, mat_2, pipelined=True), product
+        )
+        assert servicer.lanes.stats()["fast_completed"] == ROW_PANELS
+
+        # Large products are also sent by blocks of rows, as they are computed
+        mat_mult = client.multiply_matrices(mat_1, mat_2)
+        np.testing.assert_allclose(mat_mult, product)
+        assert mat_mult.flags.c_contiguous
+        assert servicer.lanes.stats()["fast_completed"] == 2 * ROW_PANELS
+
+        for client in [
+            DemoGRPCClient(ip="127.0.0.1", port=port),
+            DemoGRPCClient(ip="127.0.0.1", port=grpc_aio_port, compression="lz4"),
+        ]:
+            np.testing.assert_allclose(
+                client.multiply_matrices(mat_1, mat_2, pipelined=True), product
+            )
+            np.testing.assert_allclose(
+                client.multiply_matrices(
+                    np.asfortranarray(mat_1), mat_2, pipelined=True
+                ),
+                product,
+            )
+            np.testing.assert_allclose(
+                client.multiply_matrices(np.asfortranarray(mat_1), mat_2), product
+            )
+
+            # Stored matrices (and results) are handled too
+            handle = client.upload(mat_2)
+            result = client.multiply_matrices(
+                mat_1, handle, pipelined=True, store_result=True
+            )
+            np.testing.assert_allclose(client.download(result), product)
+            np.testing.assert_allclose(
+                client.multiply_matrices(handle, mat_1, pipelined=True),
+                np.matmul(mat_2, mat_1),
+            )
+            assert client.release(handle) and client.release(result)
+
+
+def test_truncated_stream_grpc(grpc_aio_port):
+    """Unit test to verify that streams ending before their operands are complete are
+    rejected with a clear error, on both the sync and asyncio servers."""
+    from ansys.eigen.python.grpc.server import GRPCDemoServicer
+
+    mat_1 = mat_generator(37)
+    mat_2 = mat_generator(37)
+    vec_1 = vec_generator(1000)
+
+    def truncated_call(client, rpc, message_type, *args, pipelined=False):
+        # Send all the messages of the request but its last chunk
+        md, chunks = client._generate_md(message_type, message_type[:3], *args)
+        if pipelined:
+            md.append(("row-panels", "true"))
+        if message_type == "vectors":
+            messages = list(client._generate_vector_stream(chunks, *args))
+        else:
+            messages = list(client._generate_matrix_stream(chunks, *args))
+        with pytest.raises(grpc.RpcError) as err:
+            list(rpc(iter(messages[:-1]), metadata=md))
+        assert "Stream ended before the operand was complete" in err.value.details()
+
+    with deployed_servicer(GRPCDemoServicer()) as port:
+        for target in (port, grpc_aio_port):
+            client = DemoGRPCClient(ip="127.0.0.1", port=target, chunk_size=1000)
+            stub = client._stub
+            truncated_call(client, stub.AddVectors, "vectors", vec_1, vec_1)
+            truncated_call(client, stub.AddMatrices, "matrices", mat_1, mat_2)
+            for pipelined in (False, True):
+                truncated_call(
+                    client,
+                    stub.MultiplyMatrices,
+                    "matrices",
+                    mat_2,
+                    mat_1,
+                    pipelined=pipelined,
+                )
+
+            # The server keeps serving complete streams
+            np.testing.assert_allclose(client.add_vectors(vec_1, vec_1), 2 * vec_1)
+
+
+def test_batch_operations_grpc(grpc_stub):
+    """Unit test to verify that the client gets the expected responses
+    when performing batches of independent operations in a single request."""
+
+    client = DemoGRPCClient(test=grpc_stub)
+
+    vec_pairs = [(vec_generator(16), vec_generator(16)) for _ in range(50)]
+    for result, (vec_1, vec_2) in zip(client.batch_add_vectors(vec_pairs), vec_pairs):
+        np.testing.assert_allclose(result, vec_1 + vec_2)
+
+    mat_pairs = [(mat_generator(16), mat_generator(16)) for _ in range(50)]
+    results = client.batch_multiply_matrices(mat_pairs)
+    assert len(results) == 50
+    for result, (mat_1, mat_2) in zip(results, mat_pairs):
+        np.testing.assert_allclose(result, np.matmul(mat_1, mat_2))
+
+    # Operands of a batch must look alike
+    with pytest.raises(RuntimeError):
+        client.batch_multiply_matrices([(mat_generator(16), mat_generator(8))])
+
+
+@pytest.mark.parametrize("sz", SIZES, ids=SIZES_IDS)
+def test_asyncio_server_grpc(grpc_aio_port, sz):
+    """Unit test to verify that the client gets the expected responses
+    when interacting with the asyncio (grpc.aio) server."""
+
+    client = DemoGRPCClient(ip="127.0.0.1", port=grpc_aio_port)
+
+    vec_1 = vec_generator(sz)
+    vec_2 = vec_generator(sz)
+
+    np.testing.assert_allclose(client.flip_vector(vec_1), np.flip(vec_1))
+    np.testing.assert_allclose(client.add_vectors(vec_1, vec_2), vec_1 + vec_2)
+    np.testing.assert_allclose(client.multiply_vectors(vec_1, vec_2), vec_1.dot(vec_2))
+
+    mat_1 = mat_generator(sz)
+    mat_2 = mat_generator(sz)
+
+    np.testing.assert_allclose(client.add_matrices(mat_1, mat_2), mat_1 + mat_2)
+    np.testing.assert_allclose(
+        client.multiply_matrices(mat_1, mat_2), np.matmul(mat_1, mat_2)
+    )
+    pairs = [(mat_1, mat_2), (mat_2, mat_1)]
+    np.testing.assert_allclose(
+        client.batch_multiply_matrices(pairs),
+        [np.matmul(mat_1, mat_2), np.matmul(mat_2, mat_1)],
+    )
+    handle = client.upload(mat_1)
+    result = client.add_matrices(handle, mat_2, store_result=True)
+    np.testing.assert_allclose(client.download(result), mat_1 + mat_2)
+    assert client.release(handle) and client.release(result)
+    assert "method=/grpcdemo.GRPCDemo/MultiplyMatrices" in client.get_stats()
+
+
+def test_asyncio_fold_off_loop_grpc(grpc_aio_port, monkeypatch):
+    """Unit test to verify that the asyncio server folds the chunks of the operands
+    in its lanes, rather than on the event loop."""
+    import threading
+
+    import ansys.eigen.python.grpc.constants as constants
+    from ansys.eigen.python.grpc.server import AsyncGRPCDemoServicer
+
+    # Force several chunks per operand
+    monkeypatch.setattr(constants, "MAX_CHUNKSIZE", 1000)
+
+    threads = []
+    add_chunk = AsyncGRPCDemoServicer._add_chunk
+
+    def recording_add_chunk(self, reduction_chunk, chunk):
+        threads.append(threading.current_thread().name)
+        return add_chunk(self, reduction_chunk, chunk)
+
+    monkeypatch.setattr(AsyncGRPCDemoServicer, "_add_chunk", recording_add_chunk)
+
+    client = DemoGRPCClient(ip="127.0.0.1", port=grpc_aio_port)
+    vec_1 = vec_generator(1000)
+    vec_2 = vec_generator(1000)
+    np.testing.assert_allclose(client.add_vectors(vec_1, vec_2), vec_1 + vec_2)
+    assert len(threads) > 1
+    assert all(name.startswith("fast-lane") for name in threads)
+
+
+def test_multiprocess_server_grpc():
+    """Unit test to verify that several server processes can share a port
+    and that the supervisor restarts the workers that die."""
+    import socket
+    import threading
+
+    from ansys.eigen.python.grpc.server import ServerSupervisor
+
+    # Find a free port
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    supervisor = ServerSupervisor(processes=2, address="127.0.0.1:%d" % port)
+    supervisor.start()
+    thread = threading.Thread(target=supervisor.supervise, args=(0.1,))
+    thread.start()
+
+    try:
+        client = DemoGRPCClient(ip="127.0.0.1", port=port, timeout=30)
+
+        vec_1 = vec_generator(16)
+        vec_2 = vec_generator(16)
+        np.testing.assert_allclose(client.add_vectors(vec_1, vec_2), vec_1 + vec_2)
+
+        # Kill a worker and wait for the supervisor to restart it
+        dead_worker = supervisor.workers[0]
+        dead_worker.kill()
+        dead_worker.join()
+        for _ in range(100):
+            if supervisor.restarts == 1:
+                break
+            thread.join(0.1)
+
+        assert supervisor.restarts == 1
+        assert all(worker.is_alive() for worker in supervisor.workers)
+        np.testing.assert_allclose(client.add_vectors(vec_1, vec_2), vec_1 + vec_2)
+    finally:
+        supervisor.stop()
+        thread.join()
+
+
+def test_result_cache_grpc():
+    """Unit test to verify that repeated requests are served from the result cache."""
+    from ansys.eigen.python.grpc.server import GRPCDemoServicer
+
+    mat_1 = mat_generator(64)
+    mat_2 = mat_generator(64)
+    mat_3 = mat_generator(64)
+
+    # Only room for the responses of two 64x64 matrix operations
+    servicer = GRPCDemoServicer(cache_size=2 * mat_1.nbytes + 1024)
+
+    with deployed_servicer(servicer) as port:
+        client = DemoGRPCClient(ip="127.0.0.1", port=port)
+
+        first = client.multiply_matrices(mat_1, mat_2)
+        second = client.multiply_matrices(mat_1, mat_2)
+        np.testing.assert_allclose(first, np.matmul(mat_1, mat_2))
+        np.testing.assert_array_equal(first, second)
+        assert servicer.cache.stats()["hits"] == 1
+        assert servicer.cache.stats()["misses"] == 1
+
+        # Same operands, different operation... or different operands
+        np.testing.assert_allclose(client.add_matrices(mat_1, mat_2), mat_1 + mat_2)
+        np.testing.assert_allclose(
+            client.multiply_matrices(mat_2, mat_1), np.matmul(mat_2, mat_1)
+        )
+        np.testing.assert_allclose(
+            client.multiply_matrices(mat_1, mat_3), np.matmul(mat_1, mat_3)
+        )
+
+        stats = servicer.cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 4
+        assert stats["entries"] == 2
+        assert stats["evictions"] == 2
+        assert stats["nbytes"] <= stats["max_bytes"]
+
+
+def test_server_stats_grpc():
+    """Unit test to verify that the statistics of the RPCs served are reported."""
+    from ansys.eigen.python.grpc.server import GRPCDemoServicer
+    from ansys.eigen.python.grpc.stats import ServerStats, StatsInterceptor
+
+    stats = ServerStats()
+    servicer = GRPCDemoServicer(cache_size=1024 * 1024, stats=stats)
+
+    with deployed_servicer(servicer, [StatsInterceptor(stats)]) as port:
+        client = DemoGRPCClient(ip="127.0.0.1", port=port)
+
+        vec_1 = vec_generator(1000)
+        vec_2 = vec_generator(1000)
+        for _ in range(3):
+            client.add_vectors(vec_1, vec_2)
+        client.request_greeting("Michael")
+
+        lines = client.get_stats().splitlines()
+
+    # Lines are sorted by method name... the cache and store statistics come last
+    assert lines[0].startswith("method=/grpcdemo.GRPCDemo/AddVectors ")
+    add_vectors = dict(field.split("=", 1) for field in lines[0].split())
+    assert add_vectors["size"] == "<=16KB"
+    assert add_vectors["calls"] == "3"
+    assert int(add_vectors["request_bytes"]) > 3 * (vec_1.nbytes + vec_2.nbytes)
+    assert int(add_vectors["response_bytes"]) > 3 * vec_1.nbytes
+    # Each request (and response) starts with a manifest message
+    assert add_vectors["request_chunks"] == "9"
+    assert add_vectors["response_chunks"] == "6"
+    assert float(add_vectors["wall_p99_ms"]) >= float(add_vectors["wall_p50_ms"]) > 0
+
+    assert any(line.startswith("method=/grpcdemo.GRPCDemo/SayHello ") for line in lines)
+    assert "cache_hits=2 cache_misses=1" in lines[-2]
+    assert lines[-1].startswith("store_entries=0 ")
+
+
+def test_deadline_grpc():
+    """Unit test to verify that the server stops working on calls whose deadline
+    has been exceeded, and that the client reports them."""
+    from ansys.eigen.python.grpc.server import GRPCDemoServicer
+
+    class SlowServicer(GRPCDemoServicer):
+        """Servicer taking a while between receiving the operands and computing."""
+
+        computed = 0
+
+        def _lookup_cache(self, hasher):
+            time.sleep(0.5)
+            return super()._lookup_cache(hasher)
+
+        def _multiply_matrices(self, dtype, size, matrix_list):
+            self.computed += 1
+            return super()._multiply_matrices(dtype, size, matrix_list)
+
+    servicer = SlowServicer()
+    mat_1 = mat_generator(64)
+    mat_2 = mat_generator(64)
+
+    with deployed_servicer(servicer) as port:
+        client = DemoGRPCClient(ip="127.0.0.1", port=port, deadline=0.2)
+
+        with pytest.raises(grpc.RpcError) as err:
+            client.multiply_matrices(mat_1, mat_2)
+        assert err.value.code() == grpc.StatusCode.DEADLINE_EXCEEDED
+
+        # Wait for the server to give up on the call... the product is never computed
+        time.sleep(0.5)
+        assert servicer.computed == 0
+        assert "abandoned_receive=0 abandoned_compute=1 abandoned_send=0" in (
+            client.get_stats()
+        )
+
+        # The deadline of the client can be extended per call
+        mat_mult = client.multiply_matrices(mat_1, mat_2, deadline=5)
+        np.testing.assert_allclose(mat_mult, np.matmul(mat_1, mat_2))
+        assert servicer.computed == 1
+
+
+def test_protocol_versions_grpc():
+    """Unit test to verify that clients of both protocol versions are served alike."""
+    from ansys.eigen.python.grpc.server import GRPCDemoServicer
+
+    vec = vec_generator(1000)
+    mat = mat_generator(32)
+
+    # Large enough to be sent in several chunks
+    big_vec = np.random.rand(1000000)
+
+    with deployed_servicer(GRPCDemoServicer(cache_size=1024**2)) as port:
+        for version in (1, 2):
+            client = DemoGRPCClient(ip="127.0.0.1", port=port, protocol_version=version)
+            np.testing.assert_allclose(client.flip_vector(vec), np.flip(vec))
+            np.testing.assert_allclose(
+                client.add_vectors(big_vec, big_vec), 2 * big_vec
+            )
+            np.testing.assert_allclose(client.multiply_matrices(mat, mat), mat @ mat)
+
+            # Cached responses are only served to clients of the same version
+            np.testing.assert_allclose(client.multiply_matrices(mat, mat), mat @ mat)
+
+            # Handles (and results kept in the server) are supported in both versions
+            handle = client.upload(mat)
+            result = client.add_matrices(handle, mat, store_result=True)
+            np.testing.assert_allclose(client.download(result), 2 * mat)
+
+        # In version 2, vectors can be streamed as they are produced
+        chunks = np.array_split(big_vec, 7)
+        np.testing.assert_allclose(
+            client.add_vectors(iter(chunks), big_vec, (c for c in chunks)), 3 * big_vec
+        )
+        np.testing.assert_allclose(
+            client.multiply_vectors(big_vec, iter(chunks)), big_vec.dot(big_vec)
+        )
+
+        # ... which must match the size of the other operands
+        with pytest.raises(grpc.RpcError):
+            client.add_vectors(big_vec, iter(chunks[1:]))
+
+    with pytest.raises(RuntimeError):
+        DemoGRPCClient(ip="127.0.0.1", port=port, protocol_version=3)
+
+
+def test_operand_handles_grpc():
+    """Unit test to verify that operands stored in the server can be used by reference."""
+    from ansys.eigen.python.grpc.server import GRPCDemoServicer
+
+    mat_1 = mat_generator(32)
+    mat_2 = mat_generator(32)
+
+    # Only room for two matrices per client
+    servicer = GRPCDemoServicer(store_quota=2 * mat_1.nbytes)
+
+    with deployed_servicer(servicer) as port:
+        client = DemoGRPCClient(ip="127.0.0.1", port=port)
+
+        # Operands stored in the server can be mixed with inline ones
+        handle = client.upload(mat_1)
+        assert handle.startswith("mat-")
+        np.testing.assert_array_equal(client.download(handle), mat_1)
+        np.testing.assert_allclose(
+            client.multiply_matrices(handle, mat_2), np.matmul(mat_1, mat_2)
+        )
+        np.testing.assert_allclose(client.add_matrices(mat_2, handle), mat_1 + mat_2)
+
+        # Results can be kept in the server too
+        result = client.multiply_matrices(handle, handle, store_result=True)
+        np.testing.assert_allclose(client.download(result), np.matmul(mat_1, mat_1))
+        assert servicer.store.stats()["entries"] == 2
+
+        # Quota of the client exceeded
+        with pytest.raises(grpc.RpcError) as err:
+            client.upload(mat_2)
+        assert err.value.code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+
+        # Handles are private to each client
+        other = DemoGRPCClient(ip="127.0.0.1", port=port)
+        assert not other.release(handle)
+        with pytest.raises(grpc.RpcError):
+            other.add_matrices(handle, mat_2)
+
+        assert client.release(handle)
+        assert client.release(result)
+        assert not client.release(handle)
+        with pytest.raises(grpc.RpcError) as err:
+            client.download(handle)
+        assert err.value.code() == grpc.StatusCode.NOT_FOUND
+
+        # Vectors (and folded additions) are handled too
+        vec_1 = vec_generator(1000)
+        vec_2 = vec_generator(1000)
+        vec_handle = client.upload(vec_1)
+        assert vec_handle.startswith("vec-")
+        np.testing.assert_allclose(
+            client.add_vectors(vec_handle, vec_2, vec_handle), 2 * vec_1 + vec_2
+        )
+        np.testing.assert_allclose(
+            client.multiply_vectors(vec_2, vec_handle), vec_1.dot(vec_2)
+        )
+        np.testing.assert_array_equal(client.download(vec_handle), vec_1)
+
+
+def test_operand_store_expiration():
+    """Unit test to verify that unused stored operands expire."""
+    from ansys.eigen.python.grpc.store import OperandStore
+
+    store = OperandStore(quota=1024, ttl=0.2)
+    handle = store.put("client", np.ones(8))
+    assert store.usage("client") == 64
+    with store.pin("client", handle) as array:
+        np.testing.assert_array_equal(array, np.ones(8))
+
+    time.sleep(0.3)
+    with pytest.raises(RuntimeError):
+        with store.pin("client", handle):
+            pass
+    assert store.usage("client") == 0
+    assert len(store) == 0
+
+
+def test_operand_store_capacity():
+    """Unit test to verify that the capacity of the store bounds the operands stored
+    by all clients, even if a client rotates its identifier."""
+    from ansys.eigen.python.grpc.server import GRPCDemoServicer
+    from ansys.eigen.python.grpc.store import OperandStore, QuotaExceededError
+
+    store = OperandStore(quota=1024, ttl=600, capacity=3 * 64)
+    handles = [store.put("client-%d" % index, np.ones(8)) for index in range(3)]
+    with pytest.raises(QuotaExceededError):
+        store.put("client-3", np.ones(8))
+
+    # Released operands make room again
+    assert store.release("client-0", handles[0])
+    store.put("client-3", np.ones(8))
+
+    # Each client has its own identifier... all of them share the capacity
+    mat_1 = mat_generator(32)
+    servicer = GRPCDemoServicer(
+        store_quota=2 * mat_1.nbytes, store_capacity=3 * mat_1.nbytes
+    )
+    with deployed_servicer(servicer) as port:
+        for _ in range(3):
+            DemoGRPCClient(ip="127.0.0.1", port=port).upload(mat_1)
+        with pytest.raises(grpc.RpcError) as err:
+            DemoGRPCClient(ip="127.0.0.1", port=port).upload(mat_1)
+        assert err.value.code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+        assert "capacity of the store" in err.value.details()
+
+
+def test_operand_store_spill(tmp_path):
+    """Unit test to verify that the least recently used operands exceeding the memory
+    budget are spilled to disk (unless they are pinned), and mapped back when used."""
+    from ansys.eigen.python.grpc.store import OperandStore
+
+    # Room for two operands in memory
+    store = OperandStore(
+        quota=1024**2, ttl=600, memory_budget=2 * 8000, spill_dir=str(tmp_path)
+    )
+    vec_1, vec_2, vec_3 = (np.full(1000, value) for value in (1.0, 2.0, 3.0))
+    mat = np.asfortranarray(np.arange(1000.0).reshape(40, 25))
+
+    handle_1 = store.put("client", vec_1)
+    handle_2 = store.put("client", vec_2)
+    assert store.stats()["spilled"] == 0
+
+    # The operand in use is pinned... so the least recently used one is spilled
+    with store.pin("client", handle_1):
+        handle_3 = store.put("client", vec_3)
+        stats = store.stats()
+        assert stats["spilled"] == 1 and stats["pinned"] == 1
+        assert stats["resident"] == 2 * 8000 and stats["nbytes"] == 3 * 8000
+        assert len(list(tmp_path.glob("*/%s.npy" % handle_2))) == 1
+    assert store.stats()["pinned"] == 0
+
+    handle_4 = store.put("client", mat)
+    assert store.stats()["spilled"] == 2
+
+    # Spilled operands are mapped back (in their layout), and still count for the quota
+    for handle, operand in ((handle_2, vec_2), (handle_1, vec_1), (handle_3, vec_3)):
+        with store.pin("client", handle) as array:
+            np.testing.assert_array_equal(array, operand)
+    with store.pin("client", handle_4) as spilled_mat:
+        np.testing.assert_array_equal(spilled_mat, mat)
+    assert spilled_mat.flags.f_contiguous and not spilled_mat.flags.writeable
+    assert store.usage("client") == 4 * 8000
+
+    # Files are removed with their operands... and the scratch directory on closing
+    assert store.release("client", handle_2)
+    assert len(list(tmp_path.glob("*/%s.npy" % handle_2))) == 0
+    store.close()
+    assert list(tmp_path.iterdir()) == []
+    np.testing.assert_array_equal(spilled_mat, mat)
+
+
+def test_operand_store_spill_unlocked(tmp_path, monkeypatch):
+    """Unit test to verify that operands are written to disk without holding the lock
+    of the store, and that operands pinned meanwhile are spilled (in the background)
+    once unpinned."""
+    import contextlib
+    import threading
+
+    from ansys.eigen.python.grpc.store import OperandStore
+
+    # Room for one operand in memory
+    store = OperandStore(
+        quota=1024**2, ttl=600, memory_budget=8000, spill_dir=str(tmp_path)
+    )
+    vec_1, vec_2 = np.full(1000, 1.0), np.full(1000, 2.0)
+    handle_1 = store.put("client", vec_1)
+
+    # While the operand is written, the store keeps serving... and pinning it
+    pins = contextlib.ExitStack()
+    pinned, served = [], []
+    save = np.save
+
+    def blocking_save(path, array):
+        thread = threading.Thread(target=lambda: served.append(store.stats()))
+        thread.start()
+        thread.join(5)
+        pinned.append(pins.enter_context(store.pin("client", handle_1)))
+        save(path, array)
+
+    monkeypatch.setattr(np, "save", blocking_save)
+    store.put("client", vec_2)
+    monkeypatch.undo()
+
+    # The operand pinned meanwhile is kept in memory (exceeding the budget)...
+    assert len(served) == 1
+    stats = store.stats()
+    assert stats["spilled"] == 0 and stats["pinned"] == 1
+    assert stats["resident"] == 2 * 8000
+    assert list(tmp_path.glob("*/*.npy")) == []
+
+    # ... until it is unpinned, when it is spilled outside the thread of the caller
+    np.testing.assert_array_equal(pinned.pop(), vec_1)
+    savers = []
+
+    def recording_save(path, array):
+        savers.append(threading.current_thread().name)
+        save(path, array)
+
+    monkeypatch.setattr(np, "save", recording_save)
+    pins.close()
+    while store.stats()["spilled"] == 0:
+        time.sleep(0.01)
+    monkeypatch.undo()
+    assert len(savers) == 1 and savers[0].startswith("store-spill")
+    stats = store.stats()
+    assert stats["spilled"] == 1 and stats["pinned"] == 0
+    assert stats["resident"] == 8000
+    assert len(list(tmp_path.glob("*/*.npy"))) == 1
+    store.close()
+
+
+def test_operand_store_budget_grpc(tmp_path):
+    """Unit test to verify that the operands stored in a server with a memory budget are
+    served alike, whether they are kept in memory or spilled to disk."""
+    from ansys.eigen.python.grpc.server import GRPCDemoServicer
+
+    mats = [mat_generator(32) for _ in range(4)]
+    servicer = GRPCDemoServicer(
+        store_budget=2 * mats[0].nbytes, spill_dir=str(tmp_path)
+    )
+
+    try:
+        with deployed_servicer(servicer) as port:
+            client = DemoGRPCClient(ip="127.0.0.1", port=port)
+            handles = [client.upload(mat) for mat in mats]
+            result = client.multiply_matrices(handles[0], handles[1], store_result=True)
+            assert servicer.store.stats()["spilled"] == 3
+
+            for handle, mat in zip(handles, mats):
+                np.testing.assert_array_equal(client.download(handle), mat)
+            np.testing.assert_allclose(
+                client.add_matrices(handles[2], mats[3], handles[0]),
+                mats[2] + mats[3] + mats[0],
+            )
+            np.testing.assert_allclose(client.download(result), mats[0] @ mats[1])
+
+            # Calls in flight have finished... no operand remains pinned
+            report = client.get_stats()
+            assert "store_entries=5 " in report and "store_pinned=0" in report
+    finally:
+        servicer.store.close()
+
+
+def test_admission_controller():
+    """Unit test to verify that calls are admitted according to their cost."""
+    from ansys.eigen.python.grpc.admission import AdmissionController, OverloadedError
+
+    controller = AdmissionController(budget=1000)
+
+    # Calls exceeding the budget are admitted when there are no calls in flight
+    with controller.ticket("MultiplyMatrices") as ticket:
+        ticket.admit((16, 16))
+        assert ticket.cost == 16**3
+        with pytest.raises(OverloadedError) as err:
+            controller.ticket("AddVectors").admit((10,))
+        assert err.value.retry_after > 0
+
+    with controller.ticket("AddVectors") as ticket:
+        ticket.admit((600,))
+        with controller.ticket("AddMatrices") as other:
+            other.admit((20, 20))
+            assert controller.in_flight == 1000
+        with pytest.raises(OverloadedError):
+            controller.ticket("AddVectors").admit((401,))
+
+    assert controller.stats() == {
+        "budget": 1000,
+        "in_flight": 0,
+        "calls": 0,
+        "admitted": 3,
+        "rejected": 2,
+        "heavy_calls": 0,
+    }
+
+    # Heavy calls may be limited on their own
+    controller = AdmissionController(0, heavy_threshold=1000, max_heavy_calls=1)
+    with controller.ticket("AddVectors") as ticket:
+        ticket.admit((1000,))
+        assert controller.heavy_calls == 1
+        with pytest.raises(OverloadedError):
+            controller.ticket("AddVectors").admit((1000,))
+        with controller.ticket("AddVectors") as other:
+            other.admit((999,))
+    assert controller.heavy_calls == 0
+
+
+def test_admission_control_grpc():
+    """Unit test to verify that expensive calls exceeding the budget of the server
+    are rejected with a retry hint, while cheap calls keep flowing."""
+    import threading
+
+    from ansys.eigen.python.grpc.server import GRPCDemoServicer
+
+    class BlockingServicer(GRPCDemoServicer):
+        """Servicer whose matrix multiplications wait until they are released."""
+
+        release = threading.Event()
+
+        def _multiply_matrices(self, dtype, size, matrix_list):
+            self.release.wait(10)
+            return super()._multiply_matrices(dtype, size, matrix_list)
+
+    servicer = BlockingServicer(admission_budget=64**3 + 1000)
+    mat_1 = mat_generator(64)
+    mat_2 = mat_generator(64)
+    vec_1 = vec_generator(1000)
+
+    with deployed_servicer(servicer) as port:
+        client = DemoGRPCClient(ip="127.0.0.1", port=port)
+
+        with futures.ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(client.multiply_matrices, mat_1, mat_2)
+            while servicer.admission.stats()["calls"] == 0:
+                time.sleep(0.01)
+
+            # The budget is taken by the call in flight... only cheap calls fit
+            with pytest.raises(grpc.RpcError) as err:
+                client.multiply_matrices(mat_1, mat_2)
+            assert err.value.code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+            assert int(dict(err.value.trailing_metadata())["retry-after-ms"]) > 0
+            np.testing.assert_allclose(client.add_vectors(vec_1, vec_1), 2 * vec_1)
+
+            servicer.release.set()
+            np.testing.assert_allclose(pending.result(), np.matmul(mat_1, mat_2))
+
+        assert "admission_in_flight=0 admission_calls=0 admission_admitted=2" in (
+            client.get_stats()
+        )
+        assert servicer.admission.rejected == 1
+
+
+def test_executor_lanes_grpc():
+    """Unit test to verify that cheap computations do not queue behind
+    expensive ones, which run in their own lane."""
+    import threading
+
+    from ansys.eigen.python.grpc.server import GRPCDemoServicer
+
+    class BlockingServicer(GRPCDemoServicer):
+        """Servicer whose large matrix multiplications wait until they are released."""
+
+        release = threading.Event()
+
+        def _multiply_matrices(self, dtype, size, matrix_list):
+            if size[0] >= 64:
+                self.release.wait(10)
+            return super()._multiply_matrices(dtype, size, matrix_list)
+
+    servicer = BlockingServicer(
+        admission_budget=0, heavy_threshold=64**3, fast_workers=2, heavy_workers=1
+    )
+    assert servicer.lanes.lane(63**3) == "fast"
+    assert servicer.lanes.lane(64**3) == "heavy"
+
+    mat_1 = mat_generator(64)
+    mat_2 = mat_generator(64)
+    vec_1 = vec_generator(1000)
+
+    with deployed_servicer(servicer) as port:
+        client = DemoGRPCClient(ip="127.0.0.1", port=port)
+
+        with futures.ThreadPoolExecutor(max_workers=2) as executor:
+            pending = [
+                executor.submit(client.multiply_matrices, mat_1, mat_2)
+                for _ in range(2)
+            ]
+            while servicer.lanes.stats()["heavy_queued"] == 0:
+                time.sleep(0.01)
+
+            # The heavy lane is busy (and has a queue)... cheap calls keep flowing
+            for _ in range(10):
+                np.testing.assert_allclose(client.add_vectors(vec_1, vec_1), 2 * vec_1)
+                np.testing.assert_allclose(
+                    client.multiply_matrices(mat_1[:8, :8], mat_2[:8, :8]),
+                    np.matmul(mat_1[:8, :8], mat_2[:8, :8]),
+                )
+            assert "lane_heavy_workers=1 lane_heavy_queued=1 lane_heavy_running=1" in (
+                client.get_stats()
+            )
+
+            servicer.release.set()
+            for future in pending:
+                np.testing.assert_allclose(future.result(), np.matmul(mat_1, mat_2))
+
+    stats = servicer.lanes.stats()
+    assert stats["heavy_completed"] == 2
+    assert stats["fast_completed"] == 20
+    assert stats["fast_queued"] == stats["heavy_queued"] == 0
+
+
+def test_heavy_calls_saturation_grpc():
+    """Unit test to verify that a burst of expensive calls cannot take all the threads
+    serving the requests, so that cheap calls keep flowing."""
+    import threading
+
+    from ansys.eigen.python.grpc.server import GRPCDemoServicer, _handler_threads
+
+    class BlockingServicer(GRPCDemoServicer):
+        """Servicer whose large matrix multiplications wait until they are released."""
+
+        release = threading.Event()
+
+        def _multiply_matrices(self, dtype, size, matrix_list):
+            if size[0] >= 64:
+                self.release.wait(10)
+            return super()._multiply_matrices(dtype, size, matrix_list)
+
+    # The threads serving the requests are those of the lanes... heavy calls are
+    # limited below them
+    options = {"heavy_threshold": 64**3, "fast_workers": 2, "heavy_workers": 1}
+    max_workers = _handler_threads(None, options)
+    assert max_workers == 3 and options["max_heavy_calls"] == 1
+    servicer = BlockingServicer(admission_budget=0, **options)
+
+    mat_1 = mat_generator(64)
+    mat_2 = mat_generator(64)
+    vec_1 = vec_generator(1000)
+
+    with deployed_servicer(servicer, max_workers=max_workers) as port:
+        client = DemoGRPCClient(ip="127.0.0.1", port=port)
+
+        # Twice as many heavy calls as threads serving the requests
+        with futures.ThreadPoolExecutor(max_workers=2 * max_workers) as executor:
+            pending = [
+                executor.submit(client.multiply_matrices, mat_1, mat_2)
+                for _ in range(2 * max_workers)
+            ]
+            while servicer.admission.stats()["rejected"] < len(pending) - 1:
+                time.sleep(0.01)
+
+            for _ in range(10):
+                np.testing.assert_allclose(client.add_vectors(vec_1, vec_1), 2 * vec_1)
+            assert servicer.admission.heavy_calls == 1
+
+            servicer.release.set()
+            completed = 0
+            for future in pending:
+                try:
+                    np.testing.assert_allclose(future.result(), np.matmul(mat_1, mat_2))
+                    completed += 1
+                except grpc.RpcError as err:
+                    assert err.code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+            assert completed == 1
+
+
+def test_shared_memory_grpc(grpc_aio_port):
+    """Unit test to verify that co-located clients can exchange operands and results
+    through shared memory, leaving no segments behind."""
+    import glob
+
+    import ansys.eigen.python.grpc.generated.grpcdemo_pb2 as grpcdemo_pb2
+    from ansys.eigen.python.grpc.server import GRPCDemoServicer, is_local_peer
+    from ansys.eigen.python.grpc.sharedmem import SEGMENT_PREFIX, attach
+
+    with pytest.raises(RuntimeError):
+        DemoGRPCClient(ip="127.0.0.1", port=0, protocol_version=1, shared_memory=True)
+
+    # Only local peers may use shared memory
+    assert is_local_peer("ipv4:127.0.0.1:5000") and is_local_peer("ipv6:[::1]:5000")
+    assert is_local_peer("unix:/tmp/api-eigen.sock")
+    assert is_local_peer("ipv6:[::ffff:127.0.0.1]:5000")
+    assert not is_local_peer("ipv4:10.0.0.1:5000")
+    assert not is_local_peer("ipv6:[2001:db8::1]:5000")
+
+    # ... and only segments created by the client library are mapped
+    for name in ("psm_0123", SEGMENT_PREFIX + "../psm_0123"):
+        with pytest.raises(RuntimeError):
+            attach(grpcdemo_pb2.SharedSegment(name=name, nbytes=8), np.float64, (1,))
+
+    segments = set(glob.glob("/dev/shm/" + SEGMENT_PREFIX + "*"))
+
+    vec_1 = vec_generator(1000)
+    vec_2 = vec_generator(1000)
+    mat_1 = mat_generator(64)
+    mat_2 = np.asfortranarray(mat_generator(64))
+
+    # Servers only map the segments of their clients if enabled
+    with deployed_servicer(GRPCDemoServicer()) as port:
+        client = DemoGRPCClient(ip="127.0.0.1", port=port, shared_memory=True)
+        with pytest.raises(grpc.RpcError):
+            client.add_vectors(vec_1, vec_2)
+
+    with deployed_servicer(GRPCDemoServicer(shared_memory=True)) as port:
+        for client in [
+            DemoGRPCClient(ip="127.0.0.1", port=port, shared_memory=True),
+            DemoGRPCClient(ip="127.0.0.1", port=grpc_aio_port, shared_memory=True),
+        ]:
+            np.testing.assert_allclose(client.flip_vector(vec_1), np.flip(vec_1))
+            np.testing.assert_allclose(
+                client.add_vectors(vec_1, vec_2, vec_1), 2 * vec_1 + vec_2
+            )
+            np.testing.assert_allclose(
+                client.multiply_vectors(vec_1, vec_2), vec_1.dot(vec_2)
+            )
+            np.testing.assert_allclose(client.add_matrices(mat_1, mat_2), mat_1 + mat_2)
+            np.testing.assert_allclose(
+                client.multiply_matrices(mat_1, mat_2), np.matmul(mat_1, mat_2)
+            )
+            np.testing.assert_allclose(
+                client.batch_multiply_matrices([(mat_1, mat_2), (mat_2, mat_1)]),
+                [np.matmul(mat_1, mat_2), np.matmul(mat_2, mat_1)],
+            )
+
+            # Operands stored in the server can be mixed with shared ones
+            handle = client.upload(mat_2)
+            np.testing.assert_array_equal(client.download(handle), mat_2)
+            result = client.multiply_matrices(mat_1, handle, store_result=True)
+            np.testing.assert_allclose(client.download(result), np.matmul(mat_1, mat_2))
+            assert client.release(handle) and client.release(result)
+
+    # Every segment has been released by its reader
+    assert set(glob.glob("/dev/shm/" + SEGMENT_PREFIX + "*")) == segments
+
+
+def test_unix_domain_socket_grpc(tmp_path):
+    """Unit test to verify that the server can listen on a Unix domain socket (next to
+    TCP), and that the client can connect to it."""
+    from ansys.eigen.python.grpc.generated.grpcdemo_pb2_grpc import (
+        add_GRPCDemoServicer_to_server,
+    )
+    from ansys.eigen.python.grpc.server import (
+        GRPCDemoServicer,
+        ServerSupervisor,
+        _add_ports,
+    )
+
+    target = "unix:%s" % (tmp_path / "api-eigen.sock")
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+    add_GRPCDemoServicer_to_server(GRPCDemoServicer(), server)
+    _add_ports(server, [target, "127.0.0.1:0"])
+    server.start()
+    try:
+        client = DemoGRPCClient(target=target)
+
+        vec_1 = vec_generator(1000)
+        mat_1 = mat_generator(64)
+        np.testing.assert_allclose(client.flip_vector(vec_1), np.flip(vec_1))
+        np.testing.assert_allclose(
+            client.multiply_matrices(mat_1, mat_1), np.matmul(mat_1, mat_1)
+        )
+    finally:
+        server.stop(None)
+
+    # Several processes cannot share a Unix domain socket
+    with pytest.raises(RuntimeError):
+        ServerSupervisor(2, address=["[::]:50051", target])
+
+
+def test_raw_frames_grpc(grpc_aio_port, monkeypatch):
+    """Unit test to verify that vectors and matrices can be exchanged as raw frames, and
+    that raw and protobuf clients are served alike."""
+    import ansys.eigen.python.grpc.constants as constants
+    from ansys.eigen.python.grpc.framing import Frame, deserialize, serialize
+    from ansys.eigen.python.grpc.server import GRPCDemoServicer
+    from ansys.eigen.python.grpc.stats import ServerStats, StatsInterceptor
+
+    with pytest.raises(RuntimeError):
+        DemoGRPCClient(ip="127.0.0.1", port=0, protocol_version=1, raw_frames=True)
+
+    # Chunks are views of the data received
+    frame = deserialize(serialize(Frame(np.arange(4.0).data, end_of_operand=True)))
+    assert frame.end_of_operand and not frame.HasField("manifest")
+    np.testing.assert_array_equal(np.frombuffer(frame.vector_as_chunk), np.arange(4.0))
+
+    # Small chunks, so that operands are sent in several of them
+    monkeypatch.setattr(constants, "MAX_CHUNKSIZE", 1000)
+
+    vec_1 = vec_generator(1000)
+    vec_2 = vec_generator(1000)
+    mat_1 = mat_generator(37)
+    mat_2 = np.asfortranarray(mat_generator(37))
+    cplx = mat_1 + 1j * mat_2
+
+    stats = ServerStats()
+    servicer = GRPCDemoServicer(cache_size=1024**2, stats=stats)
+    with deployed_servicer(servicer, [StatsInterceptor(stats)]) as port:
+        for client_port in (port, grpc_aio_port):
+            client = DemoGRPCClient(ip="127.0.0.1", port=client_port, raw_frames=True)
+            np.testing.assert_allclose(client.flip_vector(vec_1), np.flip(vec_1))
+            np.testing.assert_allclose(client.add_vectors(vec_1, vec_2), vec_1 + vec_2)
+            np.testing.assert_allclose(
+                client.multiply_vectors(vec_1, vec_2), [np.dot(vec_1, vec_2)]
+            )
+            np.testing.assert_allclose(
+                client.add_matrices(mat_1, mat_2, mat_1), 2 * mat_1 + mat_2
+            )
+            np.testing.assert_allclose(
+                client.multiply_matrices(cplx, cplx), cplx @ cplx
+            )
+            np.testing.assert_allclose(
+                client.multiply_matrices(mat_1, mat_2, pipelined=True), mat_1 @ mat_2
+            )
+
+            handle = client.upload(mat_2)
+            np.testing.assert_allclose(client.download(handle), mat_2)
+
+        # Responses cached for protobuf clients are served to raw clients... and back
+        protobuf_client = DemoGRPCClient(ip="127.0.0.1", port=port)
+        np.testing.assert_allclose(
+            protobuf_client.multiply_matrices(cplx, cplx), cplx @ cplx
+        )
+        np.testing.assert_allclose(protobuf_client.flip_vector(vec_1), np.flip(vec_1))
+        assert servicer.cache.stats()["hits"] == 2
+
+    assert "method=/grpcdemo.GRPCDemoRaw/MultiplyMatrices" in stats.report()
+
+
+def test_micro_batcher_grpc():
+    """Unit test to verify that small concurrent multiplications of the same type and
+    shape are run in batches, and that each client gets its own result."""
+    from ansys.eigen.python.grpc.server import GRPCDemoServicer
+
+    servicer = GRPCDemoServicer(batch_window=0.05, max_batch_size=8)
+
+    vectors = [vec_generator(16) for _ in range(8)]
+    matrices = [mat_generator(8) for _ in range(8)]
+    ints = [np.random.randint(-10, 10, (8, 8), dtype=np.int32) for _ in range(8)]
+
+    with deployed_servicer(servicer) as port:
+        clients = [
+            DemoGRPCClient(ip="127.0.0.1", port=port, protocol_version=version)
+            for version in (1, 2)
+        ]
+
+        with futures.ThreadPoolExecutor(max_workers=8) as executor:
+            for client in clients:
+                vec_mults = executor.map(
+                    client.multiply_vectors, vectors, vectors[::-1]
+                )
+                for vec_mult, vec_1, vec_2 in zip(vec_mults, vectors, vectors[::-1]):
+                    np.testing.assert_allclose(vec_mult, [np.dot(vec_1, vec_2)])
+
+                for operands in (matrices, ints):
+                    mat_mults = executor.map(
+                        client.multiply_matrices, operands, operands[::-1]
+                    )
+                    for mat_mult, mat_1, mat_2 in zip(
+                        mat_mults, operands, operands[::-1]
+                    ):
+                        np.testing.assert_allclose(mat_mult, mat_1 @ mat_2)
+
+        # Batched products keep the layout of those computed on their own
+        assert mat_mult.flags.f_contiguous
+
+        # Errors are still reported per call
+        with pytest.raises(grpc.RpcError):
+            clients[1].multiply_matrices(
+                mat_generator(8)[:, :4], mat_generator(8)[:, :4]
+            )
+
+        report = clients[0].get_stats()
+
+    stats = servicer.batcher.stats()
+    assert stats["requests"] == 48
+    assert stats["batches"] < stats["requests"]
+    assert stats["held"] == 0
+    assert "batcher_requests=48" in report
+
+
+def test_single_flight_grpc():
+    """Unit test to verify that identical requests in flight are computed once, and
+    that each client gets the result."""
+    import threading
+
+    from ansys.eigen.python.grpc.server import GRPCDemoServicer
+
+    class BlockingServicer(GRPCDemoServicer):
+        """Servicer whose matrix multiplications wait until they are released."""
+
+        computed = 0
+        release = threading.Event()
+
+        def _multiply_matrices(self, dtype, size, matrix_list):
+            self.computed += 1
+            self.release.wait(10)
+            return super()._multiply_matrices(dtype, size, matrix_list)
+
+    servicer = BlockingServicer(coalesce=True, admission_budget=0)
+
+    mat_1 = mat_generator(64)
+    mat_2 = mat_generator(64)
+
+    with deployed_servicer(servicer) as port:
+        client = DemoGRPCClient(ip="127.0.0.1", port=port)
+
+        with futures.ThreadPoolExecutor(max_workers=4) as executor:
+            pending = [
+                executor.submit(client.multiply_matrices, mat_1, mat_2)
+                for _ in range(3)
+            ]
+            # A different request is not coalesced with them
+            pending.append(executor.submit(client.multiply_matrices, mat_2, mat_1))
+
+            while servicer.flights.stats()["coalesced"] < 2:
+                time.sleep(0.01)
+            servicer.release.set()
+
+            for future in pending[:3]:
+                np.testing.assert_allclose(future.result(), mat_1 @ mat_2)
+            np.testing.assert_allclose(pending[3].result(), mat_2 @ mat_1)
+
+        assert servicer.computed == 2
+        assert "coalesce_computed=2 coalesce_coalesced=2 coalesce_in_flight=0" in (
+            client.get_stats()
+        )
+
+        # Results are not kept once computed
+        np.testing.assert_allclose(
+            client.multiply_matrices(mat_1, mat_2), mat_1 @ mat_2
+        )
+        assert servicer.computed == 3
+
+
+def test_process_offload_grpc(monkeypatch):
+    """Unit test to verify that heavy computations are run by worker processes, which
+    get their operands through shared memory, leaving no segments behind."""
+    import glob
+
+    import ansys.eigen.python.grpc.constants as constants
+    from ansys.eigen.python.grpc.server import GRPCDemoServicer
+    from ansys.eigen.python.grpc.sharedmem import SEGMENT_PREFIX
+
+    segments = set(glob.glob("/dev/shm/" + SEGMENT_PREFIX + "*"))
+    servicer = GRPCDemoServicer(compute_processes=1, heavy_threshold=32**3)
+
+    mat_1 = mat_generator(64)
+    mat_2 = mat_generator(64)
+    ints = np.random.randint(-10, 10, (64, 64), dtype=np.int32)
+
+    try:
+        with deployed_servicer(servicer) as port:
+            clients = [
+                DemoGRPCClient(ip="127.0.0.1", port=port, protocol_version=version)
+                for version in (1, 2)
+            ]
+            for client in clients:
+                np.testing.assert_allclose(
+                    client.multiply_matrices(mat_1, mat_2), mat_1 @ mat_2
+                )
+            np.testing.assert_array_equal(
+                clients[1].multiply_matrices(ints, ints), ints @ ints
+            )
+            assert servicer.offload.stats()["completed"] == 3
+
+            # Products streamed by row panels are offloaded panel by panel
+            monkeypatch.setattr(constants, "MAX_CHUNKSIZE", 1000)
+            np.testing.assert_allclose(
+                clients[1].multiply_matrices(mat_1, mat_2), mat_1 @ mat_2
+            )
+            assert servicer.offload.stats()["completed"] == 3 + 8
+
+            # Light computations are still run by the threads of the server
+            monkeypatch.undo()
+            small = mat_generator(8)
+            np.testing.assert_allclose(
+                clients[1].multiply_matrices(small, small), small @ small
+            )
+            assert servicer.offload.stats()["completed"] == 3 + 8
+
+            report = clients[0].get_stats()
+    finally:
+        servicer.offload.shutdown()
+
+    assert "offload_processes=1 offload_running=0 offload_completed=11" in report
+    assert set(glob.glob("/dev/shm/" + SEGMENT_PREFIX + "*")) == segments
+
+
+def test_process_offload_failures():
+    """Unit test to verify that results exported by workers that fail before handing
+    them over are released, and that pools broken by a dead worker are replaced."""
+    from concurrent.futures.process import BrokenProcessPool
+    import glob
+    import os
+
+    from ansys.eigen.python.grpc.offload import ProcessOffload
+    from ansys.eigen.python.grpc.sharedmem import SEGMENT_PREFIX
+
+    class DyingExecutor:
+        """Executor whose workers die right after exporting their result."""
+
+        def __init__(self, executor):
+            self._executor = executor
+
+        def submit(self, *args):
+            self._executor.submit(*args).result()
+            future = futures.Future()
+            future.set_exception(BrokenProcessPool("A worker died."))
+            return future
+
+        def shutdown(self, wait=True):
+            self._executor.shutdown(wait=wait)
+
+    segments = set(glob.glob("/dev/shm/" + SEGMENT_PREFIX + "*"))
+    offload = ProcessOffload(1)
+    mat = mat_generator(16)
+
+    try:
+        # The result exported by the worker is released... and the pool replaced
+        offload._executor = DyingExecutor(offload._executor)
+        with pytest.raises(BrokenProcessPool):
+            offload.run("multiply_matrices", mat, mat)
+        assert set(glob.glob("/dev/shm/" + SEGMENT_PREFIX + "*")) == segments
+        assert not isinstance(offload._executor, DyingExecutor)
+        np.testing.assert_allclose(
+            offload.run("multiply_matrices", mat, mat), mat @ mat
+        )
+
+        # Workers dying on their own break the pool too
+        with pytest.raises(BrokenProcessPool):
+            offload._executor.submit(os._exit, 1).result()
+        with pytest.raises(BrokenProcessPool):
+            offload.run("multiply_matrices", mat, mat)
+        np.testing.assert_allclose(
+            offload.run("multiply_matrices", mat, mat), mat @ mat
+        )
+        assert offload.stats() == {
+            "processes": 1,
+            "running": 0,
+            "completed": 2,
+            "failed": 2,
+        }
+    finally:
+        offload.shutdown()
+
+    assert set(glob.glob("/dev/shm/" + SEGMENT_PREFIX + "*")) == segments
+
+
+def test_capabilities_grpc():
+    """Unit test to verify that clients learn the capabilities of the server, and that
+    they exchange fewer (and larger) chunks once a larger chunk size is negotiated."""
+    import re
+
+    import ansys.eigen.python.grpc.constants as constants
+    from ansys.eigen.python.grpc.server import GRPCDemoServicer, _message_options
+    from ansys.eigen.python.grpc.stats import ServerStats, StatsInterceptor
+
+    # Chunks must fit in the messages
+    with pytest.raises(RuntimeError):
+        GRPCDemoServicer(chunk_size=constants.MAX_MESSAGE_SIZE)
+
+    max_message_size = 32 * 1024**2
+    stats = ServerStats()
+    servicer = GRPCDemoServicer(stats=stats, max_message_size=max_message_size)
+    options = _message_options({"max_message_size": max_message_size})
+
+    # Each matrix takes 8 MB
+    mat_1 = mat_generator(1024)
+    mat_2 = mat_generator(1024)
+
+    def chunks(client):
+        # Request and response chunks of the AddMatrices calls served so far
+        report = client.get_stats()
+        line = next(line for line in report.splitlines() if "AddMatrices" in line)
+        return [
+            int(re.search(field + r"=(\d+)", line).group(1))
+            for field in ("request_chunks", "response_chunks")
+        ]
+
+    with deployed_servicer(servicer, [StatsInterceptor(stats)], options) as port:
+        large = DemoGRPCClient(
+            ip="127.0.0.1", port=port, max_message_size=max_message_size
+        )
+        capabilities = large.get_capabilities()
+        assert capabilities.max_message_size == max_message_size
+        assert capabilities.chunk_size == constants.fit_chunk_size(max_message_size)
+        assert list(capabilities.protocol_versions) == [1, 2]
+        assert "gzip" in capabilities.codecs
+        assert len(capabilities.data_types) == len(constants.NP_DTYPE_TO_DATATYPE)
+        assert large.get_chunk_size() == capabilities.chunk_size
+
+        # Clients get chunks that fit in their own messages... or smaller ones
+        default = DemoGRPCClient(ip="127.0.0.1", port=port)
+        small = DemoGRPCClient(ip="127.0.0.1", port=port, chunk_size=256 * 1024)
+        assert default.get_chunk_size() == constants.MAX_CHUNKSIZE
+        assert small.get_chunk_size() == 256 * 1024
+
+        exchanged = []
+        for client in (large, default, small):
+            before = chunks(client) if exchanged else [0, 0]
+            np.testing.assert_allclose(client.add_matrices(mat_1, mat_2), mat_1 + mat_2)
+            exchanged.append(
+                [after - prev for after, prev in zip(chunks(client), before)]
+            )
+
+        # Manifest and a single chunk per operand... up to 32 chunks per operand
+        assert exchanged[0] == [3, 2]
+        assert exchanged[0] < exchanged[1] < exchanged[2]
+        assert exchanged[2] == [1 + 2 * 32, 1 + 32]
+
+        # Also with version 1 of the protocol
+        client = DemoGRPCClient(
+            ip="127.0.0.1",
+            port=port,
+            protocol_version=1,
+            max_message_size=max_message_size,
+        )
+        np.testing.assert_allclose(
+            client.multiply_matrices(mat_1, mat_2), mat_1 @ mat_2
+        )
+
+
+def test_protocol_negotiation_grpc():
+    """Unit test to verify that clients use the highest version of the protocol
+    handled by the server (up to the one they request), also with servers that do
+    not announce their capabilities."""
+    import ansys.eigen.python.grpc.constants as constants
+    import ansys.eigen.python.grpc.generated.grpcdemo_pb2_grpc as grpcdemo_pb2_grpc
+    from ansys.eigen.python.grpc.server import GRPCDemoServicer
+
+    class OriginalServicer(GRPCDemoServicer):
+        """Servicer announcing only the original version of the protocol."""
+
+        def GetCapabilities(self, request, context):
+            reply = super().GetCapabilities(request, context)
+            del reply.protocol_versions[:]
+            reply.protocol_versions.append(1)
+            return reply
+
+    class LegacyServicer(GRPCDemoServicer):
+        """Servicer that does not implement GetCapabilities (as the C++ server)."""
+
+        GetCapabilities = grpcdemo_pb2_grpc.GRPCDemoServicer.GetCapabilities
+
+    vec_1 = vec_generator(1000)
+    mat_1 = mat_generator(64)
+
+    with deployed_servicer(GRPCDemoServicer()) as port:
+        assert DemoGRPCClient(ip="127.0.0.1", port=port)._protocol_version == 2
+        client = DemoGRPCClient(ip="127.0.0.1", port=port, protocol_version=1)
+        assert client._protocol_version == 1
+
+    for servicer in (OriginalServicer(), LegacyServicer()):
+        with deployed_servicer(servicer) as port:
+            for version in (None, 2):
+                client = DemoGRPCClient(
+                    ip="127.0.0.1", port=port, protocol_version=version
+                )
+                assert client._protocol_version == 1
+                np.testing.assert_allclose(client.add_vectors(vec_1, vec_1), 2 * vec_1)
+                np.testing.assert_allclose(
+                    client.multiply_matrices(mat_1, mat_1), mat_1 @ mat_1
+                )
+
+            # Features of version 2 cannot be used
+            with pytest.raises(RuntimeError):
+                DemoGRPCClient(ip="127.0.0.1", port=port, shared_memory=True)
+
+    # Servers that do not announce their capabilities get chunks of the default size
+    with deployed_servicer(LegacyServicer()) as port:
+        client = DemoGRPCClient(ip="127.0.0.1", port=port, chunk_size=2**30)
+        assert client.get_chunk_size() == constants.MAX_CHUNKSIZE
+
+
+@pytest.mark.parametrize("codec", ["gzip", "deflate", "lz4"])
+def test_compression_grpc(grpc_stub, codec):
+    """Unit test to verify that compressed requests and responses are handled."""
+    from ansys.eigen.python.grpc.compression import CHUNK_CODECS, GRPC_CODECS
+
+    if codec not in GRPC_CODECS and codec not in CHUNK_CODECS:
+        pytest.skip("Compression codec %s is not available" % codec)
+
+    client = DemoGRPCClient(test=grpc_stub, compression=codec, compression_threshold=0)
+
+    # Compressible payloads
+    vec = np.arange(5000, dtype=np.float64) % 7
+    mat = np.ones((64, 64))
+
+    # The first call announces the chunk codecs accepted by the server... and the
+    # second one already uses them for the request
+    for _ in range(2):
+        np.testing.assert_allclose(client.flip_vector(vec), np.flip(vec))
+        np.testing.assert_allclose(client.add_vectors(vec, vec), vec + vec)
+        np.testing.assert_allclose(client.multiply_matrices(mat, mat), mat @ mat)
+
+    if codec in CHUNK_CODECS:
+        assert codec in client._server_chunk_codecs
+
+    # Payloads below the threshold are sent as they are
+    client = DemoGRPCClient(test=grpc_stub, compression=codec)
+    np.testing.assert_allclose(client.flip_vector(vec[:10]), np.flip(vec[:10]))
+
+    with pytest.raises(RuntimeError):
+        DemoGRPCClient(test=grpc_stub, compression="unknown")